@@ -0,0 +1,72 @@
+"""
+Compare APIService.clean_html against the previous implementation.
+
+Runs over the descriptions of a synthetic API payload, where template
+descriptions repeat the way they do across Canvas sections.
+
+Usage:
+    python -m benchmarks.bench_clean_html [--courses N] [--students N]
+"""
+import argparse
+import re
+import time
+from html import unescape
+from typing import Callable, List
+
+from benchmarks.synthetic_data import make_api_payload
+from src.services.api_service import APIService
+
+
+def previous_clean_html(html_text: str) -> str:
+    """The previous implementation: four inline re.sub passes plus unescape."""
+    if not html_text:
+        return ""
+    clean = re.sub(r"<(style|script)[^>]*>.*?</\1>", "", html_text, flags=re.DOTALL)
+    clean = re.sub(r"<br\s*/?>", "\n", clean)
+    clean = re.sub(r"<li>", "\n- ", clean)
+    clean = re.sub(r"<[^>]+>", "", clean)
+    return unescape(clean).strip()
+
+
+def run_ms(fn: Callable[[str], str], descriptions: List[str]) -> float:
+    """Clean every description once and return the elapsed milliseconds."""
+    start = time.perf_counter()
+    for description in descriptions:
+        fn(description)
+    return (time.perf_counter() - start) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--courses", type=int, default=5)
+    parser.add_argument("--weeks", type=int, default=14)
+    parser.add_argument("--per-week", type=int, default=4)
+    parser.add_argument("--students", type=int, default=20,
+                        help="students in the same sections (repeated descriptions)")
+    args = parser.parse_args()
+
+    payload = make_api_payload(args.courses, args.weeks, args.per_week)
+    unique = [a["description"] for a in payload["week_assignments"]]
+    descriptions = unique * args.students
+    html_bytes = sum(len(d) for d in unique)
+    previous_chars = sum(len(previous_clean_html(d)) for d in unique)
+    cleaned_chars = sum(len(APIService._clean_html_uncached(d)) for d in unique)
+
+    print(f"{len(unique)} unique descriptions ({html_bytes} chars of HTML) x {args.students} students")
+    print(f"output chars: previous {previous_chars}, current {cleaned_chars}")
+    print(f"{'implementation':<26}{'total ms':>10}{'us/call':>10}")
+
+    APIService._clean_html_cache.clear()
+    rows = [
+        ("previous", lambda: run_ms(previous_clean_html, descriptions)),
+        ("precompiled, no memo", lambda: run_ms(APIService._clean_html_uncached, descriptions)),
+        ("clean_html (memo)", lambda: run_ms(APIService.clean_html, descriptions)),
+    ]
+    for name, run in rows:
+        elapsed = run()
+        print(f"{name:<26}{elapsed:>10.2f}{elapsed * 1000 / len(descriptions):>10.2f}")
+    print(f"memo: {APIService._clean_html_cache.stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Compare cache codecs on synthetic course data.
+
+Usage:
+    python -m benchmarks.bench_codecs [--courses N] [--weeks N] [--per-week N]
+"""
+import argparse
+import json
+import time
+from typing import Callable, List, Tuple
+
+from benchmarks.synthetic_data import make_courses
+from src.services.cache_codecs import CacheCodec, msgpack, zstandard
+
+
+def time_call(fn: Callable[[], object], repeat: int) -> float:
+    """Return the best per-call time in milliseconds over `repeat` runs."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def codec_variants() -> List[Tuple[str, Callable[[object], bytes], Callable[[bytes], object]]]:
+    """Codecs to compare, including the legacy double-encoded JSON baseline."""
+    variants = [
+        (
+            "legacy json x2",
+            lambda v: json.dumps(json.dumps(v)).encode("utf-8"),
+            lambda b: json.loads(json.loads(b)),
+        ),
+    ]
+    serializers = ["json"] + (["msgpack"] if msgpack is not None else [])
+    compressions = ["none", "zlib"] + (["zstd"] if zstandard is not None else [])
+    for serializer in serializers:
+        for compression in compressions:
+            codec = CacheCodec(serializer=serializer, compression=compression)
+            variants.append((f"{serializer}+{compression}", codec.encode, CacheCodec.decode))
+    return variants
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--courses", type=int, default=5)
+    parser.add_argument("--weeks", type=int, default=14)
+    parser.add_argument("--per-week", type=int, default=4)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    courses = make_courses(args.courses, args.weeks, args.per_week)
+    print(f"{args.courses} courses x {args.weeks} weeks x {args.per_week} assignments")
+    print(f"{'codec':<18}{'bytes':>10}{'ratio':>8}{'encode ms':>12}{'decode ms':>12}")
+
+    baseline = None
+    for name, encode, decode in codec_variants():
+        payload = encode(courses)
+        assert decode(payload) is not None
+        baseline = baseline or len(payload)
+        print(
+            f"{name:<18}{len(payload):>10}{len(payload) / baseline:>8.2f}"
+            f"{time_call(lambda: encode(courses), args.repeat):>12.2f}"
+            f"{time_call(lambda: decode(payload), args.repeat):>12.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Compare the streaming ICS writer with the icalendar-based reference.
+
+Checks that both produce the same document, then reports time and peak
+memory for each.
+
+Usage:
+    python -m benchmarks.bench_ics [--courses N] [--weeks N] [--per-week N]
+"""
+import argparse
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Callable, Dict, List
+
+from benchmarks.synthetic_data import make_courses
+from src.services.calendar_service import CalendarService
+
+STUDENT_ID = "bench-student"
+# Fixed DTSTAMP, so both writers render the same document
+DTSTAMP = datetime(2025, 1, 6, 12, 0, tzinfo=timezone.utc)
+
+
+def reference_ics(courses: List[Dict]) -> str:
+    """Render with the icalendar-based reference implementation."""
+    return CalendarService.build_ics_calendar(
+        courses, student_id=STUDENT_ID, dtstamp=DTSTAMP
+    )
+
+
+def streamed_ics(courses: List[Dict]) -> int:
+    """Consume the stream chunk by chunk, as the REST route does."""
+    return sum(
+        len(chunk)
+        for chunk in CalendarService.stream_ics_calendar(
+            courses, student_id=STUDENT_ID, dtstamp=DTSTAMP
+        )
+    )
+
+
+def measure(fn: Callable[[], object]):
+    """Return (elapsed ms, peak traced memory in KiB)."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    fn()
+    elapsed = (time.perf_counter() - start) * 1000
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / 1024
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--courses", type=int, default=5)
+    parser.add_argument("--weeks", type=int, default=14)
+    parser.add_argument("--per-week", type=int, default=4)
+    args = parser.parse_args()
+
+    courses = make_courses(args.courses, args.weeks, args.per_week)
+    # Include characters that need escaping and multi-byte folding
+    courses[0]["week_assignments"]["1"][0]["title"] = "Ensayo; parte 1, versión \\ final"
+    courses[0]["week_assignments"]["1"][0]["instructions"] += "\n" + "ñ" * 200
+
+    streamed = CalendarService.render_ics_calendar(
+        courses, student_id=STUDENT_ID, dtstamp=DTSTAMP
+    )
+    reference = reference_ics(courses)
+    assert streamed == reference, "streaming writer output differs from icalendar"
+
+    n_events = streamed.count("BEGIN:VEVENT")
+    print(f"{n_events} events, {len(streamed.encode('utf-8'))} bytes, output identical")
+    print(f"{'writer':<12}{'ms':>10}{'peak KiB':>12}")
+    for name, fn in [("icalendar", lambda: reference_ics(courses)),
+                     ("streaming", lambda: streamed_ics(courses)),
+                     ("etag only", lambda: CalendarService.calendar_etag(
+                         courses, student_id=STUDENT_ID, dtstamp=DTSTAMP))]:
+        elapsed, peak = measure(fn)
+        print(f"{name:<12}{elapsed:>10.1f}{peak:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
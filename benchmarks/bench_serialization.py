@@ -0,0 +1,79 @@
+"""
+Compare JSON serializer backends on tool responses and cached payloads.
+
+Serializes the unfiltered get_filtered_courses response (pretty and compact)
+and round-trips the compact cache body, for every installed backend. Each
+backend's output is checked against the stdlib serializer.
+
+Usage:
+    python -m benchmarks.bench_serialization [--courses N] [--weeks N] [--per-week N]
+"""
+import argparse
+import time
+from unittest import mock
+
+from benchmarks.synthetic_data import make_api_payload
+from src.services.api_service import APIService
+from src.services.course_service import CourseService
+from src.utils.serialization import SERIALIZERS, StdlibSerializer, orjson
+
+
+def best_ms(fn, repeat: int) -> float:
+    """Return the best run time in milliseconds over `repeat` runs."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--courses", type=int, default=6)
+    parser.add_argument("--weeks", type=int, default=14)
+    parser.add_argument("--per-week", type=int, default=4)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    payload = make_api_payload(args.courses, args.weeks, args.per_week)
+    with mock.patch.object(APIService, "clean_html", staticmethod(lambda text: text)):
+        courses = APIService.transform_api_payload(payload)
+    response = CourseService.format_course_response(courses)
+
+    reference = StdlibSerializer()
+    pretty_ref = reference.dumps(response)
+    compact_ref = reference.dumps(response, compact=True)
+    cache_body = reference.dumps_bytes(courses)
+    print(
+        f"{args.courses} courses x {args.weeks} weeks x {args.per_week} assignments: "
+        f"pretty {len(pretty_ref.encode('utf-8'))} B, compact {len(compact_ref.encode('utf-8'))} B"
+    )
+    print(
+        f"{'backend':<10}{'pretty ms':>11}{'compact ms':>12}{'MB/s':>9}"
+        f"{'cache enc ms':>14}{'cache dec ms':>14}"
+    )
+
+    names = ["json"] + (["orjson"] if orjson is not None else [])
+    for name in names:
+        serializer = SERIALIZERS[name]()
+        assert serializer.dumps(response) == pretty_ref, f"{name}: pretty output differs"
+        assert serializer.dumps(response, compact=True) == compact_ref, f"{name}: compact output differs"
+        assert serializer.loads(cache_body) == courses, f"{name}: cache round-trip differs"
+
+        pretty = best_ms(lambda: serializer.dumps(response), args.repeat)
+        compact = best_ms(lambda: serializer.dumps(response, compact=True), args.repeat)
+        encode = best_ms(lambda: serializer.dumps_bytes(courses), args.repeat)
+        decode = best_ms(lambda: serializer.loads(cache_body), args.repeat)
+        throughput = len(pretty_ref.encode("utf-8")) / 1e6 / (pretty / 1000)
+        print(
+            f"{name:<10}{pretty:>11.2f}{compact:>12.2f}{throughput:>9.1f}"
+            f"{encode:>14.2f}{decode:>14.2f}"
+        )
+
+    if orjson is None:
+        print("orjson is not installed; pip install orjson to compare it")
+
+
+if __name__ == "__main__":
+    main()
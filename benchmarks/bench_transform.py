@@ -0,0 +1,100 @@
+"""
+Measure how the API payload transform scales with payload size.
+
+Compares transform_api_payload against the previous per-course scan over all
+assignments. HTML cleaning is replaced by a no-op so only the join is timed.
+
+Usage:
+    python -m benchmarks.bench_transform [--sizes 2,4,8,16,32]
+"""
+import argparse
+import time
+from typing import Any, Dict, List
+from unittest import mock
+
+from benchmarks.synthetic_data import make_api_payload
+from src.services.api_service import APIService
+
+
+def nested_loop_transform(data: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    The previous O(courses x assignments) join, kept for comparison.
+
+    It emits the same fields as transform_api_payload, so tests use it as the
+    reference output.
+    """
+    guid_map = {g["canvas_sis_id"]: g for g in data.get("guids", [])}
+    submission_map = {}
+    for s in data.get("submissions", []):
+        submission_map.setdefault(s["canvas_assignment_id"], []).append(s)
+
+    output_courses = []
+    for course in data.get("current_courses", []):
+        course_info = guid_map.get(course["canvas_sis_id"], {})
+        course_id = course_info.get("canvas_course_id")
+        processed_course = {
+            "course_name": course.get("course_name", "Unknown Course"),
+            "course_code": course.get("course_code", "Unknown Code"),
+            "term_code": course.get("term_code", "Unknown Term"),
+            "start_date": course.get("start_date", "Unknown Start Date"),
+            "current_week": int(course_info.get("current_week", 0)),
+            "week_assignments": {},
+            "canvas_course_id": course_id,
+        }
+        for assignment in data.get("week_assignments", []):
+            if assignment["canvas_course_id"] == course_id:
+                clean_assignment = {
+                    "assignment_id": assignment["canvas_assignment_id"],
+                    "title": assignment["title"],
+                    "possible_score": assignment["points_possible_decimal"],
+                    "due_on": f"{assignment['due_on']}",
+                    "type": assignment["submission_type"],
+                    "instructions": APIService.clean_html(assignment.get("description", "")),
+                }
+                subs = submission_map.get(assignment["canvas_assignment_id"], [])
+                if subs:
+                    clean_assignment["status"] = "Submitted"
+                    if subs[0].get("score") is not None:
+                        clean_assignment["grade"] = subs[0]["score"]
+                else:
+                    clean_assignment["status"] = "Pending"
+                processed_course["week_assignments"].setdefault(
+                    str(assignment["due_week"]), []
+                ).append(clean_assignment)
+        output_courses.append(processed_course)
+    return output_courses
+
+
+def best_ms(fn, repeat: int) -> float:
+    """Return the best run time in milliseconds over `repeat` runs."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", default="2,4,8,16,32,64", help="course counts to test")
+    parser.add_argument("--weeks", type=int, default=14)
+    parser.add_argument("--per-week", type=int, default=4)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'courses':>8}{'assignments':>13}{'nested ms':>12}{'grouped ms':>12}{'us/assign':>11}")
+    with mock.patch.object(APIService, "clean_html", staticmethod(lambda text: text)):
+        for n_courses in (int(n) for n in args.sizes.split(",")):
+            payload = make_api_payload(n_courses, args.weeks, args.per_week)
+            n_assignments = len(payload["week_assignments"])
+            nested = best_ms(lambda: nested_loop_transform(payload), args.repeat)
+            grouped = best_ms(lambda: APIService.transform_api_payload(payload), args.repeat)
+            print(
+                f"{n_courses:>8}{n_assignments:>13}{nested:>12.2f}{grouped:>12.2f}"
+                f"{grouped * 1000 / n_assignments:>11.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
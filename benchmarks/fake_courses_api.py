@@ -0,0 +1,105 @@
+"""Local stand-in for the courses API, serving synthetic payloads"""
+import json
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional
+
+from benchmarks.synthetic_data import make_api_payload
+
+
+class FakeCoursesAPI:
+    """
+    Threaded HTTP server answering POST {"user_id": ...} like the courses API.
+
+    Each student gets a deterministic synthetic payload (seeded by the
+    student ID), encoded once and reused, so the server itself stays cheap.
+    """
+
+    def __init__(
+        self,
+        n_courses: int = 5,
+        n_weeks: int = 14,
+        per_week: int = 4,
+        latency: float = 0.0,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ):
+        """
+        Initialize the fake API.
+
+        Args:
+            n_courses: Courses per student.
+            n_weeks: Weeks per course.
+            per_week: Assignments per course per week.
+            latency: Artificial delay per request in seconds.
+            host: Interface to bind.
+            port: Port to bind (0 picks a free port).
+        """
+        self.n_courses = n_courses
+        self.n_weeks = n_weeks
+        self.per_week = per_week
+        self.latency = latency
+        self.requests = 0
+        self._payloads: Dict[str, bytes] = {}
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/"
+
+    def payload_for(self, student_id: str) -> bytes:
+        """Encoded synthetic payload for a student (built once)."""
+        with self._lock:
+            body = self._payloads.get(student_id)
+            if body is None:
+                seed = zlib.crc32(student_id.encode("utf-8"))
+                body = json.dumps(
+                    make_api_payload(self.n_courses, self.n_weeks, self.per_week, seed=seed)
+                ).encode("utf-8")
+                self._payloads[student_id] = body
+            return body
+
+    def start(self) -> "FakeCoursesAPI":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "FakeCoursesAPI":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def _handler_class(self):
+        api = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # keep-alive, like the real upstream
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                request = json.loads(self.rfile.read(length) or b"{}")
+                api.requests += 1
+                if api.latency:
+                    time.sleep(api.latency)
+                body = api.payload_for(str(request.get("user_id", "")))
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
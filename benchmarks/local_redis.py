@@ -0,0 +1,31 @@
+"""In-memory Redis stand-in for offline benchmarks"""
+try:
+    import fakeredis
+except ImportError:  # optional dependency, see benchmarks/requirements.txt
+    fakeredis = None
+
+from src.services.redis_cache_service import StudentCache
+
+
+def use_in_memory_redis() -> "fakeredis.FakeServer":
+    """
+    Point StudentCache at an in-process fakeredis server.
+
+    All event loops share the same server, so data survives the per-loop
+    client recreation done by StudentCache.
+
+    Returns:
+        The shared fakeredis server.
+
+    Raises:
+        RuntimeError: If fakeredis is not installed.
+    """
+    if fakeredis is None:
+        raise RuntimeError(
+            "The in-memory Redis stand-in needs fakeredis: "
+            "pip install -r benchmarks/requirements.txt"
+        )
+    server = fakeredis.FakeServer()
+    StudentCache.client_factory = lambda: fakeredis.aioredis.FakeRedis(server=server)
+    StudentCache._redis_client = None
+    return server
@@ -0,0 +1,161 @@
+"""
+Offline load test: drive the MCP tools or the /mcp endpoint at a given
+concurrency against a local fake courses API and an in-memory Redis.
+
+The fake API runs in a thread of the same process, so under heavy load it
+competes for the GIL; compare runs with the same settings rather than reading
+absolute numbers.
+
+Usage:
+    python -m benchmarks.run_load --mode tools --concurrency 32 --requests 2000
+    python -m benchmarks.run_load --mode mcp --students 200 --api-latency-ms 150
+"""
+import argparse
+import asyncio
+import os
+import random
+import resource
+import statistics
+import sys
+import time
+from typing import Awaitable, Callable, List
+
+from benchmarks.fake_courses_api import FakeCoursesAPI
+
+TOOLS = ("get_filtered_courses", "build_ics_file", "resource")
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def make_arguments(rng: random.Random, students: int) -> dict:
+    """Random tool arguments for one of `students` synthetic students."""
+    arguments = {"student_id": f"student-{rng.randrange(students)}"}
+    if rng.random() < 0.5:
+        arguments["week"] = str(rng.randint(1, 14))
+    return arguments
+
+
+def tool_caller() -> Callable[[str, dict], Awaitable[int]]:
+    """Call tools and resources in-process, returning the response size."""
+    from src.mcp_server.resources import read_resource
+    from src.mcp_server.tools import call_tool
+
+    async def call(tool: str, arguments: dict) -> int:
+        if tool == "resource":
+            return len(await read_resource(f"students://{arguments['student_id']}/courses"))
+        result = await call_tool(tool, arguments)
+        return sum(len(item.text) for item in result)
+
+    return call
+
+
+def mcp_caller(client) -> Callable[[str, dict], Awaitable[int]]:
+    """Call the /mcp endpoint through the ASGI app, returning the response size."""
+    headers = {"accept": "application/json, text/event-stream"}
+    request_ids = iter(range(1, 10 ** 9))
+
+    async def call(tool: str, arguments: dict) -> int:
+        if tool == "resource":
+            method = "resources/read"
+            params = {"uri": f"students://{arguments['student_id']}/courses"}
+        else:
+            method, params = "tools/call", {"name": tool, "arguments": arguments}
+        response = await client.post(
+            "/mcp",
+            headers=headers,
+            json={"jsonrpc": "2.0", "id": next(request_ids), "method": method, "params": params},
+        )
+        response.raise_for_status()
+        return len(response.content)
+
+    return call
+
+
+async def run(args: argparse.Namespace, call: Callable[[str, dict], Awaitable[int]]) -> None:
+    rng = random.Random(args.seed)
+    work = [(rng.choice(TOOLS), make_arguments(rng, args.students)) for _ in range(args.requests)]
+    latencies: List[float] = []
+    sizes: List[int] = []
+    errors = 0
+    queue = iter(work)
+
+    async def worker() -> None:
+        nonlocal errors
+        for tool, arguments in queue:
+            start = time.perf_counter()
+            try:
+                sizes.append(await call(tool, arguments))
+            except Exception as e:
+                errors += 1
+                print(f"error in {tool}: {e}", file=sys.stderr)
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    ms = [value * 1000 for value in latencies]
+    print(f"mode={args.mode} concurrency={args.concurrency} requests={args.requests} "
+          f"students={args.students} api_latency={args.api_latency_ms}ms")
+    print(f"throughput: {len(latencies) / elapsed:.1f} req/s ({elapsed:.2f}s total, {errors} errors)")
+    print(f"latency ms: p50={percentile(ms, 50):.2f} p90={percentile(ms, 90):.2f} "
+          f"p99={percentile(ms, 99):.2f} max={ms[-1]:.2f} mean={statistics.fmean(ms):.2f}")
+    print(f"response bytes: mean={statistics.fmean(sizes or [0]):.0f} max={max(sizes or [0])}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--mode", choices=("tools", "mcp"), default="tools")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--students", type=int, default=100)
+    parser.add_argument("--courses", type=int, default=5)
+    parser.add_argument("--weeks", type=int, default=14)
+    parser.add_argument("--per-week", type=int, default=4)
+    parser.add_argument("--api-latency-ms", type=float, default=50.0)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    api = FakeCoursesAPI(args.courses, args.weeks, args.per_week, args.api_latency_ms / 1000)
+    # Build every payload up front so generation cost is not measured
+    for i in range(args.students):
+        api.payload_for(f"student-{i}")
+
+    with api:
+        # Configuration is read at import time, so set it before importing src
+        os.environ["COURSES_API_URL"] = api.url
+        import logging
+        logging.disable(logging.INFO)
+
+        from benchmarks.local_redis import use_in_memory_redis
+        use_in_memory_redis()
+
+        if args.mode == "tools":
+            asyncio.run(run(args, tool_caller()))
+        else:
+            asyncio.run(run_mcp(args))
+
+        rss_mib = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+        print(f"upstream requests: {api.requests}, peak RSS: {rss_mib:.1f} MiB")
+
+
+async def run_mcp(args: argparse.Namespace) -> None:
+    import httpx
+    from src.main import app
+    from src.routes.mcp_routes import mcp_lifespan
+
+    async with mcp_lifespan(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            await run(args, mcp_caller(client))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+"""Synthetic, realistically shaped course data for benchmarks"""
+import random
+from typing import Any, Dict, List
+
+# Fragments used to build Canvas-style instructions (already HTML-cleaned)
+INSTRUCTION_PARAGRAPHS = [
+    "Read the assigned chapter and take notes on the key concepts introduced this week.",
+    "Submit your work as a single PDF. Late submissions lose 10% per day unless you "
+    "have arranged an extension with your instructor beforehand.",
+    "Reflect on how the principles from this lesson apply to your own experience, "
+    "and share at least two concrete examples with your group.",
+    "Use the rubric below to check your work before submitting:\n- Completeness\n"
+    "- Accuracy\n- Clarity of explanation\n- Proper citations",
+    "Reply to at least two classmates' posts with meaningful feedback. Each reply "
+    "should be at least 100 words and reference the reading.",
+    "Complete the practice problems in the textbook. Show all your steps; answers "
+    "without work will not receive full credit.",
+]
+
+# Vocabulary for the assignment-specific sentences, so payloads do not compress
+# unrealistically well
+TOPIC_WORDS = (
+    "algorithm analysis budget case character climate data design economy ethics "
+    "evidence experiment family function gospel history hypothesis leadership "
+    "market memory model network nutrition principle process program research "
+    "service society software statistics strategy system teaching theory writing"
+).split()
+
+SUBMISSION_TYPES = ["online_upload", "discussion_topic", "online_quiz", "online_text_entry"]
+
+
+def make_instructions(rng: random.Random, paragraphs: int) -> str:
+    """Build cleaned instruction text from template and assignment-specific paragraphs."""
+    parts = []
+    for _ in range(paragraphs):
+        parts.append(rng.choice(INSTRUCTION_PARAGRAPHS))
+        words = " ".join(rng.choice(TOPIC_WORDS) for _ in range(rng.randint(15, 40)))
+        parts.append(f"Focus for this task ({rng.randint(1, 999)}): {words}.")
+    return "\n\n".join(parts)
+
+
+def make_courses(
+    n_courses: int = 5,
+    n_weeks: int = 14,
+    per_week: int = 4,
+    seed: int = 42,
+) -> List[Dict[str, Any]]:
+    """
+    Build a course list shaped like the output of get_courses_from_api.
+
+    Args:
+        n_courses: Number of enrolled courses.
+        n_weeks: Weeks in the term.
+        per_week: Assignments per course per week.
+        seed: Random seed for reproducible output.
+
+    Returns:
+        List of processed course dictionaries.
+    """
+    rng = random.Random(seed)
+    courses = []
+    assignment_id = 1000
+    for c in range(n_courses):
+        week_assignments: Dict[str, List[Dict[str, Any]]] = {}
+        for week in range(1, n_weeks + 1):
+            for a in range(per_week):
+                assignment_id += 1
+                assignment = {
+                    "assignment_id": assignment_id,
+                    "title": f"W{week:02d} {rng.choice(['Reading', 'Quiz', 'Discussion', 'Project'])} {a + 1}",
+                    "possible_score": float(rng.choice([5, 10, 20, 50, 100])),
+                    "due_on": f"2026-{1 + (week - 1) // 4:02d}-{1 + ((week - 1) % 4) * 7:02d}T23:59:00Z",
+                    "type": rng.choice(SUBMISSION_TYPES),
+                    "instructions": make_instructions(rng, rng.randint(1, 6)),
+                }
+                if rng.random() < 0.5:
+                    assignment["status"] = "Submitted"
+                    assignment["grade"] = round(rng.uniform(0, assignment["possible_score"]), 1)
+                else:
+                    assignment["status"] = "Pending"
+                week_assignments.setdefault(str(week), []).append(assignment)
+
+        courses.append({
+            "course_name": f"Synthetic Course {c + 1}",
+            "course_code": f"SYN{100 + c}",
+            "term_code": "2026.WI",
+            "start_date": "2026-01-05",
+            "current_week": rng.randint(1, n_weeks),
+            "week_assignments": week_assignments,
+        })
+    return courses
+
+
+def make_description_html(rng: random.Random, paragraphs: int) -> str:
+    """Build a Canvas-style HTML assignment description."""
+    parts = ['<div class="description user_content">']
+    for _ in range(paragraphs):
+        words = " ".join(rng.choice(TOPIC_WORDS) for _ in range(rng.randint(15, 40)))
+        parts.append(
+            f'  <p>\n    <span style="font-size: 12pt;">{rng.choice(INSTRUCTION_PARAGRAPHS)}'
+            f"</span>&nbsp;&nbsp;\n  </p>\n  <p>\n    <strong>Focus:</strong> {words}.<br/>\n"
+            "    See the <a href=\"https://example.com/course\">course page</a>.\n  </p>\n"
+        )
+    parts.append("<ul><li>Completeness</li><li>Accuracy</li><li>Clarity</li></ul>")
+    parts.append("<style>p { margin: 0; }</style></div>")
+    return "\n".join(parts)
+
+
+def make_api_payload(
+    n_courses: int = 5,
+    n_weeks: int = 14,
+    per_week: int = 4,
+    submitted_ratio: float = 0.5,
+    seed: int = 42,
+) -> Dict[str, Any]:
+    """
+    Build a raw courses API response (the input of transform_api_payload).
+
+    Args:
+        n_courses: Number of enrolled courses.
+        n_weeks: Weeks in the term.
+        per_week: Assignments per course per week.
+        submitted_ratio: Fraction of assignments with a submission.
+        seed: Random seed for reproducible output.
+
+    Returns:
+        Dictionary with current_courses, guids, week_assignments and submissions.
+    """
+    rng = random.Random(seed)
+    payload: Dict[str, Any] = {
+        "current_courses": [],
+        "guids": [],
+        "week_assignments": [],
+        "submissions": [],
+    }
+    assignment_id = 1000
+    for c in range(n_courses):
+        sis_id = f"2026.WI-SYN{100 + c}-{c + 1}"
+        canvas_course_id = 500 + c
+        payload["current_courses"].append({
+            "canvas_sis_id": sis_id,
+            "course_name": f"Synthetic Course {c + 1}",
+            "course_code": f"SYN{100 + c}",
+            "term_code": "2026.WI",
+            "start_date": "2026-01-05",
+        })
+        payload["guids"].append({
+            "canvas_sis_id": sis_id,
+            "canvas_course_id": canvas_course_id,
+            "current_week": rng.randint(1, n_weeks),
+        })
+        for week in range(1, n_weeks + 1):
+            for a in range(per_week):
+                assignment_id += 1
+                points = float(rng.choice([5, 10, 20, 50, 100]))
+                payload["week_assignments"].append({
+                    "canvas_course_id": canvas_course_id,
+                    "canvas_assignment_id": assignment_id,
+                    "due_week": week,
+                    "title": f"W{week:02d} {rng.choice(['Reading', 'Quiz', 'Discussion', 'Project'])} {a + 1}",
+                    "points_possible_decimal": points,
+                    "due_on": f"2026-{1 + (week - 1) // 4:02d}-{1 + ((week - 1) % 4) * 7:02d}T23:59:00Z",
+                    "submission_type": rng.choice(SUBMISSION_TYPES),
+                    "description": make_description_html(rng, rng.randint(1, 6)),
+                })
+                if rng.random() < submitted_ratio:
+                    payload["submissions"].append({
+                        "canvas_assignment_id": assignment_id,
+                        "score": round(rng.uniform(0, points), 1) if rng.random() < 0.7 else None,
+                    })
+    return payload
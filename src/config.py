@@ -8,6 +8,18 @@ load_dotenv()
 # API URL
 COURSES_API_URL = os.getenv("COURSES_API_URL", "")
 
+# Courses API client: keep-alive pool size, timeouts (seconds) and retries
+COURSES_API_POOL_SIZE = int(os.getenv("COURSES_API_POOL_SIZE", "20"))
+COURSES_API_CONNECT_TIMEOUT = float(os.getenv("COURSES_API_CONNECT_TIMEOUT", "3"))
+COURSES_API_READ_TIMEOUT = float(os.getenv("COURSES_API_READ_TIMEOUT", "15"))
+COURSES_API_MAX_RETRIES = int(os.getenv("COURSES_API_MAX_RETRIES", "2"))
+COURSES_API_BACKOFF_BASE = float(os.getenv("COURSES_API_BACKOFF_BASE", "0.25"))
+COURSES_API_BACKOFF_MAX = float(os.getenv("COURSES_API_BACKOFF_MAX", "2"))
+# Circuit breaker: consecutive failures that open it (0 = disabled) and
+# seconds it fails fast before a trial request
+COURSES_API_BREAKER_FAILURES = int(os.getenv("COURSES_API_BREAKER_FAILURES", "5"))
+COURSES_API_BREAKER_RESET = float(os.getenv("COURSES_API_BREAKER_RESET", "30"))
+
 # MCP Server configuration
 MCP_SERVER_NAME = os.getenv("MCP_SERVER_NAME", "student-ai-server")
 
@@ -16,7 +28,75 @@ API_TITLE = "MCP Student Server"
 API_VERSION = "1.0.0"
 MCP_ENDPOINT = "/mcp"  # Streamable HTTP endpoint para Copilot Studio
 
+# Sampled, size-capped DEBUG logging of /mcp request/response bodies (0 = off)
+MCP_DEBUG_CAPTURE_RATE = float(os.getenv("MCP_DEBUG_CAPTURE_RATE", "0"))
+MCP_DEBUG_CAPTURE_BYTES = int(os.getenv("MCP_DEBUG_CAPTURE_BYTES", "500"))
+
 # Redis Configuration
 AzureForRedisHost = os.getenv("AzureForRedisHost", "")
 AzureForRedisPort = os.getenv("AzureForRedisPort", "")
 AzureForRedisPassword = os.getenv("AzureForRedisPassword", "")
+# Redis circuit breaker (same meaning as the courses API one)
+REDIS_BREAKER_FAILURES = int(os.getenv("REDIS_BREAKER_FAILURES", "5"))
+REDIS_BREAKER_RESET = float(os.getenv("REDIS_BREAKER_RESET", "30"))
+
+# Single-flight fetch lock (seconds): how long one worker may own a student's
+# upstream fetch before others give up waiting and fetch themselves
+FETCH_LOCK_TIMEOUT = float(os.getenv("FETCH_LOCK_TIMEOUT", "10"))
+FETCH_LOCK_POLL_INTERVAL = float(os.getenv("FETCH_LOCK_POLL_INTERVAL", "0.1"))
+
+# In-process (L1) cache in front of Redis; TTL is capped at the Redis expiration
+LOCAL_CACHE_MAX_ENTRIES = int(os.getenv("LOCAL_CACHE_MAX_ENTRIES", "1024"))
+# Byte bound is approximate: it counts the compact JSON size of the decoded
+# courses, which is only computed when a bound is set (0 = no limit)
+LOCAL_CACHE_MAX_BYTES = int(os.getenv("LOCAL_CACHE_MAX_BYTES", "0"))
+LOCAL_CACHE_TTL = float(os.getenv("LOCAL_CACHE_TTL", "60"))
+# Last known courses per student, served only when the API fails and Redis
+# has no copy (expired or unreachable)
+STALE_CACHE_MAX_ENTRIES = int(os.getenv("STALE_CACHE_MAX_ENTRIES", "1024"))
+STALE_CACHE_TTL = float(os.getenv("STALE_CACHE_TTL", "21600"))
+# Same approximate byte bound as the L1 one (0 = no limit)
+STALE_CACHE_MAX_BYTES = int(os.getenv("STALE_CACHE_MAX_BYTES", "0"))
+
+# Upstream validators (seconds) outlive the cached courses, so a refetch of
+# unchanged content keeps its first-seen time (calendar DTSTAMP and ETag)
+CACHE_VALIDATOR_TTL = int(os.getenv("CACHE_VALIDATOR_TTL", "604800"))
+
+# Refresh-ahead: entries older than the soft TTL (seconds) are still served but
+# refreshed in the background; the Redis expiration acts as the hard TTL
+CACHE_SOFT_TTL = float(os.getenv("CACHE_SOFT_TTL", "1200"))
+# Max background refreshes running at once per worker
+REFRESH_MAX_WORKERS = int(os.getenv("REFRESH_MAX_WORKERS", "8"))
+
+# Redis payload codec: serializer "json" | "msgpack", compression "none" | "zlib" | "zstd"
+# (msgpack and zstd need the optional msgpack / zstandard packages)
+CACHE_SERIALIZER = os.getenv("CACHE_SERIALIZER", "json")
+CACHE_COMPRESSION = os.getenv("CACHE_COMPRESSION", "zlib")
+CACHE_COMPRESSION_THRESHOLD = int(os.getenv("CACHE_COMPRESSION_THRESHOLD", "1024"))
+# Redis layout of the course data: "blob" (one value per student),
+# "sharded" (one hash per student with a field per course) or "shared"
+# (course content shared between students + per-student state)
+CACHE_LAYOUT = os.getenv("CACHE_LAYOUT", "blob")
+
+# JSON backend for responses and cached payloads: "auto" (orjson if
+# installed), "orjson" or "json"
+JSON_LIBRARY = os.getenv("JSON_LIBRARY", "auto")
+
+# Max number of cleaned assignment descriptions memoized per worker
+CLEAN_HTML_CACHE_SIZE = int(os.getenv("CLEAN_HTML_CACHE_SIZE", "4096"))
+
+# Cache warm-up job (python -m src.warm_cache): parallel fetches, upstream
+# requests per second and Redis pipeline batch size
+WARM_CACHE_CONCURRENCY = int(os.getenv("WARM_CACHE_CONCURRENCY", "10"))
+WARM_CACHE_RATE_LIMIT = float(os.getenv("WARM_CACHE_RATE_LIMIT", "20"))
+WARM_CACHE_BATCH_SIZE = int(os.getenv("WARM_CACHE_BATCH_SIZE", "50"))
+
+# Batch course lookups (get_courses_batch / POST /students/courses/batch)
+BATCH_MAX_STUDENTS = int(os.getenv("BATCH_MAX_STUDENTS", "100"))
+BATCH_FETCH_CONCURRENCY = int(os.getenv("BATCH_FETCH_CONCURRENCY", "8"))
+
+# Max events per POST /events/submissions request
+SUBMISSION_EVENTS_MAX_BATCH = int(os.getenv("SUBMISSION_EVENTS_MAX_BATCH", "500"))
+# Shared secret for the X-Signature HMAC-SHA256 of the event request body;
+# while it is empty the endpoint rejects every request
+SUBMISSION_EVENTS_SECRET = os.getenv("SUBMISSION_EVENTS_SECRET", "")
@@ -4,9 +4,14 @@ import logging
 from pathlib import Path
 from fastapi import FastAPI, Request
 from starlette.middleware.cors import CORSMiddleware
-from starlette.responses import Response
-from src.config import API_TITLE, API_VERSION
-from src.routes.mcp_routes import handle_streamable_http, mcp_lifespan
+from starlette.responses import JSONResponse
+from src.config import API_TITLE, API_VERSION, MCP_ENDPOINT
+from src.routes.mcp_routes import MCPEndpoint, mcp_lifespan
+from src.routes.calendar_routes import router as calendar_router
+from src.routes.course_routes import router as course_router
+from src.routes.event_routes import router as event_router
+from src.routes.metrics_routes import router as metrics_router
+from src.services.course_service import CoursesUnavailableError
 
 # Import MCP components to register decorators
 import src.mcp_server.resources  # noqa: F401
@@ -31,57 +36,24 @@ app.add_middleware(
     expose_headers=["Mcp-Session-Id"],  # Importante para MCP
 )
 
+# REST routes
+app.include_router(calendar_router)
+app.include_router(course_router)
+app.include_router(event_router)
+app.include_router(metrics_router)
 
-# Register MCP endpoint directly (sin Mount para evitar redirect)
-@app.post("/mcp")
-async def mcp_endpoint(request: Request):
-    """MCP Streamable HTTP endpoint for Copilot Studio"""
-    import logging
-    logger = logging.getLogger(__name__)
-    
-    # Log del request para debugging
-    body = await request.body()
-    logger.info(f"Received POST /mcp - Content-Type: {request.headers.get('content-type')}")
-    logger.info(f"Body length: {len(body)}")
-    logger.info(f"Body: {body[:500]}")  # Primeros 500 bytes
-    
-    # Capturar headers y body de la respuesta
-    response_headers = {}
-    response_body = []
-    status_code = 200
-    
-    async def send_wrapper(message):
-        nonlocal status_code
-        if message["type"] == "http.response.start":
-            status_code = message.get("status", 200)
-            for header_name, header_value in message.get("headers", []):
-                response_headers[header_name.decode()] = header_value.decode()
-        elif message["type"] == "http.response.body":
-            body = message.get("body", b"")
-            if body:
-                response_body.append(body)
-    
-    # Necesitamos recrear el receive porque ya leímos el body
-    async def receive_wrapper():
-        return {
-            "type": "http.request",
-            "body": body,
-            "more_body": False
-        }
-    
-    await handle_streamable_http(request.scope, receive_wrapper, send_wrapper)
-    
-    # Log de la respuesta
-    content = b"".join(response_body)
-    logger.info(f"Response status: {status_code}")
-    logger.info(f"Response body: {content[:500]}")
-    
-    # Construir la respuesta con los headers correctos
-    return Response(
-        content=content,
-        status_code=status_code,
-        headers=response_headers
-    )
+
+@app.exception_handler(CoursesUnavailableError)
+async def courses_unavailable(request: Request, exc: CoursesUnavailableError) -> JSONResponse:
+    """Dependencies are down and there is no last known copy: 503, not an empty list"""
+    headers = {}
+    if exc.retry_after:
+        headers["Retry-After"] = str(max(1, round(exc.retry_after)))
+    return JSONResponse(status_code=503, content={"detail": str(exc)}, headers=headers)
+
+
+# Register MCP endpoint directly as an ASGI passthrough (sin Mount para evitar redirect)
+app.router.add_route(MCP_ENDPOINT, MCPEndpoint(), methods=["POST"])
 
 
 @app.get("/")
@@ -1,10 +1,19 @@
 """MCP Resource definitions"""
 
-import json
+import re
 from datetime import datetime
+from urllib.parse import unquote
 import mcp.types as types
 from .server import mcp_server
 from src.services.course_service import CourseService
+from src.utils.metrics import TOOL_LATENCY, record_size, timed
+from src.utils.serialization import dumps
+
+# Resource URIs, most specific first
+COURSE_WEEK_URI = re.compile(r"^students://([^/]+)/courses/([^/]+)/weeks/([^/]+)$")
+COURSE_URI = re.compile(r"^students://([^/]+)/courses/([^/]+)$")
+WEEK_URI = re.compile(r"^students://([^/]+)/weeks/([^/]+)$")
+COURSES_URI = re.compile(r"^students://([^/]+)/courses$")
 
 
 @mcp_server.list_resource_templates()
@@ -16,7 +25,25 @@ async def list_resource_templates() -> list[types.ResourceTemplate]:
             name="student courses",
             description="Retrieve the list of courses for a specific student ID", 
             mimeType="application/json",
-        )
+        ),
+        types.ResourceTemplate(
+            uriTemplate="students://{student_id}/courses/{course_code}",
+            name="student course",
+            description="Retrieve one course of a student with all its weekly assignments",
+            mimeType="application/json",
+        ),
+        types.ResourceTemplate(
+            uriTemplate="students://{student_id}/courses/{course_code}/weeks/{week}",
+            name="student course week",
+            description="Retrieve the assignments of one course of a student for one week",
+            mimeType="application/json",
+        ),
+        types.ResourceTemplate(
+            uriTemplate="students://{student_id}/weeks/{week}",
+            name="student week",
+            description="Retrieve the assignments of all courses of a student for one week",
+            mimeType="application/json",
+        ),
     ]
 
 
@@ -46,24 +73,63 @@ async def read_resource(uri: str) -> str:
     """
     uri_str = str(uri)
 
-    if uri_str.startswith("students://") and uri_str.endswith("/courses"):
-        # Extract student ID dynamically
-        student_id = uri_str.replace("students://", "").replace("/courses", "")
-
-        # Fetch courses
-        courses_data = CourseService().fetch_courses(student_id)
-        basic_courses = CourseService.get_basic_course_info(courses_data)
+    match = COURSES_URI.match(uri_str)
+    if match:
+        with TOOL_LATENCY.time("resource", "student_courses"):
+            return serialize(await read_student_courses(unquote(match.group(1))))
 
-        current_week = courses_data[0]["current_week"] if courses_data else "1"
-        current_date = datetime.now().strftime("%d/%m/%Y")
+    match = COURSE_WEEK_URI.match(uri_str)
+    if match:
+        student_id, course_code, week = (unquote(part) for part in match.groups())
+        with TOOL_LATENCY.time("resource", "student_course_week"):
+            return serialize(await read_course_slice(student_id, course_code, week))
 
-        result = {
-            "student_id": student_id,
-            "current_week": current_week,
-            "current_date": current_date,
-            "courses": basic_courses,
-        }
+    match = COURSE_URI.match(uri_str)
+    if match:
+        student_id, course_code = (unquote(part) for part in match.groups())
+        with TOOL_LATENCY.time("resource", "student_course"):
+            return serialize(await read_course_slice(student_id, course_code))
 
-        return json.dumps(result, ensure_ascii=False, indent=2)
+    match = WEEK_URI.match(uri_str)
+    if match:
+        student_id, week = (unquote(part) for part in match.groups())
+        with TOOL_LATENCY.time("resource", "student_week"):
+            return serialize(await read_course_slice(student_id, week=week))
 
     raise ValueError("Recurso no encontrado")
+
+
+def serialize(result: dict) -> str:
+    with timed("json_serialize"):
+        text = dumps(result)
+    record_size("resource_response", len(text))
+    return text
+
+
+async def read_student_courses(student_id: str) -> dict:
+    # Only the summary record is read, never the full assignment data
+    summary = await CourseService().fetch_course_summary(student_id)
+
+    return {
+        "student_id": student_id,
+        "current_week": summary["current_week"],
+        "current_date": datetime.now().strftime("%d/%m/%Y"),
+        "courses": [
+            {
+                "course_name": course["course_name"],
+                "course_code": course["course_code"],
+                "total_assignments": course["total_assignments"],
+                "status_counts": course["status_counts"],
+            }
+            for course in summary["courses"]
+        ],
+    }
+
+
+async def read_course_slice(student_id: str, course_code: str = None, week: str = None) -> dict:
+    index = await CourseService().fetch_course_index(student_id, course_code)
+
+    with timed("format_response"):
+        return CourseService.format_course_response(
+            index.by_course_code(course_code), student_id=student_id, week=week
+        )
@@ -1,10 +1,12 @@
 """MCP Tool definitions"""
 
-import json
 import mcp.types as types
 from .server import mcp_server
-from src.services.course_service import CourseService
+from src.config import BATCH_MAX_STUDENTS
+from src.services.course_service import CourseService, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
 from src.services.calendar_service import CalendarService
+from src.utils.metrics import TOOL_LATENCY, record_size, timed
+from src.utils.serialization import dumps
 
 
 @mcp_server.list_tools()
@@ -13,7 +15,7 @@ async def list_tools() -> list[types.Tool]:
     return [
         types.Tool(
             name="get_filtered_courses",
-            description="Retrieves and filters courses for a specific student. Returns all courses if no filters are provided, or filters by course code and/or week number when specified. Useful for querying student enrollment and course schedules, assignments, and deadlines.",
+            description="Retrieves and filters courses for a specific student. Returns all courses if no filters are provided, or filters by course code and/or week number when specified. Assignments can also be filtered by due date window and status, reduced to selected fields, and paginated with limit/cursor (without limit or cursor every matching assignment is returned). Useful for querying student enrollment and course schedules, assignments, and deadlines.",
             inputSchema={
                 "type": "object",
                 "properties": {
@@ -29,6 +31,43 @@ async def list_tools() -> list[types.Tool]:
                         "type": "string",
                         "description": "Optional week number to filter course content (e.g., '1', '5', '7')",
                     },
+                    "fields": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "Optional assignment fields to return (e.g., ['title', 'due_on', 'status'])",
+                    },
+                    "exclude_fields": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "Optional assignment fields to omit (e.g., ['instructions'])",
+                    },
+                    "due_after": {
+                        "type": "string",
+                        "description": "Optional ISO date or datetime; only assignments due on or after it (e.g., '2025-01-06')",
+                    },
+                    "due_before": {
+                        "type": "string",
+                        "description": "Optional ISO date or datetime; only assignments due on or before it (a date includes the whole day)",
+                    },
+                    "status": {
+                        "type": "string",
+                        "enum": ["Pending", "Submitted"],
+                        "description": "Optional assignment status filter",
+                    },
+                    "limit": {
+                        "type": "integer",
+                        "minimum": 1,
+                        "maximum": MAX_PAGE_SIZE,
+                        "description": f"Optional maximum number of assignments per page; turns on pagination (without limit or cursor all matching assignments are returned; default {DEFAULT_PAGE_SIZE} when only a cursor is given)",
+                    },
+                    "cursor": {
+                        "type": "string",
+                        "description": "Optional next_cursor value from a previous response, to get the next page",
+                    },
+                    "compact": {
+                        "type": "boolean",
+                        "description": "Return compact JSON without indentation (default false)",
+                    },
                 },
                 "required": ["student_id"],
             },
@@ -55,6 +94,64 @@ async def list_tools() -> list[types.Tool]:
                 "required": [],
             },
         ),
+        types.Tool(
+            name="get_courses_batch",
+            description="Retrieves courses for several students at once with the same filters as get_filtered_courses. Returns one result per student. Useful for advisors reviewing many students.",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "student_ids": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "minItems": 1,
+                        "maxItems": BATCH_MAX_STUDENTS,
+                        "description": "Unique identifiers of the students (required)",
+                    },
+                    "course_code": {
+                        "type": "string",
+                        "description": "Optional course code to filter results (e.g., 'CS101', 'MATH200')",
+                    },
+                    "week": {
+                        "type": "string",
+                        "description": "Optional week number to filter course content (e.g., '1', '5', '7')",
+                    },
+                    "fields": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "Optional assignment fields to return (e.g., ['title', 'due_on', 'status'])",
+                    },
+                    "exclude_fields": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "Optional assignment fields to omit (e.g., ['instructions'])",
+                    },
+                    "due_after": {
+                        "type": "string",
+                        "description": "Optional ISO date or datetime; only assignments due on or after it",
+                    },
+                    "due_before": {
+                        "type": "string",
+                        "description": "Optional ISO date or datetime; only assignments due on or before it (a date includes the whole day)",
+                    },
+                    "status": {
+                        "type": "string",
+                        "enum": ["Pending", "Submitted"],
+                        "description": "Optional assignment status filter",
+                    },
+                    "limit": {
+                        "type": "integer",
+                        "minimum": 1,
+                        "maximum": MAX_PAGE_SIZE,
+                        "description": "Optional maximum number of assignments per student; use next_cursor with get_filtered_courses for more",
+                    },
+                    "compact": {
+                        "type": "boolean",
+                        "description": "Return compact JSON without indentation (default false)",
+                    },
+                },
+                "required": ["student_ids"],
+            },
+        ),
     ]
 
 
@@ -71,31 +168,47 @@ async def call_tool(name: str, arguments: dict) -> list[types.TextContent]:
         List of TextContent results
     """
     if name == "get_filtered_courses":
-        result = await get_filtered_courses(arguments)
+        with TOOL_LATENCY.time("tool", name):
+            result = await get_filtered_courses(arguments)
+
+            with timed("json_serialize"):
+                text = dumps(result, compact=bool(arguments.get("compact")))
+            record_size("tool_response", len(text))
+
+        return [types.TextContent(type="text", text=text)]
 
-        return [
-            types.TextContent(
-                type="text", text=json.dumps(result, ensure_ascii=False, indent=2)
-            )
-        ]
+    if name == "get_courses_batch":
+        with TOOL_LATENCY.time("tool", name):
+            result = await get_courses_batch(arguments)
+
+            with timed("json_serialize"):
+                text = dumps(result, compact=bool(arguments.get("compact")))
+            record_size("tool_response", len(text))
+
+        return [types.TextContent(type="text", text=text)]
 
     if name == "build_ics_file":
-        ics_data = await build_ics_file(arguments)
+        with TOOL_LATENCY.time("tool", name):
+            ics_data = await build_ics_file(arguments)
+            record_size("ics", len(ics_data))
         return [types.TextContent(type="text", text=ics_data)]
 
     raise ValueError(f"Herramienta desconocida: {name}")
 
 
 async def build_ics_file(arguments: dict) -> str:
-    student_id = arguments.get("student_id")
+    # Stripped like the REST route, so both paths produce the same event UIDs
+    student_id = (arguments.get("student_id") or "").strip()
     course_code = arguments.get("course_code")
     week = arguments.get("week")
 
-    # Fetch courses
-    courses_data = CourseService().fetch_courses(student_id)
+    # Fetch indexed courses
+    index = await CourseService().fetch_calendar_index(student_id, course_code)
 
-    # Build ICS calendar
-    ics_data = CalendarService.build_ics_calendar(courses_data, course_code, week)
+    # Build ICS calendar with the streaming writer
+    ics_data = CalendarService.render_ics_calendar(
+        index, course_code, week, student_id
+    )
 
     return ics_data
 
@@ -103,16 +216,15 @@ async def build_ics_file(arguments: dict) -> str:
 async def get_filtered_courses(arguments) -> dict:
     student_id = arguments.get("student_id")
     course_code = arguments.get("course_code")
-    week = arguments.get("week")
 
-    # Fetch courses
-    courses_data = CourseService().fetch_courses(student_id)
+    # Fetch indexed courses
+    index = await CourseService().fetch_course_index(student_id, course_code)
+
+    return CourseService.format_filtered_response(index, arguments)
 
-    # Filter by course_code if provided
-    if course_code:
-        courses_data = CourseService.filter_by_course_code(courses_data, course_code)
 
-    # Format response
-    result = CourseService.format_course_response(courses_data, week=week)
+async def get_courses_batch(arguments: dict) -> dict:
+    student_ids = arguments.get("student_ids") or []
+    filters = {key: value for key, value in arguments.items() if key != "student_ids"}
 
-    return result
+    return await CourseService().fetch_courses_batch(student_ids, filters)
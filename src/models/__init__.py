@@ -1,5 +1,14 @@
 """Data models for the MCP Student Server"""
 from .course import Course, Assignment, WeekAssignments
-from .student import StudentResponse
+from .student import StudentResponse, CoursesBatchRequest
+from .event import SubmissionEvent, SubmissionEventsRequest
 
-__all__ = ["Course", "Assignment", "WeekAssignments", "StudentResponse"]
+__all__ = [
+    "Course",
+    "Assignment",
+    "WeekAssignments",
+    "StudentResponse",
+    "CoursesBatchRequest",
+    "SubmissionEvent",
+    "SubmissionEventsRequest",
+]
@@ -0,0 +1,28 @@
+"""Submission change event models"""
+from typing import List, Literal, Optional, Union
+from pydantic import BaseModel, Field, field_validator
+from src.config import SUBMISSION_EVENTS_MAX_BATCH
+
+
+class SubmissionEvent(BaseModel):
+    """A new submission or grade for one assignment of a student"""
+    student_id: str
+    assignment_id: Union[int, str]
+    status: Literal["Submitted", "Pending"] = "Submitted"
+    grade: Optional[float] = None
+
+    @field_validator("student_id")
+    @classmethod
+    def strip_student_id(cls, value: str) -> str:
+        """Strip the ID the way the other routes do and reject blank IDs"""
+        value = value.strip()
+        if not value:
+            raise ValueError("student_id must not be empty")
+        return value
+
+
+class SubmissionEventsRequest(BaseModel):
+    """Request model for a batch of submission events, oldest first"""
+    events: List[SubmissionEvent] = Field(
+        ..., min_length=1, max_length=SUBMISSION_EVENTS_MAX_BATCH
+    )
@@ -1,6 +1,7 @@
 """Student-related data models"""
 from typing import List, Dict, Optional
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
+from src.config import BATCH_MAX_STUDENTS
 
 
 class StudentResponse(BaseModel):
@@ -9,3 +10,16 @@ class StudentResponse(BaseModel):
     current_week: str
     current_date: str
     courses: List[Dict]
+
+
+class CoursesBatchRequest(BaseModel):
+    """Request model for course lookups of several students with shared filters"""
+    student_ids: List[str] = Field(..., min_length=1, max_length=BATCH_MAX_STUDENTS)
+    course_code: Optional[str] = None
+    week: Optional[str] = None
+    fields: Optional[List[str]] = None
+    exclude_fields: Optional[List[str]] = None
+    due_after: Optional[str] = None
+    due_before: Optional[str] = None
+    status: Optional[str] = None
+    limit: Optional[int] = Field(None, ge=1)
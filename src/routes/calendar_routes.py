@@ -0,0 +1,62 @@
+"""Calendar (ICS) FastAPI routes"""
+from typing import AsyncIterator, Optional
+from fastapi import APIRouter, Request
+from starlette.responses import Response, StreamingResponse
+from src.services.calendar_service import CalendarService
+from src.services.course_service import CourseService
+
+router = APIRouter()
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Check an If-None-Match header against the current ETag
+
+    Args:
+        if_none_match: Raw If-None-Match header value
+        etag: Current quoted ETag
+
+    Returns:
+        True if the client already has the current representation
+    """
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    # Weak comparison, as required for If-None-Match
+    return "*" in candidates or etag in (tag.removeprefix("W/") for tag in candidates)
+
+
+@router.get("/students/{student_id}/calendar.ics")
+async def student_calendar(
+    request: Request,
+    student_id: str,
+    course_code: Optional[str] = None,
+    week: Optional[str] = None,
+) -> Response:
+    """
+    ICS subscription feed for a student's assignments
+
+    Returns 304 Not Modified when the client's If-None-Match matches the
+    current calendar hash, otherwise streams the calendar.
+    """
+    # Stripped like the MCP tool, so both paths produce the same event UIDs
+    student_id = student_id.strip()
+    index = await CourseService().fetch_calendar_index(student_id, course_code)
+
+    etag = CalendarService.calendar_etag(index, course_code, week, student_id)
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+
+    async def body() -> AsyncIterator[str]:
+        for chunk in CalendarService.stream_ics_calendar(
+            index, course_code, week, student_id
+        ):
+            yield chunk
+
+    headers["Content-Disposition"] = f'inline; filename="{student_id}.ics"'
+    return StreamingResponse(
+        body(),
+        media_type="text/calendar; charset=utf-8",
+        headers=headers,
+    )
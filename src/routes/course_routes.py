@@ -0,0 +1,29 @@
+"""Course lookup FastAPI routes"""
+from fastapi import APIRouter
+from starlette.responses import Response
+from src.models.student import CoursesBatchRequest
+from src.services.course_service import CourseService
+from src.utils.metrics import TOOL_LATENCY, record_size, timed
+from src.utils.serialization import dumps
+
+router = APIRouter()
+
+
+@router.post("/students/courses/batch")
+async def courses_batch(request: CoursesBatchRequest) -> Response:
+    """
+    Courses of several students with shared filters
+
+    Cached students are read from Redis in one round trip; only the misses
+    are fetched from the courses API, with bounded concurrency.
+    """
+    with TOOL_LATENCY.time("rest", "courses_batch"):
+        result = await CourseService().fetch_courses_batch(
+            request.student_ids, request.model_dump(exclude={"student_ids"})
+        )
+
+        with timed("json_serialize"):
+            body = dumps(result, compact=True)
+        record_size("rest_response", len(body))
+
+    return Response(content=body, media_type="application/json")
@@ -0,0 +1,63 @@
+"""Submission event ingestion FastAPI routes"""
+import hashlib
+import hmac
+from fastapi import APIRouter, Depends, HTTPException, Request
+from src.config import SUBMISSION_EVENTS_SECRET
+from src.models.event import SubmissionEventsRequest
+from src.services.course_service import CourseService
+from src.utils.metrics import TOOL_LATENCY
+
+router = APIRouter()
+
+SIGNATURE_HEADER = "X-Signature"
+
+
+def sign_body(body: bytes, secret: str) -> str:
+    """
+    Compute the X-Signature value for a request body
+
+    Args:
+        body: Raw request body
+        secret: Shared SUBMISSION_EVENTS_SECRET
+
+    Returns:
+        "sha256=" followed by the hex HMAC-SHA256 of the body
+    """
+    digest = hmac.new(secret.encode("utf-8"), body, hashlib.sha256).hexdigest()
+    return f"sha256={digest}"
+
+
+async def verify_signature(request: Request) -> None:
+    """
+    Require a valid HMAC signature of the raw body in X-Signature
+
+    Raises:
+        HTTPException: 401 if the header is missing, 403 if it does not match
+            or no SUBMISSION_EVENTS_SECRET is configured
+    """
+    if not SUBMISSION_EVENTS_SECRET:
+        raise HTTPException(
+            status_code=403,
+            detail="La recepción de eventos está desactivada: falta SUBMISSION_EVENTS_SECRET",
+        )
+    signature = request.headers.get(SIGNATURE_HEADER)
+    if not signature:
+        raise HTTPException(status_code=401, detail=f"Falta el encabezado {SIGNATURE_HEADER}")
+    expected = sign_body(await request.body(), SUBMISSION_EVENTS_SECRET)
+    if not hmac.compare_digest(signature.strip().encode("utf-8"), expected.encode("utf-8")):
+        raise HTTPException(status_code=403, detail="Firma inválida")
+
+
+@router.post("/events/submissions", dependencies=[Depends(verify_signature)])
+async def submission_events(request: SubmissionEventsRequest) -> dict:
+    """
+    Apply submission and grade changes to the cached courses
+
+    Patches the status/grade of the matching assignments in place instead of
+    refetching the students' courses from the API. Requests must be signed
+    with SUBMISSION_EVENTS_SECRET (see verify_signature).
+    """
+    with TOOL_LATENCY.time("rest", "submission_events"):
+        return await CourseService().apply_submission_events(
+            [event.model_dump() for event in request.events]
+        )
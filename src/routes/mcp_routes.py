@@ -1,9 +1,13 @@
 """MCP-related FastAPI routes"""
 import contextlib
+import logging
+import random
 from collections.abc import AsyncIterator
 from mcp.server.streamable_http_manager import StreamableHTTPSessionManager
-from starlette.types import Receive, Scope, Send
+from starlette.types import Message, Receive, Scope, Send
+from src.config import MCP_DEBUG_CAPTURE_RATE, MCP_DEBUG_CAPTURE_BYTES
 from src.mcp_server.server import mcp_server
+from src.services.api_service import APIService
 
 # Initialize StreamableHTTP session manager with JSON responses for Copilot Studio
 session_manager = StreamableHTTPSessionManager(
@@ -18,8 +22,74 @@ async def handle_streamable_http(scope: Scope, receive: Receive, send: Send) ->
     await session_manager.handle_request(scope, receive, send)
 
 
+class MCPEndpoint:
+    """
+    ASGI passthrough to the StreamableHTTP handler.
+
+    Request and response bodies flow straight through without being
+    buffered. A sampled fraction of requests (MCP_DEBUG_CAPTURE_RATE, off by
+    default) logs the first MCP_DEBUG_CAPTURE_BYTES of each body at DEBUG level.
+    """
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            MCP_DEBUG_CAPTURE_RATE > 0
+            and random.random() < MCP_DEBUG_CAPTURE_RATE
+            and logging.getLogger(__name__).isEnabledFor(logging.DEBUG)
+        ):
+            receive, send = _debug_capture(receive, send, MCP_DEBUG_CAPTURE_BYTES)
+        await handle_streamable_http(scope, receive, send)
+
+
+def _debug_capture(receive: Receive, send: Send, limit: int) -> tuple[Receive, Send]:
+    """
+    Wrap receive/send to log a size-capped prefix of the bodies passing through
+
+    Bodies carry student data, so they are logged at DEBUG and stay out of
+    the INFO-level production logs even while capture is enabled.
+
+    Args:
+        receive: ASGI receive callable
+        send: ASGI send callable
+        limit: Maximum number of body bytes kept per direction
+
+    Returns:
+        Wrapped (receive, send) pair
+    """
+    logger = logging.getLogger(__name__)
+    request_prefix = bytearray()
+    response_prefix = bytearray()
+    status_code = None
+
+    async def receive_wrapper() -> Message:
+        message = await receive()
+        if message["type"] == "http.request":
+            if len(request_prefix) < limit:
+                request_prefix.extend(message.get("body", b"")[:limit - len(request_prefix)])
+            if not message.get("more_body", False):
+                logger.debug(f"MCP request body (first {limit} bytes): {bytes(request_prefix)}")
+        return message
+
+    async def send_wrapper(message: Message) -> None:
+        nonlocal status_code
+        if message["type"] == "http.response.start":
+            status_code = message.get("status")
+        elif message["type"] == "http.response.body":
+            if len(response_prefix) < limit:
+                response_prefix.extend(message.get("body", b"")[:limit - len(response_prefix)])
+            if not message.get("more_body", False):
+                logger.debug(
+                    f"MCP response {status_code} (first {limit} bytes): {bytes(response_prefix)}"
+                )
+        await send(message)
+
+    return receive_wrapper, send_wrapper
+
+
 @contextlib.asynccontextmanager
 async def mcp_lifespan(app) -> AsyncIterator[None]:
     """Lifespan context manager for MCP session manager"""
     async with session_manager.run():
         yield
+    # Release pooled upstream connections on shutdown
+    await APIService.close_http_client()
@@ -0,0 +1,58 @@
+"""Metrics FastAPI routes"""
+from fastapi import APIRouter
+from starlette.responses import PlainTextResponse
+from src.services.api_service import APIService
+from src.services.course_service import CourseService
+from src.services.redis_cache_service import StudentCache
+from src.utils.metrics import REGISTRY, render_metrics
+
+router = APIRouter()
+
+
+def _local_cache_gauges():
+    """Occupancy and counters of the in-process caches"""
+    values = {}
+    for name, cache in (
+        ("courses", CourseService._local_cache),
+        ("courses_stale", CourseService._stale_cache),
+        ("clean_html", APIService._clean_html_cache),
+    ):
+        for stat, value in cache.stats().items():
+            values[(name, stat)] = value
+    return values
+
+
+REGISTRY.gauge_callback(
+    "course_assistant_local_cache",
+    "In-process cache statistics (hits, misses, hit_ratio, evictions, entries, bytes)",
+    _local_cache_gauges,
+    ("cache", "stat"),
+)
+
+
+# Numeric encoding of the breaker states for the gauge
+BREAKER_STATES = {"closed": 0, "half_open": 1, "open": 2}
+
+
+def _circuit_breaker_gauges():
+    """State and counters of the dependency circuit breakers"""
+    values = {}
+    for breaker in (StudentCache.breaker, APIService.breaker):
+        for stat, value in breaker.stats().items():
+            values[(breaker.name, stat)] = BREAKER_STATES[value] if stat == "state" else value
+    return values
+
+
+REGISTRY.gauge_callback(
+    "course_assistant_circuit_breaker",
+    "Circuit breaker state (0 closed, 1 half-open, 2 open), consecutive failures, "
+    "times opened and calls rejected",
+    _circuit_breaker_gauges,
+    ("dependency", "stat"),
+)
+
+
+@router.get("/metrics")
+async def metrics() -> PlainTextResponse:
+    """Prometheus scrape endpoint"""
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
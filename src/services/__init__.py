@@ -1,7 +1,17 @@
 """Services for business logic"""
-from .course_service import CourseService
+from .course_service import CourseService, CoursesUnavailableError
 from .calendar_service import CalendarService
 from .api_service import APIService
 from .redis_cache_service import StudentCache
+from .local_cache_service import LocalCache
+from .course_index import CourseIndex
 
-__all__ = ["CourseService", "CalendarService", "APIService", "StudentCache"]
\ No newline at end of file
+__all__ = [
+    "CourseService",
+    "CoursesUnavailableError",
+    "CalendarService",
+    "APIService",
+    "StudentCache",
+    "LocalCache",
+    "CourseIndex",
+]
\ No newline at end of file
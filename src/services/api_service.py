@@ -1,37 +1,305 @@
 from html import unescape
+import asyncio
+import hashlib
 import logging
+import random
 import re
-from typing import Dict, List, Any
-from src.config import COURSES_API_URL
-import requests
+import time
+from typing import Dict, List, Any, NamedTuple, Optional
+from src.config import (
+    COURSES_API_URL,
+    COURSES_API_POOL_SIZE,
+    COURSES_API_CONNECT_TIMEOUT,
+    COURSES_API_READ_TIMEOUT,
+    COURSES_API_MAX_RETRIES,
+    COURSES_API_BACKOFF_BASE,
+    COURSES_API_BACKOFF_MAX,
+    COURSES_API_BREAKER_FAILURES,
+    COURSES_API_BREAKER_RESET,
+    CLEAN_HTML_CACHE_SIZE,
+)
+from src.services.local_cache_service import LocalCache
+from src.utils.circuit_breaker import CircuitBreaker
+from src.utils.metrics import STAGE_LATENCY, record_size, timed
+import httpx
+
+# Precompiled patterns for clean_html
+_STYLE_SCRIPT_RE = re.compile(r"<(style|script)[^>]*>.*?</\1>", re.DOTALL | re.IGNORECASE)
+_BR_RE = re.compile(r"<br\s*/?>", re.IGNORECASE)
+_LI_RE = re.compile(r"<li(?:\s[^>]*)?>", re.IGNORECASE)
+_TAG_RE = re.compile(r"<[^>]+>")
+# Whitespace patterns start with a literal character so the regex engine can
+# skip ahead to candidates; a leading class such as [ \t\f\v]+ is tried at
+# every position and is slower than splitting the text line by line
+_BLANK_LINES_RE = re.compile(r"\n\s*\n\s*")
+_INDENT_RE = re.compile(r"\n +")
+_SPACE_RUN_RE = re.compile(r"  +")
+# Folded into plain spaces first; \xa0 is a decoded &nbsp;
+_OTHER_SPACES = ("\t", "\xa0", "\r", "\f", "\v")
+
+
+def _collapse_whitespace(text: str) -> str:
+    """Collapse whitespace runs within lines and keep at most one blank line."""
+    for space in _OTHER_SPACES:
+        if space in text:
+            text = text.replace(space, " ")
+    text = _BLANK_LINES_RE.sub("\n\n", text)
+    text = _INDENT_RE.sub("\n", text)
+    return _SPACE_RUN_RE.sub(" ", text).replace(" \n", "\n").strip()
+
+
+class CoursesAPIError(Exception):
+    """The courses API is unreachable or answered with a server error"""
+
+
+class CoursesFetch(NamedTuple):
+    """Result of a (possibly conditional) courses API request"""
+    courses: Optional[List[Dict[str, Any]]]  # None when not modified
+    validator: Optional[Dict[str, Any]]  # etag, last_modified and hash of the body
+    not_modified: bool
+
 
 class APIService:
 
+    # Shared pooled keep-alive HTTP client, recreated whenever the running
+    # event loop changes
+    _http_client: Optional[httpx.AsyncClient] = None
+    _http_client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    # Fails fast while the courses API keeps timing out or returning 5xx
+    breaker = CircuitBreaker(
+        "courses_api",
+        failure_threshold=COURSES_API_BREAKER_FAILURES,
+        reset_timeout=COURSES_API_BREAKER_RESET,
+        failure_exceptions=(httpx.TransportError, CoursesAPIError),
+    )
+
+    @classmethod
+    def _get_http_client(cls) -> httpx.AsyncClient:
+        """
+        Return the pooled async HTTP client bound to the running event loop.
+
+        Returns:
+            An httpx.AsyncClient usable from the current loop.
+        """
+        loop = asyncio.get_running_loop()
+        if cls._http_client is None or cls._http_client_loop is not loop:
+            cls._http_client = httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=COURSES_API_POOL_SIZE,
+                    max_keepalive_connections=COURSES_API_POOL_SIZE,
+                ),
+                timeout=httpx.Timeout(
+                    COURSES_API_READ_TIMEOUT,
+                    connect=COURSES_API_CONNECT_TIMEOUT,
+                ),
+            )
+            cls._http_client_loop = loop
+        return cls._http_client
+
+    @classmethod
+    async def close_http_client(cls) -> None:
+        """Close the shared HTTP client and its pooled connections."""
+        if cls._http_client is not None:
+            client, cls._http_client = cls._http_client, None
+            cls._http_client_loop = None
+            await client.aclose()
+
+    @staticmethod
+    async def _post_with_retries(
+        payload: Dict[str, Any], headers: Optional[Dict[str, str]] = None
+    ) -> httpx.Response:
+        """
+        POST to the courses API, retrying 5xx responses and connection errors.
+
+        Retries use exponential backoff with full jitter, bounded by
+        COURSES_API_MAX_RETRIES and COURSES_API_BACKOFF_MAX.
+
+        Args:
+            payload: JSON body of the request.
+            headers: Optional extra request headers.
+
+        Returns:
+            The last response received.
+
+        Raises:
+            httpx.TransportError: If the last attempt failed to get a response.
+        """
+        client = APIService._get_http_client()
+        for attempt in range(COURSES_API_MAX_RETRIES + 1):
+            try:
+                response = await client.post(url=COURSES_API_URL, json=payload, headers=headers)
+                if response.status_code < 500 or attempt == COURSES_API_MAX_RETRIES:
+                    return response
+                reason = f"status {response.status_code}"
+            except httpx.TransportError as e:
+                if attempt == COURSES_API_MAX_RETRIES:
+                    raise
+                reason = f"{type(e).__name__}: {e}"
+
+            delay = random.uniform(
+                0, min(COURSES_API_BACKOFF_MAX, COURSES_API_BACKOFF_BASE * 2 ** attempt)
+            )
+            logging.warning(
+                f"Courses API attempt {attempt + 1} failed ({reason}), retrying in {delay:.2f}s"
+            )
+            await asyncio.sleep(delay)
+
+    @staticmethod
+    async def _request_courses(
+        payload: Dict[str, Any], headers: Optional[Dict[str, str]] = None
+    ) -> httpx.Response:
+        """
+        POST to the courses API through the circuit breaker.
+
+        Args:
+            payload: JSON body of the request.
+            headers: Optional extra request headers.
+
+        Returns:
+            The response (never a 5xx).
+
+        Raises:
+            CircuitOpenError: If the circuit is open.
+            CoursesAPIError: If the API still answers 5xx after the retries.
+            httpx.TransportError: If the API could not be reached.
+        """
+
+        async def post() -> httpx.Response:
+            response = await APIService._post_with_retries(payload, headers)
+            if response.status_code >= 500:
+                raise CoursesAPIError(f"Courses API responded {response.status_code}")
+            return response
+
+        return await APIService.breaker.call(post)
+
+    # Memo of cleaned descriptions keyed by content hash; template descriptions
+    # repeat across sections and students
+    _clean_html_cache = LocalCache(max_entries=CLEAN_HTML_CACHE_SIZE, ttl=None)
+
     @staticmethod
     def clean_html(html_text: str) -> str:
         """
         Remove HTML tags and clean text to save tokens.
 
+        Results are memoized by a hash of the input, so repeated descriptions
+        are only cleaned once per worker.
+
         Args:
             html_text: The HTML text to clean.
 
         Returns:
-            Cleaned text without HTML tags.
+            Cleaned text without HTML tags and with whitespace runs collapsed.
         """
         if not html_text:
             return ""
-        # Remove style and script tags
-        clean = re.sub(r"<(style|script)[^>]*>.*?</\1>", "", html_text, flags=re.DOTALL)
-        # Replace breaks and list items with line breaks/dashes
-        clean = re.sub(r"<br\s*/?>", "\n", clean)
-        clean = re.sub(r"<li>", "\n- ", clean)
-        # Remove remaining HTML tags
-        clean = re.sub(r"<[^>]+>", "", clean)
+        start = time.perf_counter()
+        key = hashlib.blake2b(html_text.encode("utf-8"), digest_size=16).digest()
+        cleaned = APIService._clean_html_cache.get(key)
+        if cleaned is None:
+            cleaned = APIService._clean_html_uncached(html_text)
+            APIService._clean_html_cache.set(key, cleaned, size=len(cleaned))
+        STAGE_LATENCY.observe(time.perf_counter() - start, "clean_html")
+        return cleaned
+
+    @staticmethod
+    def _clean_html_uncached(html_text: str) -> str:
+        if "<" in html_text:
+            # Remove style and script tags
+            clean = _STYLE_SCRIPT_RE.sub("", html_text)
+            # Replace breaks and list items with line breaks/dashes
+            clean = _BR_RE.sub("\n", clean)
+            clean = _LI_RE.sub("\n- ", clean)
+            # Remove remaining HTML tags
+            clean = _TAG_RE.sub("", clean)
+        else:
+            clean = html_text
         # Decode HTML entities (e.g., &nbsp; to space) and clean extra spaces
-        return unescape(clean).strip()
+        if "&" in clean:
+            clean = unescape(clean)
+        return _collapse_whitespace(clean)
 
     @staticmethod
-    def get_courses_from_api(student_id: str) -> List[Dict[str, Any]]:
+    def transform_api_payload(data: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Turn a raw courses API response into the processed course list.
+
+        Assignments and submissions are grouped in a single pass each, so the
+        cost is linear in the payload size. This function is pure: it performs
+        no I/O and only depends on its input.
+
+        Args:
+            data: Decoded API response with current_courses, guids,
+                week_assignments and submissions.
+
+        Returns:
+            A list of processed course dictionaries (see get_courses_from_api).
+        """
+        current_courses = data.get("current_courses", [])
+        guids = data.get("guids", [])
+        week_assignments = data.get("week_assignments", [])
+        submissions = data.get("submissions", [])
+
+        # Quick lookup maps
+        guid_map = {g["canvas_sis_id"]: g for g in guids}
+        submission_map = {}
+        for s in submissions:
+            submission_map.setdefault(s["canvas_assignment_id"], []).append(s)
+        assignment_map = {}
+        for assignment in week_assignments:
+            assignment_map.setdefault(assignment["canvas_course_id"], []).append(assignment)
+
+        output_courses = []
+
+        for course in current_courses:
+            course_info = guid_map.get(course["canvas_sis_id"], {})
+            course_id = course_info.get("canvas_course_id")
+
+            # Use current_week directly from guids
+            processed_course = {
+                "course_name": course.get("course_name", "Unknown Course"),
+                "course_code": course.get("course_code", "Unknown Code"),
+                "term_code": course.get("term_code", "Unknown Term"),
+                "start_date": course.get("start_date", "Unknown Start Date"),
+                "current_week": int(course_info.get("current_week", 0)),
+                "week_assignments": {},
+                "canvas_course_id": course_id,
+            }
+
+            # Clean the assignments that belong to this course
+            for assignment in assignment_map.get(course_id, []):
+                week = str(assignment["due_week"])
+
+                clean_assignment = {
+                    "assignment_id": assignment["canvas_assignment_id"],
+                    "title": assignment["title"],
+                    "possible_score": assignment["points_possible_decimal"],
+                    "due_on": f"{assignment['due_on']}",
+                    "type": assignment["submission_type"],
+                    "instructions": APIService.clean_html(
+                        assignment.get("description", "")
+                    ),
+                }
+
+                # Submission status (simplified)
+                subs = submission_map.get(assignment["canvas_assignment_id"], [])
+                if subs:
+                    clean_assignment["status"] = "Submitted"
+                    if subs[0].get("score") is not None:
+                        clean_assignment["grade"] = subs[0]["score"]
+                else:
+                    clean_assignment["status"] = "Pending"
+
+                processed_course["week_assignments"].setdefault(
+                    week, []
+                ).append(clean_assignment)
+
+            output_courses.append(processed_course)
+
+        return output_courses
+
+    @staticmethod
+    async def get_courses_from_api(student_id: str) -> List[Dict[str, Any]]:
         """
         Fetch and process course data for a specific user from the external API.
 
@@ -47,84 +315,115 @@ class APIService:
             - code: Course code
             - current_week: Current week number
             - week_assignments: Dictionary of assignments organized by week
-            Each assignment includes title, points, due date, type, instructions,
-            status, and grade (if applicable).
+            - canvas_course_id: Canvas course the assignments belong to
+            Each assignment includes its id, title, points, due date, type,
+            instructions, status, and grade (if applicable).
 
         Note:
-            Returns an empty list if the API call fails or encounters an error.
+            Returns an empty list if the API call fails or encounters an error;
+            use get_courses_conditional to tell failures from empty results.
         """
         try:
-            response = requests.post(
-                url=COURSES_API_URL,
-                json={"user_id": student_id}
+            result = await APIService.get_courses_conditional(student_id)
+        except Exception as e:
+            logging.error(f"Error fetching courses from API: {str(e)}")
+            return []
+        return result.courses or []
+
+    @staticmethod
+    def make_validator(response: httpx.Response) -> Dict[str, Any]:
+        """
+        Build the validator of a courses API response.
+
+        Args:
+            response: A successful courses API response.
+
+        Returns:
+            Dictionary with the ETag and Last-Modified headers (None if absent)
+            and a hash of the raw body, used when the API sends neither.
+        """
+        return {
+            "etag": response.headers.get("etag"),
+            "last_modified": response.headers.get("last-modified"),
+            "hash": hashlib.blake2b(response.content, digest_size=16).hexdigest(),
+        }
+
+    @staticmethod
+    def conditional_headers(validator: Optional[Dict[str, Any]]) -> Dict[str, str]:
+        """
+        Get the conditional request headers for a stored validator.
+
+        Args:
+            validator: Validator from make_validator, or None.
+
+        Returns:
+            If-None-Match and/or If-Modified-Since headers (empty if none apply).
+        """
+        headers = {}
+        if validator and validator.get("etag"):
+            headers["If-None-Match"] = validator["etag"]
+        if validator and validator.get("last_modified"):
+            headers["If-Modified-Since"] = validator["last_modified"]
+        return headers
+
+    @staticmethod
+    async def get_courses_conditional(
+        student_id: str, validator: Optional[Dict[str, Any]] = None
+    ) -> CoursesFetch:
+        """
+        Fetch course data, skipping the transform when it has not changed.
+
+        With a validator, the request carries If-None-Match/If-Modified-Since.
+        A 304 response, or a 200 whose body hashes the same as before, is
+        reported as not modified without parsing or transforming the body.
+
+        Args:
+            student_id: The unique identifier of the user.
+            validator: Validator stored with the cached courses, if any.
+
+        Returns:
+            CoursesFetch with the processed courses (see get_courses_from_api)
+            and the new validator, or not_modified=True and courses=None.
+            A 4xx response returns an empty course list and no validator.
+
+        Raises:
+            CircuitOpenError: If the courses API circuit is open.
+            CoursesAPIError: If the API fails or returns an unreadable payload.
+            httpx.TransportError: If the API could not be reached.
+        """
+        with timed("upstream_api"):
+            response = await APIService._request_courses(
+                {"user_id": student_id}, APIService.conditional_headers(validator)
             )
-            print("API_URL:", COURSES_API_URL)
-            print("Student:", student_id)
-            print("Response", response.ok)
-            if not response.ok:
-                return []
+        logging.info(
+            f"Courses API responded {response.status_code} for user {student_id}"
+        )
+        if response.status_code == 304 and validator:
+            return CoursesFetch(None, validator, True)
+        if not response.is_success:
+            return CoursesFetch([], None, False)
+
+        record_size("upstream_response", len(response.content))
+        current = APIService.make_validator(response)
+        if validator and validator.get("hash") == current["hash"]:
+            return CoursesFetch(None, current, True)
 
+        try:
             data = response.json()
-            current_courses = data.get("current_courses", [])
-            guids = data.get("guids", [])
-            week_assignments = data.get("week_assignments", [])
-            submissions = data.get("submissions", [])
-            
-            # Quick lookup maps
-            guid_map = {g["canvas_sis_id"]: g for g in guids}
-            submission_map = {}
-            for s in submissions:
-                submission_map.setdefault(s["canvas_assignment_id"], []).append(s)
-
-            output_courses = []
-
-            for course in current_courses:
-                course_info = guid_map.get(course["canvas_sis_id"], {})
-                course_id = course_info.get("canvas_course_id")
-
-                # Use current_week directly from guids
-                processed_course = {
-                    "course_name": course.get("course_name", "Unknown Course"),
-                    "course_code": course.get("course_code", "Unknown Code"),
-                    "term_code": course.get("term_code", "Unknown Term"),
-                    "start_date": course.get("start_date", "Unknown Start Date"),
-                    "current_week": int(course_info.get("current_week", 0)),
-                    "week_assignments": {},
-                }
+            with timed("transform"):
+                return CoursesFetch(APIService.transform_api_payload(data), current, False)
+        except (ValueError, KeyError, TypeError) as e:
+            raise CoursesAPIError(f"Unreadable courses API payload: {e}") from e
 
-                # Filter and clean assignments
-                for assignment in week_assignments:
-                    if assignment["canvas_course_id"] == course_id:
-                        week = str(assignment["due_week"])
-
-                        clean_assignment = {
-                            "title": assignment["title"],
-                            "possible_score": assignment["points_possible_decimal"],
-                            "due_on": f"{assignment['due_on']}",
-                            "type": assignment["submission_type"],
-                            "instructions": APIService.clean_html(
-                                assignment.get("description", "")
-                            ),
-                        }
-
-                        # Submission status (simplified)
-                        subs = submission_map.get(
-                            assignment["canvas_assignment_id"], []
-                        )
-                        if subs:
-                            clean_assignment["status"] = "Submitted"
-                            if subs[0].get("score") is not None:
-                                clean_assignment["grade"] = subs[0]["score"]
-                        else:
-                            clean_assignment["status"] = "Pending"
-
-                        processed_course["week_assignments"].setdefault(
-                            week, []
-                        ).append(clean_assignment)
-
-                output_courses.append(processed_course)
-
-            return output_courses
-        except Exception as e:
-            logging.error(f"Error fetching courses from API: {str(e)}")
-            return []
+    @staticmethod
+    def get_courses_from_api_sync(student_id: str) -> List[Dict[str, Any]]:
+        """
+        Blocking wrapper around get_courses_from_api for non-async callers.
+
+        Args:
+            student_id: The unique identifier of the user.
+
+        Returns:
+            The same processed course list as get_courses_from_api.
+        """
+        return asyncio.run(APIService.get_courses_from_api(student_id))
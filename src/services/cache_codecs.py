@@ -0,0 +1,163 @@
+"""Pluggable serialization and compression for cached payloads"""
+import zlib
+from typing import Any, Optional
+
+from src.utils import serialization
+
+try:
+    import msgpack
+except ImportError:  # optional dependency
+    msgpack = None
+
+try:
+    import zstandard
+except ImportError:  # optional dependency
+    zstandard = None
+
+
+# Header byte layout: 1ccc ffff
+#   high bit always set, so a header never collides with the first byte of a
+#   legacy JSON payload ('{' or '"'); c = compression, f = serialization format
+HEADER_MARKER = 0x80
+FORMAT_JSON = 0x01
+FORMAT_MSGPACK = 0x02
+COMPRESSION_NONE = 0x00
+COMPRESSION_ZLIB = 0x01
+COMPRESSION_ZSTD = 0x02
+
+SERIALIZERS = {"json": FORMAT_JSON, "msgpack": FORMAT_MSGPACK}
+COMPRESSIONS = {"none": COMPRESSION_NONE, "zlib": COMPRESSION_ZLIB, "zstd": COMPRESSION_ZSTD}
+
+
+def has_header(payload: bytes) -> bool:
+    """
+    Check whether a payload starts with a codec header byte.
+
+    Args:
+        payload: Raw bytes read from the cache.
+
+    Returns:
+        True if the payload was written by a CacheCodec.
+    """
+    return bool(payload) and payload[0] & HEADER_MARKER == HEADER_MARKER
+
+
+class CacheCodec:
+    """
+    Encodes values as a header byte followed by the (optionally compressed)
+    serialized body. Decoding reads the header, so any codec can read
+    payloads written by any other configuration.
+    """
+
+    def __init__(
+        self,
+        serializer: str = "json",
+        compression: str = "zlib",
+        compression_threshold: int = 1024,
+        compression_level: Optional[int] = None,
+    ):
+        """
+        Initialize the CacheCodec.
+
+        Args:
+            serializer: "json" or "msgpack".
+            compression: "none", "zlib" or "zstd".
+            compression_threshold: Minimum serialized size in bytes to compress.
+            compression_level: Compression level (library default if None).
+
+        Raises:
+            ValueError: If the serializer or compression name is unknown, or the
+                library it needs is not installed.
+        """
+        if serializer not in SERIALIZERS:
+            raise ValueError(f"Unknown cache serializer: {serializer}")
+        if compression not in COMPRESSIONS:
+            raise ValueError(f"Unknown cache compression: {compression}")
+        if serializer == "msgpack" and msgpack is None:
+            raise ValueError("Cache serializer 'msgpack' requires the msgpack package")
+        if compression == "zstd" and zstandard is None:
+            raise ValueError("Cache compression 'zstd' requires the zstandard package")
+
+        self.serializer = serializer
+        self.compression = compression
+        self.compression_threshold = compression_threshold
+        self.compression_level = compression_level
+
+    def encode(self, value: Any) -> bytes:
+        """
+        Serialize and, above the size threshold, compress a value.
+
+        Args:
+            value: The value to encode.
+
+        Returns:
+            Header byte followed by the encoded body.
+        """
+        fmt = SERIALIZERS[self.serializer]
+        body = _serialize(fmt, value)
+
+        comp = COMPRESSION_NONE
+        if self.compression != "none" and len(body) >= self.compression_threshold:
+            comp = COMPRESSIONS[self.compression]
+            body = _compress(comp, body, self.compression_level)
+
+        return bytes([HEADER_MARKER | comp << 4 | fmt]) + body
+
+    @staticmethod
+    def decode(payload: bytes) -> Any:
+        """
+        Decode a payload produced by any CacheCodec configuration.
+
+        Args:
+            payload: Header byte followed by the encoded body.
+
+        Returns:
+            The decoded value.
+
+        Raises:
+            ValueError: If the header is invalid or needs a missing library.
+        """
+        if not has_header(payload):
+            raise ValueError("Payload has no cache codec header")
+
+        header = payload[0]
+        fmt = header & 0x0F
+        comp = (header >> 4) & 0x07
+        body = _decompress(comp, memoryview(payload)[1:])
+        return _deserialize(fmt, body)
+
+
+def _serialize(fmt: int, value: Any) -> bytes:
+    if fmt == FORMAT_MSGPACK:
+        return msgpack.packb(value, use_bin_type=True)
+    return serialization.dumps_bytes(value, compact=True)
+
+
+def _deserialize(fmt: int, body: bytes) -> Any:
+    if fmt == FORMAT_JSON:
+        return serialization.loads(body)
+    if fmt == FORMAT_MSGPACK:
+        if msgpack is None:
+            raise ValueError("Payload is msgpack but the msgpack package is not installed")
+        return msgpack.unpackb(body, raw=False)
+    raise ValueError(f"Unknown serialization format in header: {fmt}")
+
+
+def _compress(comp: int, body: bytes, level: Optional[int]) -> bytes:
+    if comp == COMPRESSION_ZLIB:
+        return zlib.compress(body, -1 if level is None else level)
+    if comp == COMPRESSION_ZSTD:
+        return zstandard.ZstdCompressor(level=3 if level is None else level).compress(body)
+    return body
+
+
+def _decompress(comp: int, body: memoryview) -> bytes:
+    if comp == COMPRESSION_NONE:
+        return body
+    if comp == COMPRESSION_ZLIB:
+        return zlib.decompress(body)
+    if comp == COMPRESSION_ZSTD:
+        if zstandard is None:
+            raise ValueError("Payload is zstd-compressed but zstandard is not installed")
+        return zstandard.ZstdDecompressor().decompress(body)
+    raise ValueError(f"Unknown compression in header: {comp}")
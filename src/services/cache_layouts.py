@@ -0,0 +1,647 @@
+"""How a student's cached course data is laid out in Redis"""
+import hashlib
+import logging
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, NamedTuple, Optional, Set, Tuple
+
+import redis
+
+from src.utils import serialization
+
+if TYPE_CHECKING:
+    from src.services.redis_cache_service import StudentCache
+
+
+class CacheEntry(NamedTuple):
+    """A decoded cache value with its metadata"""
+    data: Any
+    stored_at: float  # epoch seconds when written (0.0 if unknown)
+    size: int  # encoded payload size in bytes
+    legacy: bool  # True if read from a format older than the codec header
+
+
+class BlobLayout:
+    """
+    One value per student holding the whole course list, plus a separate
+    summary key. Every read transfers and decodes all courses.
+    """
+
+    name = "blob"
+    # Whether read_courses transfers only the requested courses
+    partial_reads = False
+    # Attempts of a WATCH/MULTI patch before giving up
+    PATCH_MAX_RETRIES = 5
+
+    def __init__(self, cache: "StudentCache"):
+        """
+        Initialize the layout.
+
+        Args:
+            cache: The StudentCache providing keys, codec and expiration.
+        """
+        self.cache = cache
+
+    def data_key(self, user_id: str) -> str:
+        """Key holding the course data of a user"""
+        return self.cache._build_key(user_id)
+
+    def summary_key(self, user_id: str) -> str:
+        """Key holding the summary record of a user"""
+        return self.cache._build_key(user_id, self.cache.summary_data_type)
+
+    def queue_write(
+        self,
+        pipe,
+        user_id: str,
+        data: Any,
+        summary: Any,
+        stored_at: float,
+        queued: Optional[Set[str]] = None,
+    ) -> int:
+        """
+        Queue the commands that store a user's courses on a pipeline.
+
+        Args:
+            pipe: Redis pipeline to queue commands on.
+            user_id: The user's unique identifier.
+            data: The course list.
+            summary: Optional summary record.
+            stored_at: Timestamp recorded in the envelopes.
+            queued: Shared keys already queued on this pipeline; layouts
+                with records shared between users skip them and add the
+                ones they queue.
+        Returns:
+            The size of the course payload in bytes.
+        """
+        payload = self.cache.encode(data, stored_at)
+        pipe.set(self.data_key(user_id), payload, ex=self.cache.expiration_time)
+        if summary is not None:
+            pipe.set(
+                self.summary_key(user_id),
+                self.cache.encode(summary, stored_at),
+                ex=self.cache.expiration_time,
+            )
+        return len(payload)
+
+    async def read(self, client, user_id: str) -> Optional[CacheEntry]:
+        """
+        Read all courses of a user in one round trip.
+
+        Entries still in a legacy format are rewritten with the current
+        codec, keeping their timestamp and remaining TTL.
+
+        Args:
+            client: Redis client.
+            user_id: The user's unique identifier.
+        Returns:
+            The decoded CacheEntry, or None if nothing is cached.
+        """
+        key = self.data_key(user_id)
+        raw = await client.get(key)
+        if not raw:
+            return None
+        entry = self.cache.decode(raw)
+        if entry is not None and entry.legacy:
+            await client.set(key, self.cache.encode(entry.data, entry.stored_at), keepttl=True)
+            logging.info(f"Migrated legacy cache entry for user {user_id}")
+        return entry
+
+    async def read_courses(
+        self, client, user_id: str, course_codes: List[str]
+    ) -> Optional[CacheEntry]:
+        """
+        Read only the courses with the given codes.
+
+        Args:
+            client: Redis client.
+            user_id: The user's unique identifier.
+            course_codes: Course codes to return.
+        Returns:
+            CacheEntry with the matching courses (possibly none), or None if
+            nothing is cached for the user.
+        """
+        entry = await self.read(client, user_id)
+        if entry is None:
+            return None
+        courses = [course for course in entry.data if course["course_code"] in course_codes]
+        return entry._replace(data=courses)
+
+    async def read_many(
+        self, client, user_ids: List[str], course_codes: Optional[List[str]] = None
+    ) -> Dict[str, Optional[CacheEntry]]:
+        """
+        Read the courses of several users in one round trip (MGET).
+
+        Legacy entries are decoded but not migrated here; a single-user read
+        migrates them.
+
+        Args:
+            client: Redis client.
+            user_ids: The users' unique identifiers.
+            course_codes: Optional course codes to keep (all if not provided).
+        Returns:
+            Mapping of user ID to its CacheEntry, or None if nothing is cached.
+        """
+        raws = await client.mget([self.data_key(user_id) for user_id in user_ids])
+        entries: Dict[str, Optional[CacheEntry]] = {}
+        for user_id, raw in zip(user_ids, raws):
+            entry = self.cache.decode(raw) if raw else None
+            if entry is not None and course_codes:
+                entry = entry._replace(
+                    data=[c for c in entry.data if c["course_code"] in course_codes]
+                )
+            entries[user_id] = entry
+        return entries
+
+    def entry_keys(self, user_id: str) -> List[str]:
+        """Keys holding a user's cached courses and summary (data key first)"""
+        return list(dict.fromkeys([self.data_key(user_id), self.summary_key(user_id)]))
+
+    async def patch(
+        self,
+        client,
+        user_id: str,
+        apply: Callable[[List[Dict[str, Any]]], bool],
+        summarize: Optional[Callable[[List[Dict[str, Any]]], Any]] = None,
+    ) -> Optional[CacheEntry]:
+        """
+        Modify a user's cached courses in place, atomically (WATCH/MULTI).
+
+        The courses are read under WATCH, changed by `apply` and written back
+        in a MULTI block keeping the original timestamp and remaining TTL. If
+        another client writes the keys in between, the read and `apply` are
+        retried on the new value.
+
+        Args:
+            client: Redis client.
+            user_id: The user's unique identifier.
+            apply: Mutates the course list; returns False if nothing changed.
+            summarize: Builds the summary record from the patched courses.
+        Returns:
+            The entry with the patched courses, or None if nothing is cached
+            or the keys kept changing for PATCH_MAX_RETRIES attempts.
+        """
+        async with client.pipeline(transaction=True) as pipe:
+            for _ in range(self.PATCH_MAX_RETRIES):
+                try:
+                    await pipe.watch(*self.entry_keys(user_id))
+                    entry = await self.read(pipe, user_id)
+                    if entry is None or not apply(entry.data):
+                        return entry
+                    summary = summarize(entry.data) if summarize else None
+                    pipe.multi()
+                    self.queue_patch(pipe, user_id, entry, summary)
+                    await pipe.execute()
+                    return entry
+                except redis.WatchError:
+                    logging.info(f"Cache entry for user {user_id} changed during patch, retrying")
+        logging.warning(f"Gave up patching cache entry for user {user_id}")
+        return None
+
+    async def touch(self, client, user_id: str) -> bool:
+        """
+        Reset the TTL of a user's cached keys without rewriting them.
+
+        Args:
+            client: Redis client.
+            user_id: The user's unique identifier.
+        Returns:
+            True if the course data still exists.
+        """
+        async with client.pipeline(transaction=False) as pipe:
+            for key in self.entry_keys(user_id):
+                pipe.expire(key, self.cache.expiration_time)
+            results = await pipe.execute()
+        return bool(results[0])
+
+    def queue_patch(self, pipe, user_id: str, entry: CacheEntry, summary: Any) -> None:
+        """
+        Queue the commands that overwrite a user's patched courses.
+
+        Unlike queue_write, existing keys keep their TTL and timestamp, so a
+        patch never extends how long the rest of the data is trusted.
+
+        Args:
+            pipe: Redis pipeline in MULTI mode.
+            user_id: The user's unique identifier.
+            entry: The entry read, holding the patched courses.
+            summary: Optional summary record rebuilt from the courses.
+        """
+        pipe.set(
+            self.data_key(user_id),
+            self.cache.encode(entry.data, entry.stored_at),
+            keepttl=True,
+        )
+        if summary is not None:
+            # Only refresh an existing summary: a new key would have no TTL
+            pipe.set(
+                self.summary_key(user_id),
+                self.cache.encode(summary, entry.stored_at),
+                xx=True,
+                keepttl=True,
+            )
+
+    async def read_summary(self, client, user_id: str) -> Optional[CacheEntry]:
+        """
+        Read the summary record of a user.
+
+        Args:
+            client: Redis client.
+            user_id: The user's unique identifier.
+        Returns:
+            The decoded CacheEntry, or None if there is no summary.
+        """
+        raw = await client.get(self.summary_key(user_id))
+        return self.cache.decode(raw) if raw else None
+
+    async def write_summary(
+        self, client, user_id: str, summary: Any, stored_at: Optional[float]
+    ) -> bool:
+        """
+        Write the summary record of a user on its own.
+
+        Args:
+            client: Redis client.
+            user_id: The user's unique identifier.
+            summary: The summary record.
+            stored_at: Timestamp of the course data it was built from.
+        Returns:
+            True if the record was written.
+        """
+        return bool(
+            await client.set(
+                self.summary_key(user_id),
+                self.cache.encode(summary, stored_at),
+                ex=self.cache.expiration_time,
+            )
+        )
+
+
+class ShardedLayout(BlobLayout):
+    """
+    One Redis hash per student with a field per course code, a field with
+    the course order and a summary field. Filtered reads use HMGET, so the
+    bytes transferred scale with the number of courses requested.
+    """
+
+    name = "sharded"
+    partial_reads = True
+
+    META_FIELD = "meta"  # course codes in course order
+    SUMMARY_FIELD = "summary"
+    COURSE_FIELD_PREFIX = "course:"
+
+    def data_key(self, user_id: str) -> str:
+        return self.cache._build_key(user_id, "course_shards")
+
+    def summary_key(self, user_id: str) -> str:
+        # The summary lives in the hash itself
+        return self.data_key(user_id)
+
+    def course_field(self, course_code: str) -> str:
+        """Hash field holding the courses with a given code"""
+        return f"{self.COURSE_FIELD_PREFIX}{course_code}"
+
+    def queue_write(
+        self,
+        pipe,
+        user_id: str,
+        data: Any,
+        summary: Any,
+        stored_at: float,
+        queued: Optional[Set[str]] = None,
+    ) -> int:
+        groups: Dict[str, List[Dict[str, Any]]] = {}
+        for course in data:
+            groups.setdefault(course["course_code"], []).append(course)
+
+        mapping = {self.META_FIELD: self.cache.encode(list(groups), stored_at)}
+        for course_code, courses in groups.items():
+            mapping[self.course_field(course_code)] = self.cache.encode(courses, stored_at)
+        if summary is not None:
+            mapping[self.SUMMARY_FIELD] = self.cache.encode(summary, stored_at)
+
+        # Replace the whole hash so dropped courses do not linger
+        key = self.data_key(user_id)
+        pipe.delete(key)
+        pipe.hset(key, mapping=mapping)
+        pipe.expire(key, self.cache.expiration_time)
+        return sum(len(value) for field, value in mapping.items() if field != self.SUMMARY_FIELD)
+
+    async def read(self, client, user_id: str) -> Optional[CacheEntry]:
+        return self._from_hash(await client.hgetall(self.data_key(user_id)))
+
+    async def read_courses(
+        self, client, user_id: str, course_codes: List[str]
+    ) -> Optional[CacheEntry]:
+        fields = self._course_fields(course_codes)
+        return self._from_fields(await client.hmget(self.data_key(user_id), fields))
+
+    async def read_many(
+        self, client, user_ids: List[str], course_codes: Optional[List[str]] = None
+    ) -> Dict[str, Optional[CacheEntry]]:
+        async with client.pipeline(transaction=False) as pipe:
+            for user_id in user_ids:
+                if course_codes:
+                    pipe.hmget(self.data_key(user_id), self._course_fields(course_codes))
+                else:
+                    pipe.hgetall(self.data_key(user_id))
+            results = await pipe.execute()
+
+        parse = self._from_fields if course_codes else self._from_hash
+        return {user_id: parse(result) for user_id, result in zip(user_ids, results)}
+
+    def queue_patch(self, pipe, user_id: str, entry: CacheEntry, summary: Any) -> None:
+        # HSET on the existing hash keeps its TTL; the course order is unchanged
+        groups: Dict[str, List[Dict[str, Any]]] = {}
+        for course in entry.data:
+            groups.setdefault(course["course_code"], []).append(course)
+        mapping = {
+            self.course_field(course_code): self.cache.encode(courses, entry.stored_at)
+            for course_code, courses in groups.items()
+        }
+        if summary is not None:
+            mapping[self.SUMMARY_FIELD] = self.cache.encode(summary, entry.stored_at)
+        pipe.hset(self.data_key(user_id), mapping=mapping)
+
+    def _course_fields(self, course_codes: List[str]) -> List[str]:
+        # Order field first, then one field per distinct requested code
+        return [self.META_FIELD] + [
+            self.course_field(code) for code in dict.fromkeys(course_codes)
+        ]
+
+    def _from_hash(self, fields: Dict[bytes, bytes]) -> Optional[CacheEntry]:
+        raw_meta = fields.get(self.META_FIELD.encode())
+        if not raw_meta:
+            return None
+        course_codes = self.cache.decode(raw_meta).data
+        return self._from_fields(
+            [raw_meta] + [fields.get(self.course_field(code).encode()) for code in course_codes]
+        )
+
+    def _from_fields(self, raws: List[Optional[bytes]]) -> Optional[CacheEntry]:
+        # raws: the order field followed by course fields (missing ones are None)
+        if not raws[0]:
+            return None
+        meta = self.cache.decode(raws[0])
+        courses: List[Dict[str, Any]] = []
+        size = len(raws[0])
+        for raw in raws[1:]:
+            if raw:
+                size += len(raw)
+                courses.extend(self.cache.decode(raw).data)
+        return CacheEntry(courses, meta.stored_at, size, False)
+
+    async def read_summary(self, client, user_id: str) -> Optional[CacheEntry]:
+        raw = await client.hget(self.data_key(user_id), self.SUMMARY_FIELD)
+        return self.cache.decode(raw) if raw else None
+
+    async def write_summary(
+        self, client, user_id: str, summary: Any, stored_at: Optional[float]
+    ) -> bool:
+        # The summary is always written together with the course fields, and
+        # a lone HSET would create a hash without expiration
+        return False
+
+
+class SharedLayout(BlobLayout):
+    """
+    Course content shared between students, plus a small overlay per student.
+
+    Students in the same section receive the same titles, due dates and
+    instructions; only the submission state differs. Each course's content
+    is stored once under a key derived from its canvas_course_id and a digest
+    of the content, so every student with the same content points at the
+    same record. The overlay keeps the student's courses in order with their
+    current week and submission state, and reads join both back into the
+    course list APIService returns.
+    """
+
+    name = "shared"
+    partial_reads = True
+
+    # Per-student assignment fields; everything else is shared content
+    STATE_FIELDS = ("status", "grade")
+    DEFAULT_STATUS = "Pending"
+
+    def data_key(self, user_id: str) -> str:
+        return self.cache._build_key(user_id, "overlay")
+
+    def content_key(self, canvas_course_id: Any, digest: str) -> str:
+        """Key holding a shared course content record"""
+        return f"{self.cache.key_prefix}:course:{canvas_course_id}:{digest}"
+
+    @classmethod
+    def split_course(cls, course: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """
+        Split a course into shared content and per-student state.
+
+        Args:
+            course: A course dictionary as returned by APIService.
+        Returns:
+            (content, state): content holds every course and assignment field
+            except current_week and the submission fields; state holds
+            canvas_course_id, course_code, current_week and the submission
+            fields of assignments that are not pending, by assignment ID.
+        """
+        content: Dict[str, Any] = {}
+        submissions: Dict[str, Dict[str, Any]] = {}
+        for field, value in course.items():
+            if field == "week_assignments":
+                content[field] = {
+                    week: [cls._split_assignment(a, submissions) for a in assignments]
+                    for week, assignments in value.items()
+                }
+            elif field not in ("current_week", "canvas_course_id"):
+                content[field] = value
+        state = {
+            "canvas_course_id": course.get("canvas_course_id"),
+            "course_code": course["course_code"],
+            "current_week": course.get("current_week"),
+            "submissions": submissions,
+        }
+        return content, state
+
+    @classmethod
+    def _split_assignment(
+        cls, assignment: Dict[str, Any], submissions: Dict[str, Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        shared = {k: v for k, v in assignment.items() if k not in cls.STATE_FIELDS}
+        state = {k: assignment[k] for k in cls.STATE_FIELDS if k in assignment}
+        if state and state != {"status": cls.DEFAULT_STATUS}:
+            submissions[str(assignment.get("assignment_id"))] = state
+        return shared
+
+    @classmethod
+    def join_course(cls, state: Dict[str, Any], content: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Rebuild a course from its shared content and a student's state.
+
+        Args:
+            state: Overlay entry of the course (see split_course).
+            content: The shared content record.
+        Returns:
+            The course dictionary, with the same fields and field order as
+            APIService.transform_api_payload produces.
+        """
+        submissions = state["submissions"]
+        course: Dict[str, Any] = {}
+        for field in ("course_name", "course_code", "term_code", "start_date"):
+            if field in content:
+                course[field] = content[field]
+        course["current_week"] = state["current_week"]
+        week_assignments: Dict[str, List[Dict[str, Any]]] = {}
+        for week, assignments in content.get("week_assignments", {}).items():
+            joined = []
+            for shared in assignments:
+                assignment = dict(shared)
+                assignment.update(
+                    submissions.get(str(shared.get("assignment_id")))
+                    or {"status": cls.DEFAULT_STATUS}
+                )
+                joined.append(assignment)
+            week_assignments[week] = joined
+        course["week_assignments"] = week_assignments
+        course["canvas_course_id"] = state["canvas_course_id"]
+        return course
+
+    def queue_write(
+        self,
+        pipe,
+        user_id: str,
+        data: Any,
+        summary: Any,
+        stored_at: float,
+        queued: Optional[Set[str]] = None,
+    ) -> int:
+        queued = queued if queued is not None else set()
+        expiration = self.cache.expiration_time
+        overlay, contents = self._build_overlay(data)
+        size = 0
+        for key, content in contents.items():
+            if key in queued:
+                continue
+            # Rewriting an identical record only refreshes its TTL, so shared
+            # content lives as long as the newest overlay pointing at it
+            payload = self.cache.encode(content, stored_at)
+            pipe.set(key, payload, ex=expiration)
+            queued.add(key)
+            size += len(payload)
+
+        payload = self.cache.encode(overlay, stored_at)
+        pipe.set(self.data_key(user_id), payload, ex=expiration)
+        if summary is not None:
+            pipe.set(
+                self.summary_key(user_id),
+                self.cache.encode(summary, stored_at),
+                ex=expiration,
+            )
+        return size + len(payload)
+
+    async def touch(self, client, user_id: str) -> bool:
+        # The overlay and summary plus every content record the overlay uses
+        raw = await client.get(self.data_key(user_id))
+        overlay = self.cache.decode(raw) if raw else None
+        if overlay is None:
+            return False
+        keys = self.entry_keys(user_id) + list(
+            dict.fromkeys(state["content"] for state in overlay.data)
+        )
+        async with client.pipeline(transaction=False) as pipe:
+            for key in keys:
+                pipe.expire(key, self.cache.expiration_time)
+            results = await pipe.execute()
+        # The summary (second key) may be missing; the rest must all exist
+        return bool(results[0]) and all(results[2:])
+
+    def queue_patch(self, pipe, user_id: str, entry: CacheEntry, summary: Any) -> None:
+        # Submission state only lives in the overlay; shared content is untouched
+        overlay, _ = self._build_overlay(entry.data)
+        super().queue_patch(pipe, user_id, entry._replace(data=overlay), summary)
+
+    def _build_overlay(
+        self, courses: List[Dict[str, Any]]
+    ) -> Tuple[List[Dict[str, Any]], Dict[str, Dict[str, Any]]]:
+        # Returns the overlay and the content records it points at, by key
+        overlay = []
+        contents: Dict[str, Dict[str, Any]] = {}
+        for course in courses:
+            content, state = self.split_course(course)
+            digest = hashlib.blake2b(
+                serialization.dumps_bytes(content), digest_size=8
+            ).hexdigest()
+            state["content"] = key = self.content_key(state["canvas_course_id"], digest)
+            overlay.append(state)
+            contents[key] = content
+        return overlay, contents
+
+    async def read(self, client, user_id: str) -> Optional[CacheEntry]:
+        return (await self._read_overlays(client, [user_id]))[user_id]
+
+    async def read_courses(
+        self, client, user_id: str, course_codes: List[str]
+    ) -> Optional[CacheEntry]:
+        return (await self._read_overlays(client, [user_id], course_codes))[user_id]
+
+    async def read_many(
+        self, client, user_ids: List[str], course_codes: Optional[List[str]] = None
+    ) -> Dict[str, Optional[CacheEntry]]:
+        return await self._read_overlays(client, user_ids, course_codes)
+
+    async def _read_overlays(
+        self, client, user_ids: List[str], course_codes: Optional[List[str]] = None
+    ) -> Dict[str, Optional[CacheEntry]]:
+        # Two round trips whatever the number of users: the overlays, then
+        # every distinct content record they point at
+        raws = await client.mget([self.data_key(user_id) for user_id in user_ids])
+        overlays: Dict[str, Tuple[CacheEntry, List[Dict[str, Any]]]] = {}
+        content_keys: Dict[str, None] = {}
+        for user_id, raw in zip(user_ids, raws):
+            if not raw:
+                continue
+            overlay = self.cache.decode(raw)
+            if overlay is None:
+                continue
+            states = [
+                state for state in overlay.data
+                if not course_codes or state["course_code"] in course_codes
+            ]
+            overlays[user_id] = (overlay, states)
+            for state in states:
+                content_keys.setdefault(state["content"], None)
+
+        contents: Dict[str, Tuple[Any, int]] = {}
+        if content_keys:
+            for key, raw in zip(content_keys, await client.mget(list(content_keys))):
+                content = self.cache.decode(raw) if raw else None
+                if content is not None:
+                    contents[key] = (content.data, len(raw))
+
+        entries: Dict[str, Optional[CacheEntry]] = {user_id: None for user_id in user_ids}
+        for user_id, (overlay, states) in overlays.items():
+            if any(state["content"] not in contents for state in states):
+                # A content record expired or was evicted: treat as a miss
+                continue
+            courses = [self.join_course(state, contents[state["content"]][0]) for state in states]
+            size = overlay.size + sum(contents[state["content"]][1] for state in states)
+            entries[user_id] = CacheEntry(courses, overlay.stored_at, size, False)
+        return entries
+
+
+LAYOUTS = {"blob": BlobLayout, "sharded": ShardedLayout, "shared": SharedLayout}
+
+
+def make_layout(name: str, cache: "StudentCache") -> BlobLayout:
+    """
+    Create a cache layout by name.
+
+    Args:
+        name: "blob", "sharded" or "shared".
+        cache: The StudentCache the layout stores data for.
+    Returns:
+        The layout instance.
+    Raises:
+        ValueError: If the layout name is unknown.
+    """
+    if name not in LAYOUTS:
+        raise ValueError(f"Unknown cache layout: {name}")
+    return LAYOUTS[name](cache)
@@ -1,9 +1,68 @@
 """Service for calendar and ICS file generation"""
-from typing import List, Dict, Tuple
+from typing import Iterable, Iterator, List, Dict, Optional, Tuple, Union
 from datetime import datetime, timedelta
 from icalendar import Calendar, Event
+import hashlib
+import time
 import pytz
-import uuid
+from src.services.course_index import CourseIndex
+from src.utils.metrics import STAGE_LATENCY
+
+
+# Bump when the rendered event layout changes, so calendar ETags change too
+ICS_FORMAT_VERSION = "2"
+UID_DOMAIN = "course-assistant"
+ICS_PRODID = "-//course-assistant//MCP Student Server//EN"
+
+# RFC 5545 content lines should not exceed 75 octets, excluding the line break
+ICS_LINE_LIMIT = 75
+NO_ASSIGNMENTS_MESSAGE = "No assignments found for the specified filters."
+
+
+def escape_ics_text(text: str) -> str:
+    """
+    Escape a value according to the iCalendar TEXT rules.
+
+    Args:
+        text: Raw text value
+
+    Returns:
+        Escaped text
+    """
+    return (
+        text.replace("\\", "\\\\")
+        .replace(";", "\\;")
+        .replace(",", "\\,")
+        .replace("\r\n", "\\n")
+        .replace("\n", "\\n")
+    )
+
+
+def fold_ics_line(line: str) -> str:
+    """
+    Fold a content line to at most 75 octets per physical line.
+
+    Args:
+        line: Unfolded content line without line break
+
+    Returns:
+        Folded line, continuation lines prefixed by a single space
+    """
+    if line.isascii():
+        step = ICS_LINE_LIMIT - 1
+        return "\r\n ".join(line[i:i + step] for i in range(0, len(line), step))
+
+    # Never split a multi-byte UTF-8 character
+    chars = []
+    byte_count = 0
+    for char in line:
+        char_len = len(char.encode("utf-8"))
+        byte_count += char_len
+        if byte_count >= ICS_LINE_LIMIT:
+            chars.append("\r\n ")
+            byte_count = char_len
+        chars.append(char)
+    return "".join(chars)
 
 
 class CalendarService:
@@ -24,30 +83,164 @@ class CalendarService:
         Returns:
             List of tuples (assignment, course_code)
         """
-        all_assignments = []
-        
+        return list(CalendarService.iter_assignments(courses_data, week))
+
+    @staticmethod
+    def select_assignments(
+        courses_data: Union[List[Dict], CourseIndex],
+        course_code: str = None,
+        week: str = None,
+    ) -> Iterable[Tuple[Dict, str]]:
+        """
+        Assignments matching the course code and week filters
+
+        A CourseIndex answers from its precomputed slices; a plain course
+        list is scanned.
+
+        Args:
+            courses_data: List of course dictionaries, or a CourseIndex
+            course_code: Optional course code filter
+            week: Optional week filter
+
+        Returns:
+            Iterable of tuples (assignment, course_code)
+        """
+        if isinstance(courses_data, CourseIndex):
+            return courses_data.assignments(course_code, week)
+        if course_code:
+            courses_data = [
+                course
+                for course in courses_data
+                if course["course_code"] == course_code
+            ]
+        return CalendarService.iter_assignments(courses_data, week)
+
+    @staticmethod
+    def iter_assignments(
+        courses_data: List[Dict],
+        week: str = None
+    ) -> Iterator[Tuple[Dict, str]]:
+        """
+        Lazily yield assignments from courses, in the same order as collect_assignments
+
+        Args:
+            courses_data: List of course dictionaries
+            week: Optional week filter
+
+        Yields:
+            Tuples (assignment, course_code)
+        """
         for course in courses_data:
             if week:
-                week_assignments = course.get("week_assignments", {}).get(week, [])
-                all_assignments.extend(
-                    [(assignment, course["course_code"]) for assignment in week_assignments]
-                )
+                for assignment in course.get("week_assignments", {}).get(week, []):
+                    yield assignment, course["course_code"]
             else:
                 for week_assignments in course.get("week_assignments", {}).values():
-                    all_assignments.extend(
-                        [(assignment, course["course_code"]) for assignment in week_assignments]
-                    )
-        
-        return all_assignments
+                    for assignment in week_assignments:
+                        yield assignment, course["course_code"]
+
+    @staticmethod
+    def assignment_uid(student_id: str, course_code: str, assignment: Dict) -> str:
+        """
+        Build a stable event UID from student, course and assignment identity
+
+        Args:
+            student_id: Student identifier
+            course_code: Course code string
+            assignment: Assignment dictionary
+
+        Returns:
+            UID that stays the same across calendar regenerations
+        """
+        # Entries cached before assignment_id existed fall back to title + due date
+        identity = assignment.get("assignment_id")
+        if identity is None:
+            identity = f"{assignment['title']}|{assignment['due_on']}"
+        digest = hashlib.sha1(
+            f"{student_id}:{course_code}:{identity}".encode("utf-8")
+        ).hexdigest()
+        return f"{digest}@{UID_DOMAIN}"
+
+    @staticmethod
+    def calendar_stamp(courses_data: Union[List[Dict], CourseIndex]) -> datetime:
+        """
+        DTSTAMP for the events of a calendar: when the course content was
+        first seen, so it only changes when the content does
+
+        Args:
+            courses_data: List of course dictionaries, or a CourseIndex
+
+        Returns:
+            UTC datetime (whole seconds) of CourseIndex.content_since (or of
+            stored_at if that is unknown), or the current time for a plain list
+        """
+        since = getattr(courses_data, "content_since", 0.0) or getattr(
+            courses_data, "stored_at", 0.0
+        )
+        if since:
+            stamp = datetime.fromtimestamp(since, pytz.utc)
+        else:
+            stamp = datetime.now(pytz.utc)
+        return stamp.replace(microsecond=0)
 
     @staticmethod
-    def create_assignment_event(assignment: Dict, course_code: str) -> Event:
+    def calendar_etag(
+        courses_data: Union[List[Dict], CourseIndex],
+        course_code: str = None,
+        week: str = None,
+        student_id: str = "",
+        dtstamp: Optional[datetime] = None,
+    ) -> str:
+        """
+        Compute a content hash of the calendar without rendering it
+
+        Hashes exactly the inputs that end up in the ICS document, so the
+        value changes if and only if the generated calendar would change.
+
+        Args:
+            courses_data: List of course dictionaries, or a CourseIndex
+            course_code: Optional course code filter
+            week: Optional week filter
+            student_id: Student identifier
+            dtstamp: Event DTSTAMP (default: calendar_stamp(courses_data))
+
+        Returns:
+            Quoted strong ETag value
+        """
+        dtstamp = dtstamp or CalendarService.calendar_stamp(courses_data)
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(
+            f"{ICS_FORMAT_VERSION}|{student_id}|{dtstamp:%Y%m%dT%H%M%SZ}".encode("utf-8")
+        )
+        for assignment, code in CalendarService.select_assignments(
+            courses_data, course_code, week
+        ):
+            fields = (
+                code,
+                str(assignment.get("assignment_id")),
+                assignment["title"],
+                assignment["due_on"],
+                assignment.get("instructions", "No description provided."),
+            )
+            digest.update("\x1f".join(fields).encode("utf-8"))
+            digest.update(b"\x1e")
+        return f'"{digest.hexdigest()}"'
+
+    @staticmethod
+    def create_assignment_event(
+        assignment: Dict,
+        course_code: str,
+        student_id: str = "",
+        dtstamp: Optional[datetime] = None,
+    ) -> Event:
         """
         Create a calendar event for an assignment
         
         Args:
             assignment: Assignment dictionary
             course_code: Course code string
+            student_id: Student identifier, part of the stable event UID
+            dtstamp: When the course data was stored (default: now)
             
         Returns:
             icalendar Event object
@@ -69,8 +262,9 @@ class CalendarService:
         # Format for an all-day event
         all_day_date = due_datetime_utc.date()
 
-        event.add("uid", str(uuid.uuid4()))
-        event.add("dtstamp", datetime.now(pytz.utc))
+        # UID and DTSTAMP only change with the data, so regenerated calendars are identical
+        event.add("uid", CalendarService.assignment_uid(student_id, course_code, assignment))
+        event.add("dtstamp", dtstamp or datetime.now(pytz.utc).replace(microsecond=0))
         event.add("dtstart", all_day_date)
         event.add("dtend", all_day_date + timedelta(days=1))
         event.add("status", "CONFIRMED")
@@ -85,23 +279,155 @@ class CalendarService:
 
         return event
 
+    @staticmethod
+    def format_assignment_event(
+        assignment: Dict,
+        course_code: str,
+        student_id: str = "",
+        dtstamp: Optional[datetime] = None,
+    ) -> str:
+        """
+        Render a VEVENT block for an assignment without building an Event tree
+
+        Produces the same content lines, in the same order, as
+        create_assignment_event(...).to_ical().
+
+        Args:
+            assignment: Assignment dictionary
+            course_code: Course code string
+            student_id: Student identifier, part of the stable event UID
+            dtstamp: When the course data was stored (default: now)
+
+        Returns:
+            VEVENT block with CRLF line endings
+        """
+        summary = f"{course_code}: {assignment['title']}"
+        description = assignment.get("instructions", "No description provided.")
+
+        due_datetime_utc = datetime.strptime(
+            assignment["due_on"], "%Y-%m-%dT%H:%M:%SZ"
+        ).replace(tzinfo=pytz.utc)
+        all_day_date = due_datetime_utc.date()
+        uid = CalendarService.assignment_uid(student_id, course_code, assignment)
+        dtstamp = dtstamp or datetime.now(pytz.utc).replace(microsecond=0)
+
+        lines = [
+            "BEGIN:VEVENT",
+            f"SUMMARY:{escape_ics_text(summary)}",
+            f"DTSTART;VALUE=DATE:{all_day_date:%Y%m%d}",
+            f"DTEND;VALUE=DATE:{all_day_date + timedelta(days=1):%Y%m%d}",
+            f"DTSTAMP:{dtstamp:%Y%m%dT%H%M%SZ}",
+            f"UID:{escape_ics_text(uid)}",
+            f"CATEGORIES:{escape_ics_text(course_code)},Assignment",
+            f"DESCRIPTION:{escape_ics_text(description)}",
+            "PRIORITY:5",
+            "STATUS:CONFIRMED",
+            "TRANSP:TRANSPARENT",
+            "X-APPLE-TRAVEL-ADVISORY-BEHAVIOR:AUTOMATIC",
+            "X-MICROSOFT-CDO-ALLDAYEVENT:TRUE",
+            "END:VEVENT",
+        ]
+        return "".join(f"{fold_ics_line(line)}\r\n" for line in lines)
+
+    @staticmethod
+    def stream_ics_calendar(
+        courses_data: Union[List[Dict], CourseIndex],
+        course_code: str = None,
+        week: str = None,
+        student_id: str = "",
+        dtstamp: Optional[datetime] = None,
+    ) -> Iterator[str]:
+        """
+        Stream an ICS calendar one VEVENT block at a time
+
+        Only one event is rendered at a time, so memory use does not grow
+        with the number of assignments. An empty (but valid) calendar is
+        produced when nothing matches the filters.
+
+        Args:
+            courses_data: List of course dictionaries, or a CourseIndex
+            course_code: Optional course code filter
+            week: Optional week filter
+            student_id: Student identifier, part of the stable event UIDs
+            dtstamp: Event DTSTAMP (default: calendar_stamp(courses_data))
+
+        Yields:
+            Chunks of the ICS document
+        """
+        assignments = CalendarService.select_assignments(courses_data, course_code, week)
+        dtstamp = dtstamp or CalendarService.calendar_stamp(courses_data)
+
+        # Only rendering time is recorded, not the time the consumer holds a chunk
+        build_time = 0.0
+        yield f"BEGIN:VCALENDAR\r\nVERSION:2.0\r\nPRODID:{ICS_PRODID}\r\n"
+        for assignment, course_code_item in assignments:
+            start = time.perf_counter()
+            chunk = CalendarService.format_assignment_event(
+                assignment, course_code_item, student_id, dtstamp
+            )
+            build_time += time.perf_counter() - start
+            yield chunk
+        yield "END:VCALENDAR\r\n"
+        STAGE_LATENCY.observe(build_time, "ics_build")
+
+    @staticmethod
+    def render_ics_calendar(
+        courses_data: Union[List[Dict], CourseIndex],
+        course_code: str = None,
+        week: str = None,
+        student_id: str = "",
+        dtstamp: Optional[datetime] = None,
+    ) -> str:
+        """
+        Build the ICS file content with the streaming writer
+
+        Same contract as build_ics_calendar, without the icalendar object tree.
+
+        Args:
+            courses_data: List of course dictionaries, or a CourseIndex
+            course_code: Optional course code filter
+            week: Optional week filter
+            student_id: Student identifier, part of the stable event UIDs
+            dtstamp: Event DTSTAMP (default: calendar_stamp(courses_data))
+
+        Returns:
+            ICS file content as string
+        """
+        chunks = list(
+            CalendarService.stream_ics_calendar(
+                courses_data, course_code, week, student_id, dtstamp
+            )
+        )
+        if len(chunks) == 2:  # only the VCALENDAR header and END:VCALENDAR
+            return NO_ASSIGNMENTS_MESSAGE
+        return "".join(chunks)
+
     @staticmethod
     def build_ics_calendar(
         courses_data: List[Dict],
         course_code: str = None,
-        week: str = None
+        week: str = None,
+        student_id: str = "",
+        dtstamp: Optional[datetime] = None,
     ) -> str:
         """
         Build an ICS calendar file from courses and assignments
+
+        Reference implementation based on icalendar; the tools use the
+        streaming writer (render_ics_calendar / stream_ics_calendar).
         
         Args:
             courses_data: List of course dictionaries
             course_code: Optional course code filter
             week: Optional week filter
+            student_id: Student identifier, part of the stable event UIDs
+            dtstamp: Event DTSTAMP (default: calendar_stamp(courses_data))
             
         Returns:
             ICS file content as string
         """
+        dtstamp = dtstamp or CalendarService.calendar_stamp(courses_data)
+
         # Filter courses by course_code if provided
         if course_code:
             courses_data = [
@@ -114,12 +440,16 @@ class CalendarService:
         all_assignments = CalendarService.collect_assignments(courses_data, week)
 
         if not all_assignments:
-            return "No assignments found for the specified filters."
+            return NO_ASSIGNMENTS_MESSAGE
 
         cal = Calendar()
+        cal.add("version", "2.0")
+        cal.add("prodid", ICS_PRODID)
 
         for assignment, course_code_item in all_assignments:
-            event = CalendarService.create_assignment_event(assignment, course_code_item)
+            event = CalendarService.create_assignment_event(
+                assignment, course_code_item, student_id, dtstamp
+            )
             cal.add_component(event)
 
         # Generate ICS file content
@@ -0,0 +1,234 @@
+"""Precomputed lookups over a student's decoded course list"""
+from bisect import bisect_left, bisect_right
+from typing import Any, Dict, List, Optional, Tuple
+from src.utils import serialization
+
+# (assignment, course_code), the shape yielded by CalendarService.iter_assignments
+AssignmentRef = Tuple[Dict[str, Any], str]
+
+
+class CourseIndex:
+    """
+    Read-only index over a student's course list, built once per fetch.
+
+    Lookups by course code, by week and by due-date range return slices that
+    were precomputed at build time, in the same order as a full scan of the
+    course list (course order, then week order). The underlying dictionaries
+    are shared with the course list, so callers must not mutate them.
+    """
+
+    def __init__(self, courses: List[Dict[str, Any]], stored_at: float = 0.0, size: int = 0):
+        """
+        Build the index.
+
+        Args:
+            courses: Decoded course list, as returned by APIService.
+            stored_at: Epoch seconds when the course list was cached or last
+                confirmed current upstream (0.0 if unknown).
+            size: Encoded size of the cached payload in bytes.
+        """
+        self.courses = courses
+        self.stored_at = stored_at
+        self.size = size
+        # Epoch seconds when this course content was first seen upstream
+        # (0.0 if unknown); unlike stored_at it does not move when unchanged
+        # content is re-stored or confirmed
+        self.content_since = 0.0
+
+        self._by_code: Dict[str, List[Dict[str, Any]]] = {}
+        self._all: List[AssignmentRef] = []
+        self._by_course: Dict[str, List[AssignmentRef]] = {}
+        self._by_week: Dict[str, List[AssignmentRef]] = {}
+        self._by_course_week: Dict[Tuple[str, str], List[AssignmentRef]] = {}
+        # id(assignment) -> week key it was listed under
+        self._week_of: Dict[int, str] = {}
+        self._status_counts: Dict[str, int] = {}
+        self._course_summaries: Dict[str, Dict[str, Any]] = {}
+
+        for course in courses:
+            code = course["course_code"]
+            self._by_code.setdefault(code, []).append(course)
+            course_refs = self._by_course.setdefault(code, [])
+            summary = self._course_summaries.setdefault(
+                code, {"total": 0, "status_counts": {}, "week_counts": {}}
+            )
+
+            for week, assignments in course.get("week_assignments", {}).items():
+                refs = [(assignment, code) for assignment in assignments]
+                self._all.extend(refs)
+                course_refs.extend(refs)
+                self._by_week.setdefault(week, []).extend(refs)
+                self._by_course_week.setdefault((code, week), []).extend(refs)
+
+                summary["total"] += len(assignments)
+                summary["week_counts"][week] = summary["week_counts"].get(week, 0) + len(assignments)
+                for assignment in assignments:
+                    self._week_of[id(assignment)] = week
+                    status = assignment.get("status", "Pending")
+                    summary["status_counts"][status] = summary["status_counts"].get(status, 0) + 1
+                    self._status_counts[status] = self._status_counts.get(status, 0) + 1
+
+        # Due-date index: ISO 8601 timestamps in one format sort chronologically
+        dated = sorted(
+            (ref for ref in self._all if _is_timestamp(ref[0].get("due_on"))),
+            key=lambda ref: ref[0]["due_on"],
+        )
+        self._due_keys = [assignment["due_on"] for assignment, _ in dated]
+        self._due_refs = dated
+        self._summary_record: Optional[Dict[str, Any]] = None
+        self._memory_size: Optional[int] = None
+
+    def __len__(self) -> int:
+        return len(self.courses)
+
+    @property
+    def current_week(self) -> Any:
+        """Current week of the first course ("1" when there are no courses)"""
+        return self.courses[0]["current_week"] if self.courses else "1"
+
+    @property
+    def memory_size(self) -> int:
+        """
+        Estimated in-memory size in bytes: the length of the courses as
+        compact JSON, computed once. Unlike size it does not depend on the
+        cache codec or on the Redis write succeeding.
+        """
+        if self._memory_size is None:
+            self._memory_size = len(serialization.dumps_bytes(self.courses))
+        return self._memory_size
+
+    @property
+    def course_codes(self) -> List[str]:
+        """Distinct course codes, in course order"""
+        return list(self._by_code)
+
+    def by_course_code(self, course_code: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Get the courses matching a course code.
+
+        Args:
+            course_code: Course code to match (all courses if empty).
+
+        Returns:
+            Matching course dictionaries, in course order.
+        """
+        if not course_code:
+            return self.courses
+        return self._by_code.get(course_code, [])
+
+    def assignments(
+        self, course_code: Optional[str] = None, week: Optional[str] = None
+    ) -> List[AssignmentRef]:
+        """
+        Get assignments filtered by course code and/or week.
+
+        Args:
+            course_code: Optional course code filter.
+            week: Optional week filter.
+
+        Returns:
+            (assignment, course_code) tuples, in course then week order.
+        """
+        if course_code and week:
+            return self._by_course_week.get((course_code, str(week)), [])
+        if course_code:
+            return self._by_course.get(course_code, [])
+        if week:
+            return self._by_week.get(str(week), [])
+        return self._all
+
+    def due_between(
+        self, due_after: Optional[str] = None, due_before: Optional[str] = None
+    ) -> List[AssignmentRef]:
+        """
+        Get assignments whose due date falls in a range, in due-date order.
+
+        Bounds are compared as ISO 8601 strings and are inclusive. A date
+        prefix such as "2026-01-05" matches from the start of that day as a
+        lower bound and up to the end of that day as an upper bound.
+        Assignments without a due date are never returned.
+
+        Args:
+            due_after: Lower bound (inclusive), or None for no lower bound.
+            due_before: Upper bound (inclusive), or None for no upper bound.
+
+        Returns:
+            (assignment, course_code) tuples sorted by due date.
+        """
+        start = bisect_left(self._due_keys, due_after) if due_after else 0
+        # Any timestamp starting with the upper bound sorts before bound + U+FFFF
+        end = (
+            bisect_right(self._due_keys, due_before + "\uffff")
+            if due_before
+            else len(self._due_keys)
+        )
+        return self._due_refs[start:end]
+
+    def week_of(self, assignment: Dict[str, Any]) -> str:
+        """
+        Get the week key an assignment is listed under.
+
+        Args:
+            assignment: An assignment dictionary from this index.
+
+        Returns:
+            The week key (e.g. "3").
+        """
+        return self._week_of[id(assignment)]
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Get assignment counts overall and per course.
+
+        Returns:
+            Dictionary with total_assignments, status_counts and, per course
+            code, total, status_counts and week_counts.
+        """
+        return {
+            "total_assignments": len(self._all),
+            "status_counts": dict(self._status_counts),
+            "courses": {
+                code: {
+                    "total": summary["total"],
+                    "status_counts": dict(summary["status_counts"]),
+                    "week_counts": dict(summary["week_counts"]),
+                }
+                for code, summary in self._course_summaries.items()
+            },
+        }
+
+    def summary_record(self) -> Dict[str, Any]:
+        """
+        Get the small per-student record cached next to the course data.
+
+        Holds what listing a student's courses needs (names, codes, current
+        week and assignment counts) without any assignment bodies. Built once
+        per index.
+
+        Returns:
+            Dictionary with current_week, total_assignments, status_counts
+            and a courses list.
+        """
+        if self._summary_record is None:
+            summary = self.summary()
+            self._summary_record = {
+                "current_week": self.current_week,
+                "total_assignments": summary["total_assignments"],
+                "status_counts": summary["status_counts"],
+                "courses": [
+                    {
+                        "course_name": course.get("course_name", "Unknown Course"),
+                        "course_code": course["course_code"],
+                        "term_code": course.get("term_code", "Unknown Term"),
+                        "current_week": course.get("current_week", "1"),
+                        "total_assignments": summary["courses"][course["course_code"]]["total"],
+                        "status_counts": summary["courses"][course["course_code"]]["status_counts"],
+                    }
+                    for course in self.courses
+                ],
+            }
+        return self._summary_record
+
+
+def _is_timestamp(value: Any) -> bool:
+    return isinstance(value, str) and value[:4].isdigit()
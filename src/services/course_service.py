@@ -1,16 +1,79 @@
 """Service for course-related business logic"""
 
-import json
+import asyncio
 import logging
-from typing import List, Dict, Optional, Any
+import time
+from typing import List, Dict, Optional, Any, Tuple
 from datetime import datetime
+from src.config import (
+    BATCH_FETCH_CONCURRENCY,
+    BATCH_MAX_STUDENTS,
+    CACHE_SOFT_TTL,
+    FETCH_LOCK_TIMEOUT,
+    FETCH_LOCK_POLL_INTERVAL,
+    LOCAL_CACHE_MAX_ENTRIES,
+    LOCAL_CACHE_MAX_BYTES,
+    LOCAL_CACHE_TTL,
+    REFRESH_MAX_WORKERS,
+    STALE_CACHE_MAX_ENTRIES,
+    STALE_CACHE_TTL,
+    STALE_CACHE_MAX_BYTES,
+)
 from src.services.api_service import APIService
+from src.services.course_index import AssignmentRef, CourseIndex
+from src.services.local_cache_service import LocalCache
 from src.services.redis_cache_service import StudentCache
+from src.utils.metrics import record_cache, record_size, timed
+from src.utils.pagination import decode_cursor, encode_cursor
+
+# Assignments per page when paginating filtered responses
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+# Filters that switch a response to the selected/projected assignment format
+SELECT_ARGUMENTS = (
+    "fields", "exclude_fields", "due_after", "due_before", "status", "limit", "cursor",
+)
+# Only these paginate it; without them every selected assignment is returned
+PAGE_ARGUMENTS = ("limit", "cursor")
+
+
+class CoursesUnavailableError(Exception):
+    """Courses could not be retrieved and there is no last known copy"""
+
+    def __init__(self, retry_after: Optional[float] = None):
+        super().__init__(
+            "No se pudieron obtener los cursos en este momento. Intenta de nuevo más tarde."
+        )
+        # Seconds until the failing dependency is tried again, if known
+        self.retry_after = retry_after
 
 
 class CourseService:
     """Handles course data retrieval and filtering"""
 
+    # Upstream fetches currently in flight in this worker, keyed by student ID
+    _inflight: Dict[str, "asyncio.Future[CourseIndex]"] = {}
+
+    # Background refresh-ahead tasks in this worker, keyed by student ID
+    _refreshing: Dict[str, "asyncio.Task[None]"] = {}
+
+    # L1 tier: indexed course data per student, shared by all instances in
+    # this worker and consulted before the Redis StudentCache
+    _local_cache = LocalCache(
+        max_entries=LOCAL_CACHE_MAX_ENTRIES,
+        ttl=LOCAL_CACHE_TTL,
+        max_bytes=LOCAL_CACHE_MAX_BYTES,
+    )
+
+    # Last known courses per student, kept much longer than L1 and served
+    # only when the API fails and Redis has no copy
+    _stale_cache = LocalCache(
+        max_entries=STALE_CACHE_MAX_ENTRIES,
+        ttl=STALE_CACHE_TTL,
+        max_bytes=STALE_CACHE_MAX_BYTES,
+    )
+
     def __init__(self, cache_expiration: int = 1800):
         """
         Initialize the CourseService with a Redis cache.
@@ -19,6 +82,10 @@ class CourseService:
             cache_expiration: Cache expiration time in seconds (default 30 minutes).
         """
         self.cache = StudentCache(expiration_time=cache_expiration)
+        # The in-process copy must never outlive the Redis entry
+        self.local_ttl = min(LOCAL_CACHE_TTL, cache_expiration)
+        # Past the soft TTL an entry is served as-is and refreshed in the background
+        self.soft_ttl = min(CACHE_SOFT_TTL, cache_expiration)
         logging.info(
             f"CourseService initialized with cache expiration: {cache_expiration}s"
         )
@@ -83,25 +150,243 @@ class CourseService:
 
         return result
 
-    def fetch_courses(self, student_id: str) -> List[Dict[str, Any]]:
+    @staticmethod
+    def select_assignments(
+        index: CourseIndex,
+        course_code: Optional[str] = None,
+        week: Optional[str] = None,
+        due_after: Optional[str] = None,
+        due_before: Optional[str] = None,
+        status: Optional[str] = None,
+    ) -> List[AssignmentRef]:
+        """
+        Select assignments from an index by course, week, due date and status
+
+        Without a date window the result is in course then week order; with
+        one it is in due-date order.
+
+        Args:
+            index: Indexed courses of a student
+            course_code: Optional course code filter
+            week: Optional week filter
+            due_after: Optional inclusive lower bound on due_on (ISO 8601)
+            due_before: Optional inclusive upper bound on due_on (ISO 8601)
+            status: Optional status filter (e.g. "Pending", "Submitted")
+
+        Returns:
+            List of tuples (assignment, course_code)
+        """
+        if due_after or due_before:
+            refs = index.due_between(due_after, due_before)
+            if course_code:
+                refs = [ref for ref in refs if ref[1] == course_code]
+            if week:
+                refs = [ref for ref in refs if index.week_of(ref[0]) == str(week)]
+        else:
+            refs = index.assignments(course_code, week)
+
+        if status:
+            refs = [ref for ref in refs if ref[0].get("status", "Pending") == status]
+        return refs
+
+    @staticmethod
+    def project_assignment(
+        assignment: Dict,
+        fields: Optional[List[str]] = None,
+        exclude_fields: Optional[List[str]] = None,
+    ) -> Dict:
+        """
+        Keep only the requested fields of an assignment
+
+        Args:
+            assignment: Assignment dictionary
+            fields: Fields to keep (all if not provided)
+            exclude_fields: Fields to drop
+
+        Returns:
+            Projected assignment dictionary (the original if nothing is dropped)
+        """
+        if fields:
+            assignment = {key: assignment[key] for key in fields if key in assignment}
+        if exclude_fields:
+            assignment = {
+                key: value for key, value in assignment.items() if key not in exclude_fields
+            }
+        return assignment
+
+    @staticmethod
+    def format_assignment_page(
+        index: CourseIndex,
+        refs: List[AssignmentRef],
+        course_code: Optional[str] = None,
+        week: Optional[str] = None,
+        fields: Optional[List[str]] = None,
+        exclude_fields: Optional[List[str]] = None,
+    ) -> Dict:
+        """
+        Format a selection of assignments like format_course_response
+
+        Only the given assignments are included, projected to the requested
+        fields and grouped back under their course and week.
+
+        Args:
+            index: Indexed courses of a student
+            refs: Selected (assignment, course_code) tuples, e.g. one page
+            course_code: Optional course code filter
+            week: Optional week filter
+            fields: Assignment fields to keep (all if not provided)
+            exclude_fields: Assignment fields to drop
+
+        Returns:
+            Formatted response dictionary
+        """
+        grouped: Dict[str, Dict[str, List[Dict]]] = {}
+        for assignment, code in refs:
+            grouped.setdefault(code, {}).setdefault(index.week_of(assignment), []).append(
+                CourseService.project_assignment(assignment, fields, exclude_fields)
+            )
+
+        courses_data = index.by_course_code(course_code)
+        result = {
+            "current_week": courses_data[0]["current_week"] if courses_data else "1",
+            "current_date": datetime.now().strftime("%d/%m/%Y"),
+            "courses": [],
+        }
+
+        for course in courses_data:
+            course_info = {
+                "course_name": course.get("course_name", "Unknown Course"),
+                "course_code": course.get("course_code", "Unknown Code"),
+                "term_code": course.get("term_code", "Unknown Term"),
+                "start_date": course.get("start_date", "Unknown Start Date"),
+                "current_week": course.get("current_week", "1"),
+            }
+
+            weeks = grouped.get(course["course_code"], {})
+            if week:
+                course_info["assignments"] = weeks.get(str(week), [])
+                course_info["filtered_week"] = week
+            else:
+                course_info["week_assignments"] = weeks
+
+            result["courses"].append(course_info)
+
+        return result
+
+    @staticmethod
+    def format_filtered_response(index: CourseIndex, filters: Dict[str, Any]) -> Dict:
+        """
+        Format indexed courses according to the get_filtered_courses arguments
+
+        Without projection, date, status or pagination filters the response is
+        the one of format_course_response; otherwise the selected assignments
+        are formatted, all of them unless limit or cursor asks for one page.
+
+        Args:
+            index: Indexed courses of a student
+            filters: course_code, week, fields, exclude_fields, due_after,
+                due_before, status, limit and cursor (all optional)
+
+        Returns:
+            Formatted response dictionary; a selection also has
+            total_assignments and next_cursor (None on the last page or when
+            not paginating)
+
+        Raises:
+            ValueError: If the cursor is invalid
+        """
+        course_code = filters.get("course_code")
+        week = filters.get("week")
+
+        if not any(filters.get(key) for key in SELECT_ARGUMENTS):
+            # Filter by course_code if provided (precomputed slice, no scan)
+            courses_data = index.by_course_code(course_code)
+            with timed("format_response"):
+                return CourseService.format_course_response(courses_data, week=week)
+
+        refs = CourseService.select_assignments(
+            index,
+            course_code,
+            week,
+            due_after=filters.get("due_after"),
+            due_before=filters.get("due_before"),
+            status=filters.get("status"),
+        )
+        if any(filters.get(key) for key in PAGE_ARGUMENTS):
+            offset = decode_cursor(filters.get("cursor"))
+            limit = filters.get("limit") or DEFAULT_PAGE_SIZE
+            limit = max(1, min(int(limit), MAX_PAGE_SIZE))
+            page = refs[offset:offset + limit]
+            end = offset + limit
+        else:
+            page = refs
+            end = len(refs)
+
+        with timed("format_response"):
+            result = CourseService.format_assignment_page(
+                index,
+                page,
+                course_code,
+                week,
+                fields=filters.get("fields"),
+                exclude_fields=filters.get("exclude_fields"),
+            )
+
+        result["total_assignments"] = len(refs)
+        result["next_cursor"] = encode_cursor(end) if end < len(refs) else None
+        return result
+
+    async def fetch_courses(self, student_id: str) -> List[Dict[str, Any]]:
         """
         Retrieve course data for a user, using cache when available.
 
+        Args:
+            user_id: The unique identifier of the user.
+
+        Returns:
+            A list of course dictionaries with detailed information
+
+        Raises:
+            ValueError: If user_id is empty or invalid.
+            CoursesUnavailableError: If the courses could not be retrieved.
+        """
+        index = await self.fetch_course_index(student_id)
+        return index.courses
+
+    async def fetch_course_index(
+        self, student_id: str, course_code: Optional[str] = None
+    ) -> CourseIndex:
+        """
+        Retrieve indexed course data for a user, using cache when available.
+
         This method implements the following flow:
-        1. Check if data exists in Redis cache
-        2. If cached data exists, deserialize and return it
-        3. If not cached, fetch from API
+        1. Read the in-process tier, then Redis, in a single GET
+        2. If cached data exists, return it (refreshing it in the background
+           once it is older than the soft TTL)
+        3. If not cached, fetch from API (one in-flight fetch per student)
         4. Store the API response in cache
 
+        The index is built once per fetch (or Redis read) and kept in the
+        in-process tier, so filtered lookups do not rescan the course list.
+
         Args:
             user_id: The unique identifier of the user.
+            course_code: Optional course code the caller filters on. With a
+                cache layout that supports partial reads, an in-process miss
+                reads only that course from Redis and the returned index may
+                hold only that course.
+
+        If retrieval fails (e.g. Redis is unreachable and the courses API is
+        down or its circuit is open), the last known courses of the student
+        are returned instead, however old.
 
         Returns:
-            A list of course dictionaries with detailed information
+            A CourseIndex over the course list
 
         Raises:
             ValueError: If user_id is empty or invalid.
-            Exception: If both Redis and API retrieval fail.
+            CoursesUnavailableError: If retrieval fails and there is no last
+                known copy.
         """
         if not student_id or not student_id.strip():
             raise ValueError("student_id cannot be empty")
@@ -110,30 +395,667 @@ class CourseService:
 
         # Try to get data from Redis cache
         try:
-            logging.info(f"Checking cache existence for user {student_id}")
-            if self.cache.exists(student_id):
-                courses = self.cache.get(student_id)
-                json_courses = (
-                    json.loads(courses) if isinstance(courses, str) else courses
-                )
-
+            logging.info(f"Checking cache for user {student_id}")
+            index = await self._read_cache(student_id, course_code)
+            if index is not None:
                 logging.info(f"Returning cached courses for user {student_id}")
-                return json_courses
+                return index
 
             logging.info(f"No cache found for user {student_id}, fetching from API")
-            courses = APIService.get_courses_from_api(student_id)
-            if courses:
-                self.cache.set(student_id, json.dumps(courses))
-                logging.info(f"Cached courses for user {student_id}")
+            index = await self._fetch_single_flight(student_id)
 
             logging.info(f"Returning courses from API for user {student_id}")
-            return courses
+            return index
+
+        except Exception as e:
+            logging.error(f"Error retrieving courses for user {student_id}: {e}")
+            return self._serve_stale(student_id, e)
+
+    async def fetch_calendar_index(
+        self, student_id: str, course_code: Optional[str] = None
+    ) -> CourseIndex:
+        """
+        Retrieve indexed course data for a calendar, with its content_since set.
+
+        Calendars take their DTSTAMP (and so their ETag) from when the course
+        content was first seen, which is kept with the upstream validator, so
+        unchanged content keeps the same calendar across refreshes and refetches.
+
+        Args:
+            student_id: The unique identifier of the user.
+            course_code: Optional course code the caller filters on (see
+                fetch_course_index).
+
+        Returns:
+            A CourseIndex over the course list (see fetch_course_index)
+
+        Raises:
+            ValueError: If student_id is empty or invalid.
+            CoursesUnavailableError: If retrieval fails and there is no last
+                known copy.
+        """
+        index = await self.fetch_course_index(student_id, course_code)
+        if not index.content_since:
+            validator = await self.cache.get_validator(student_id.strip())
+            since = validator.data.get("since") if validator is not None else None
+            # Without a validator the write time is the best known value
+            index.content_since = since or index.stored_at
+        return index
+
+    async def fetch_course_indexes(
+        self, student_ids: List[str], course_code: Optional[str] = None
+    ) -> Dict[str, Optional[CourseIndex]]:
+        """
+        Retrieve indexed course data for several users at once.
+
+        In-process hits are used first, the rest are read from Redis in one
+        round trip (MGET), and only the remaining misses are fetched from the
+        API, at most BATCH_FETCH_CONCURRENCY at a time.
+
+        Args:
+            student_ids: The unique identifiers of the users.
+            course_code: Optional course code the caller filters on (see
+                fetch_course_index).
+
+        Returns:
+            Mapping of each (stripped, non-empty) student ID to its CourseIndex
+            (the last known one if retrieval failed, or None if there is none)
+        """
+        ids = list(dict.fromkeys(sid.strip() for sid in student_ids if sid and sid.strip()))
+        indexes: Dict[str, Optional[CourseIndex]] = {}
+
+        pending = []
+        for student_id in ids:
+            index = CourseService._local_cache.get(student_id)
+            record_cache("local", index is not None)
+            if index is not None:
+                indexes[student_id] = index
+            else:
+                pending.append(student_id)
+
+        if pending:
+            partial = bool(course_code) and self.cache.layout.partial_reads
+            with timed("cache_lookup"):
+                entries = await self.cache.get_many(
+                    pending, [course_code] if partial else None
+                )
+            for student_id in pending:
+                entry = entries.get(student_id)
+                record_cache("redis", entry is not None)
+                if entry is None or entry.data is None:
+                    continue
+                record_size("cache_value", entry.size)
+                index = CourseIndex(entry.data, entry.stored_at, entry.size)
+                if not partial:
+                    self._store_local(student_id, index)
+                indexes[student_id] = index
+
+            async def check(student_id: str, index: CourseIndex) -> None:
+                index.stored_at = await self._check_freshness(student_id, index.stored_at)
+
+            await asyncio.gather(*(
+                check(student_id, indexes[student_id])
+                for student_id in pending if student_id in indexes
+            ))
+
+        misses = [student_id for student_id in ids if student_id not in indexes]
+        if misses:
+            logging.info(f"Fetching {len(misses)} uncached users from API")
+            semaphore = asyncio.Semaphore(max(1, BATCH_FETCH_CONCURRENCY))
+
+            async def fetch(student_id: str) -> None:
+                async with semaphore:
+                    try:
+                        indexes[student_id] = await self._fetch_single_flight(student_id)
+                    except Exception as e:
+                        logging.error(f"Error fetching courses for user {student_id}: {e}")
+                        try:
+                            indexes[student_id] = self._serve_stale(student_id, e)
+                        except CoursesUnavailableError:
+                            indexes[student_id] = None
+
+            await asyncio.gather(*(fetch(student_id) for student_id in misses))
+
+        return {student_id: indexes[student_id] for student_id in ids}
+
+    async def fetch_courses_batch(
+        self, student_ids: List[str], filters: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """
+        Retrieve and format courses for several students with shared filters.
+
+        Args:
+            student_ids: The unique identifiers of the users.
+            filters: get_filtered_courses arguments applied to every student
+                (a cursor is ignored; limit applies per student).
+
+        Returns:
+            Dictionary with count and one formatted response per student, in
+            request order, each with its student_id (or only student_id and
+            error if that student's courses could not be retrieved)
+
+        Raises:
+            ValueError: If no student ID or more than BATCH_MAX_STUDENTS are given.
+        """
+        if not student_ids:
+            raise ValueError("student_ids no puede estar vacío")
+        if len(student_ids) > BATCH_MAX_STUDENTS:
+            raise ValueError(
+                f"Se permiten como máximo {BATCH_MAX_STUDENTS} estudiantes por consulta"
+            )
+
+        filters = {key: value for key, value in filters.items() if key != "cursor"}
+        indexes = await self.fetch_course_indexes(student_ids, filters.get("course_code"))
+
+        students = []
+        for student_id, index in indexes.items():
+            if index is None:
+                students.append(
+                    {"student_id": student_id, "error": str(CoursesUnavailableError())}
+                )
+                continue
+            result = CourseService.format_filtered_response(index, filters)
+            result["student_id"] = student_id
+            students.append(result)
+
+        return {"count": len(students), "students": students}
+
+    async def fetch_course_summary(self, student_id: str) -> Dict[str, Any]:
+        """
+        Retrieve a student's summary record (course names, codes, current week
+        and assignment counts) without decoding the full course data.
+
+        Reads the in-process index if present, then the summary key in Redis.
+        Only if neither exists is the full course data fetched, and a summary
+        is written back for the next read.
 
+        Args:
+            student_id: The unique identifier of the user.
+
+        Returns:
+            The summary record (see CourseIndex.summary_record)
+
+        Raises:
+            ValueError: If student_id is empty or invalid.
+            CoursesUnavailableError: If the courses could not be retrieved and
+                there is no last known copy.
+        """
+        if not student_id or not student_id.strip():
+            raise ValueError("student_id cannot be empty")
+
+        student_id = student_id.strip()
+
+        try:
+            index = CourseService._local_cache.get(student_id)
+            record_cache("local", index is not None)
+            if index is not None:
+                return index.summary_record()
+
+            with timed("cache_lookup"):
+                entry = await self.cache.get_summary_entry(student_id)
+            record_cache("redis_summary", entry is not None)
+            if entry is not None:
+                await self._check_freshness(student_id, entry.stored_at)
+                return entry.data
+
+            index = await self.fetch_course_index(student_id)
+            if index.courses:
+                await self.cache.set_summary(
+                    student_id, index.summary_record(), index.stored_at or None
+                )
+            return index.summary_record()
+
+        except CoursesUnavailableError:
+            raise
+        except Exception as e:
+            logging.error(f"Error retrieving summary for user {student_id}: {e}")
+            return self._serve_stale(student_id, e).summary_record()
+
+    @staticmethod
+    def apply_submission_updates(
+        courses_data: List[Dict], updates: Dict[str, Dict[str, Any]]
+    ) -> List[str]:
+        """
+        Set the status and grade of assignments in a course list, in place.
+
+        A "Pending" status removes the grade; a "Submitted" status without a
+        grade keeps the current one.
+
+        Args:
+            courses_data: List of course dictionaries
+            updates: Assignment ID (as a string) to {"status", "grade"}
+
+        Returns:
+            IDs of the assignments found and updated
+        """
+        updated = []
+        for course in courses_data:
+            for assignments in course.get("week_assignments", {}).values():
+                for assignment in assignments:
+                    assignment_id = str(assignment.get("assignment_id"))
+                    update = updates.get(assignment_id)
+                    if update is None:
+                        continue
+                    assignment["status"] = update["status"]
+                    if update["status"] == "Pending":
+                        assignment.pop("grade", None)
+                    elif update.get("grade") is not None:
+                        assignment["grade"] = update["grade"]
+                    updated.append(assignment_id)
+        return updated
+
+    async def apply_submission_events(self, events: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Patch cached submission state from submission/grade change events.
+
+        Each student's cached entry is patched atomically in Redis, keeping
+        its timestamp and TTL, and the in-process tier of this worker is
+        updated with the result. Students or assignments that are not cached
+        are skipped: their next fetch already returns the new state.
+
+        Args:
+            events: Dictionaries with student_id, assignment_id, status and
+                an optional grade, in the order they happened.
+
+        Returns:
+            Dictionary with received, applied and one result per event with
+            student_id, assignment_id and whether it was applied
+        """
+        # Later events for the same assignment win
+        by_student: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        for event in events:
+            by_student.setdefault(event["student_id"].strip(), {})[
+                str(event["assignment_id"])
+            ] = {"status": event.get("status") or "Submitted", "grade": event.get("grade")}
+
+        found: Dict[str, set] = {}
+
+        async def patch(student_id: str, updates: Dict[str, Dict[str, Any]]) -> None:
+            matched: set = set()
+
+            def apply(courses: List[Dict]) -> bool:
+                # May run again on a fresh read if the entry changes meanwhile
+                matched.clear()
+                matched.update(CourseService.apply_submission_updates(courses, updates))
+                return bool(matched)
+
+            entry = await self.cache.patch(
+                student_id, apply, lambda courses: CourseIndex(courses).summary_record()
+            )
+            if entry is None:
+                CourseService._local_cache.delete(student_id)
+                return
+            found[student_id] = matched
+            self._store_local(
+                student_id, CourseIndex(entry.data, entry.stored_at, entry.size)
+            )
+
+        with timed("submission_patch"):
+            await asyncio.gather(
+                *(patch(student_id, updates) for student_id, updates in by_student.items())
+            )
+
+        results = [
+            {
+                "student_id": event["student_id"],
+                "assignment_id": event["assignment_id"],
+                "applied": str(event["assignment_id"])
+                in found.get(event["student_id"].strip(), ()),
+            }
+            for event in events
+        ]
+        applied = sum(result["applied"] for result in results)
+        logging.info(f"Applied {applied}/{len(events)} submission events")
+        return {"received": len(events), "applied": applied, "results": results}
+
+    async def _read_cache(
+        self, student_id: str, course_code: Optional[str] = None
+    ) -> Optional[CourseIndex]:
+        """
+        Read cached courses for a user, checking the in-process tier first.
+
+        Args:
+            student_id: The unique identifier of the user.
+            course_code: Optional course code to read on its own from Redis,
+                if the cache layout supports partial reads.
+
+        Returns:
+            The indexed cached courses, or None if nothing is cached.
+        """
+        index = CourseService._local_cache.get(student_id)
+        record_cache("local", index is not None)
+        if index is not None:
+            logging.debug(f"L1 cache hit for user {student_id}")
+        elif course_code and self.cache.layout.partial_reads:
+            with timed("cache_lookup"):
+                entry = await self.cache.get_courses_entry(student_id, [course_code])
+            record_cache("redis", entry is not None)
+            if entry is None:
+                return None
+            record_size("cache_value", entry.size)
+            # A partial index is not kept in the in-process tier
+            index = CourseIndex(entry.data, entry.stored_at, entry.size)
+        else:
+            with timed("cache_lookup"):
+                entry = await self.cache.get_entry(student_id)
+            record_cache("redis", entry is not None)
+            if entry is None or entry.data is None:
+                return None
+            record_size("cache_value", entry.size)
+            with timed("index_build"):
+                index = CourseIndex(entry.data, entry.stored_at, entry.size)
+            self._store_local(student_id, index)
+
+        index.stored_at = await self._check_freshness(student_id, index.stored_at)
+        return index
+
+    async def _check_freshness(self, student_id: str, stored_at: float) -> float:
+        """
+        Schedule a background refresh if cached courses are past the soft TTL.
+
+        A refresh that finds the upstream data unchanged only extends the TTL
+        and records the check time with the validator, so a stale timestamp is
+        compared with that time before refreshing again.
+
+        Args:
+            student_id: The unique identifier of the user.
+            stored_at: Timestamp of the cached courses.
+
+        Returns:
+            When the cached courses were last known to be current.
+        """
+        if time.time() - stored_at < self.soft_ttl:
+            return stored_at
+        if student_id in CourseService._refreshing or student_id in CourseService._inflight:
+            return stored_at
+
+        validator = await self.cache.get_validator(student_id)
+        if validator is not None:
+            stored_at = max(stored_at, validator.stored_at)
+        if time.time() - stored_at >= self.soft_ttl:
+            self._schedule_refresh(student_id)
+        return stored_at
+
+    def _store_local(self, student_id: str, index: CourseIndex) -> None:
+        """
+        Store indexed courses in the in-process tier.
+
+        The decoded size is only computed when a tier has a byte bound, since
+        it costs a JSON encode of the whole course list.
+
+        Args:
+            student_id: The unique identifier of the user.
+            index: Indexed courses; its decoded size is used for the byte bound.
+        """
+        local = CourseService._local_cache
+        stale = CourseService._stale_cache
+        local.set(
+            student_id,
+            index,
+            ttl=self.local_ttl,
+            size=index.memory_size if local.max_bytes else 0,
+        )
+        stale.set(student_id, index, size=index.memory_size if stale.max_bytes else 0)
+
+    def _serve_stale(self, student_id: str, error: Exception) -> CourseIndex:
+        """
+        Fall back to the last known courses of a student after a failure.
+
+        Args:
+            student_id: The unique identifier of the user.
+            error: The error that made retrieval fail.
+
+        Returns:
+            The last known CourseIndex.
+
+        Raises:
+            CoursesUnavailableError: If there is no last known copy.
+        """
+        index = CourseService._stale_cache.get(student_id)
+        record_cache("stale", index is not None)
+        if index is None:
+            raise CoursesUnavailableError(getattr(error, "retry_after", None)) from error
+        logging.warning(f"Serving last known courses for user {student_id} after error: {error}")
+        return index
+
+    def _schedule_refresh(self, student_id: str) -> None:
+        """
+        Start a background refresh of a stale entry, at most one per student.
+
+        When REFRESH_MAX_WORKERS refreshes are already running the request is
+        dropped; the next read of the stale entry schedules it again.
+
+        Args:
+            student_id: The unique identifier of the user.
+        """
+        if student_id in CourseService._refreshing or student_id in CourseService._inflight:
+            return
+        if len(CourseService._refreshing) >= REFRESH_MAX_WORKERS:
+            logging.debug(f"Refresh pool full, deferring refresh of user {student_id}")
+            return
+
+        logging.info(f"Cache entry for user {student_id} is stale, refreshing in background")
+        task = asyncio.ensure_future(self._refresh(student_id))
+        CourseService._refreshing[student_id] = task
+        task.add_done_callback(
+            lambda _: CourseService._refreshing.pop(student_id, None)
+        )
+
+    async def _refresh(self, student_id: str) -> None:
+        """
+        Re-fetch a student's courses and overwrite the cached entry.
+
+        The request is conditional on the stored validator: if the upstream
+        data is unchanged, the entry's TTL is extended without transforming
+        or rewriting anything. Skipped when another worker holds the fetch lock, since that worker is
+        already updating the same key. Errors are logged and the stale entry
+        is left in place until its hard TTL.
+
+        Args:
+            student_id: The unique identifier of the user.
+        """
+        try:
+            token = await self.cache.acquire_lock(student_id, FETCH_LOCK_TIMEOUT)
+            if token is None:
+                return
+            try:
+                validator = await self.cache.get_validator(student_id)
+                result = await APIService.get_courses_conditional(
+                    student_id, validator.data if validator else None
+                )
+                record_cache("upstream_validator", result.not_modified)
+                if result.not_modified:
+                    confirmed = CourseService.stamp_validator(
+                        result.validator, validator.data if validator else None
+                    )
+                    if await self.cache.touch(student_id, confirmed):
+                        logging.info(f"Courses of user {student_id} unchanged, extended cache entry")
+                        return
+                    # The entry expired meanwhile, so the body is needed after all
+                    result = await APIService.get_courses_conditional(student_id)
+                if result.courses:
+                    await self._store(student_id, result.courses, result.validator)
+                    logging.info(f"Refreshed cached courses for user {student_id}")
+            finally:
+                await self.cache.release_lock(student_id, token)
         except Exception as e:
-            logging.error(f"Error retrieving from cache for user {student_id}: {e}")
-            return []  # Return an empty list in case of an error
+            logging.error(f"Background refresh failed for user {student_id}: {e}")
+
+    async def _store(
+        self,
+        student_id: str,
+        courses: List[Dict[str, Any]],
+        validator: Optional[Dict[str, Any]] = None,
+    ) -> CourseIndex:
+        """
+        Write freshly fetched courses to Redis and the in-process tier.
+
+        Args:
+            student_id: The unique identifier of the user.
+            courses: Course list returned by the API.
+            validator: Upstream validator of the response, for conditional refreshes.
+
+        Returns:
+            The index built over the stored courses.
+        """
+        now = time.time()
+        if validator is not None:
+            previous = await self.cache.get_validator(student_id)
+            validator = CourseService.stamp_validator(
+                validator, previous.data if previous else None, now
+            )
+        with timed("index_build"):
+            index = CourseIndex(courses, now)
+        index.content_since = validator["since"] if validator is not None else now
+        index.size = await self.cache.set(
+            student_id, courses, summary=index.summary_record(), validator=validator
+        )
+        self._store_local(student_id, index)
+        return index
+
+    @staticmethod
+    def stamp_validator(
+        validator: Dict[str, Any],
+        previous: Optional[Dict[str, Any]],
+        now: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """
+        Record in a validator since when its content has been seen upstream.
+
+        Args:
+            validator: Validator of the current upstream response.
+            previous: Validator stored for the same student, if any.
+            now: Current epoch seconds (default: time.time()).
+
+        Returns:
+            A copy of validator with "since": the previous value if the body
+            hash is unchanged, otherwise now.
+        """
+        since = None
+        if previous and previous.get("hash") == validator.get("hash"):
+            since = previous.get("since")
+        return {**validator, "since": since or (time.time() if now is None else now)}
+
+    async def _fetch_single_flight(self, student_id: str) -> CourseIndex:
+        """
+        Fetch courses from the API, sharing one in-flight request per student.
+
+        Concurrent callers for the same student in this worker await the same
+        task instead of each calling the upstream API.
+
+        Args:
+            student_id: The unique identifier of the user.
+
+        Returns:
+            A CourseIndex over the fetched courses
+        """
+        task = CourseService._inflight.get(student_id)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch_and_cache(student_id))
+            CourseService._inflight[student_id] = task
+            task.add_done_callback(
+                lambda _: CourseService._inflight.pop(student_id, None)
+            )
+        else:
+            logging.info(f"Joining in-flight fetch for user {student_id}")
+
+        # Shield so a cancelled caller does not cancel the fetch for the others
+        return await asyncio.shield(task)
+
+    async def _fetch_and_cache(self, student_id: str) -> CourseIndex:
+        """
+        Fetch courses from the API and store them in cache.
+
+        A short Redis lock coordinates workers: if another worker already holds
+        it, wait for that worker to populate the cache. If the lock is released
+        without anything being cached (empty or failed fetch, failed write),
+        or the wait times out, fetch directly.
+
+        Args:
+            student_id: The unique identifier of the user.
+
+        Returns:
+            A CourseIndex over the fetched courses
+        """
+        token = await self.cache.acquire_lock(student_id, FETCH_LOCK_TIMEOUT)
+        if token is None:
+            logging.info(f"Another worker is fetching user {student_id}, waiting")
+            index, token = await self._wait_for_cache(student_id)
+            if index is not None:
+                return index
+            if token is None:
+                logging.warning(f"Timed out waiting for cache of user {student_id}")
+
+        try:
+            result = await APIService.get_courses_conditional(student_id)
+            if not result.courses:
+                return CourseIndex([])
+            index = await self._store(student_id, result.courses, result.validator)
+            logging.info(f"Cached courses for user {student_id}")
+            return index
+        finally:
+            if token is not None:
+                await self.cache.release_lock(student_id, token)
+
+    async def _wait_for_cache(
+        self, student_id: str
+    ) -> Tuple[Optional[CourseIndex], Optional[str]]:
+        """
+        Wait for another worker's fetch by polling the fetch lock.
+
+        The holder caches the courses before releasing the lock, so once the
+        lock can be taken the cache is read once: courses cached there are
+        returned, otherwise (empty or failed fetch, failed write) the lock is
+        kept and the caller fetches directly instead of waiting out the
+        timeout. The read is not counted as a cache lookup.
+
+        Args:
+            student_id: The unique identifier of the user.
+
+        Returns:
+            (index, None) if the courses were cached, (None, token) if the
+            caller now holds the lock, or (None, None) if the wait timed out.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + FETCH_LOCK_TIMEOUT
+        while loop.time() < deadline:
+            await asyncio.sleep(FETCH_LOCK_POLL_INTERVAL)
+            token = await self.cache.acquire_lock(student_id, FETCH_LOCK_TIMEOUT)
+            if token is None:
+                continue
+            entry = await self.cache.get_entry(student_id)
+            if entry is None or entry.data is None:
+                logging.info(f"Fetch lock of user {student_id} released without data, fetching")
+                return None, token
+            await self.cache.release_lock(student_id, token)
+            index = CourseIndex(entry.data, entry.stored_at, entry.size)
+            self._store_local(student_id, index)
+            return index, None
+        return None, None
+
+    def fetch_courses_sync(self, student_id: str) -> List[Dict[str, Any]]:
+        """
+        Blocking wrapper around fetch_courses for non-async callers.
+
+        Args:
+            student_id: The unique identifier of the user.
+
+        Returns:
+            A list of course dictionaries with detailed information
+        """
+        return asyncio.run(self.fetch_courses(student_id))
+
+    @staticmethod
+    def local_cache_stats() -> Dict[str, Any]:
+        """
+        Get hit/miss counters of the in-process cache tier.
+
+        Returns:
+            Dictionary with hits, misses, hit_ratio, evictions, entries and bytes.
+        """
+        return CourseService._local_cache.stats()
 
-    def check_cache_exists(self, user_id: str) -> bool:
+    async def check_cache_exists(self, user_id: str) -> bool:
         """
         Check if cached data exists for a user without retrieving it.
 
@@ -144,7 +1066,7 @@ class CourseService:
             True if cached data exists, False otherwise.
         """
         try:
-            return self.cache.exists(user_id)
+            return await self.cache.exists(user_id)
         except Exception as e:
             logging.error(f"Error checking cache existence for user {user_id}: {e}")
             return False
@@ -0,0 +1,132 @@
+"""In-process cache tier used in front of the shared Redis cache"""
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+
+class LocalCache:
+    """
+    Bounded in-memory LRU cache with per-entry TTL.
+
+    Values are stored as-is (already decoded), so callers must treat them as
+    read-only. The cache is bounded by entry count and, optionally, by an
+    approximate byte size supplied by the caller on each set.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl: Optional[float] = 60.0,
+        max_bytes: int = 0,
+    ):
+        """
+        Initialize the LocalCache.
+
+        Args:
+            max_entries: Maximum number of entries kept (0 disables the cache).
+            ttl: Default time to live in seconds, or None for no expiry.
+            max_bytes: Maximum total size of the entries in bytes (0 = unbounded).
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        # key -> (value, expires_at, size)
+        self._entries: "OrderedDict[Hashable, Tuple[Any, Optional[float], int]]" = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        Get a value and mark it as most recently used.
+
+        Args:
+            key: The cache key.
+        Returns:
+            The cached value, or None if it is missing or expired.
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        value, expires_at, _ = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            self._remove(key)
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(
+        self, key: Hashable, value: Any, ttl: Optional[float] = None, size: int = 0
+    ) -> None:
+        """
+        Store a value, evicting least recently used entries to stay in bounds.
+
+        Args:
+            key: The cache key.
+            value: The value to store.
+            ttl: Time to live in seconds (defaults to the cache TTL).
+            size: Approximate size of the value in bytes.
+        """
+        if self.max_entries <= 0:
+            return
+        if self.max_bytes and size > self.max_bytes:
+            # Never let a single oversized value flush the whole cache
+            return
+
+        if key in self._entries:
+            self._remove(key)
+
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+        self._entries[key] = (value, expires_at, size)
+        self._bytes += size
+
+        while len(self._entries) > self.max_entries or (
+            self.max_bytes and self._bytes > self.max_bytes
+        ):
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def delete(self, key: Hashable) -> None:
+        """
+        Remove a value if present.
+
+        Args:
+            key: The cache key.
+        """
+        if key in self._entries:
+            self._remove(key)
+
+    def clear(self) -> None:
+        """Remove every entry (counters are kept)."""
+        self._entries.clear()
+        self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get hit/miss counters and current occupancy.
+
+        Returns:
+            Dictionary with hits, misses, hit_ratio, evictions, entries and
+            bytes (the sizes passed to set, so 0 if callers pass none).
+        """
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+        }
+
+    def _remove(self, key: Hashable) -> None:
+        _, _, size = self._entries.pop(key)
+        self._bytes -= size
@@ -1,10 +1,99 @@
 import os
-import json
 import time
+import uuid
+import asyncio
+import inspect
 import redis
+import redis.asyncio as aioredis
 import logging
-from typing import Any, Optional
-from src.config import AzureForRedisHost, AzureForRedisPort, AzureForRedisPassword
+from typing import Any, Callable, Dict, List, Optional, Set
+from src.config import (
+    AzureForRedisHost,
+    AzureForRedisPort,
+    AzureForRedisPassword,
+    CACHE_SERIALIZER,
+    CACHE_COMPRESSION,
+    CACHE_COMPRESSION_THRESHOLD,
+    CACHE_LAYOUT,
+    CACHE_VALIDATOR_TTL,
+    REDIS_BREAKER_FAILURES,
+    REDIS_BREAKER_RESET,
+)
+from src.services.cache_codecs import CacheCodec, has_header
+from src.services.cache_layouts import CacheEntry, make_layout
+from src.utils import serialization
+from src.utils.circuit_breaker import CircuitBreaker, CircuitOpenError
+
+
+# Version of the plain JSON envelope written before the codec header existed
+JSON_ENVELOPE_VERSION = 2
+
+
+# Delete the lock only if it still holds our token (compare-and-delete)
+RELEASE_LOCK_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+
+class RedisUnavailableError(redis.ConnectionError):
+    """Redis is not called because its circuit is open or it has no client"""
+
+
+class GuardedRedis:
+    """
+    Redis client (or pipeline) proxy routing every command through a breaker.
+
+    Connection errors and timeouts count as failures; any reply, including
+    error replies such as WatchError, counts as a success. While the circuit
+    is open commands raise RedisUnavailableError, a redis.RedisError, so the
+    StudentCache error handling treats them like any other Redis failure.
+    """
+
+    def __init__(self, target: Any, breaker: CircuitBreaker):
+        self._target = target
+        self._breaker = breaker
+
+    def pipeline(self, *args: Any, **kwargs: Any) -> "GuardedRedis":
+        return GuardedRedis(self._target.pipeline(*args, **kwargs), self._breaker)
+
+    async def __aenter__(self) -> "GuardedRedis":
+        await self._target.__aenter__()
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> Any:
+        return await self._target.__aexit__(*exc_info)
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._target, name)
+        if not callable(attr):
+            return attr
+
+        def call(*args: Any, **kwargs: Any) -> Any:
+            result = attr(*args, **kwargs)
+            if result is self._target:
+                # A command queued on a pipeline returns the (awaitable) pipeline
+                return self
+            return self._guard(result) if inspect.isawaitable(result) else result
+
+        return call
+
+    async def _guard(self, awaitable: Any) -> Any:
+        try:
+            self._breaker.before_call()
+        except CircuitOpenError as e:
+            if inspect.iscoroutine(awaitable):
+                awaitable.close()
+            raise RedisUnavailableError(str(e)) from e
+        try:
+            result = await awaitable
+        except BaseException as e:
+            self._breaker.record(e)
+            raise
+        self._breaker.record_success()
+        return result
 
 
 class StudentCache:
@@ -14,100 +103,470 @@ class StudentCache:
     """
 
     # Module-level Redis client to reuse the connection pool across instances.
-    _redis_client: Optional[redis.StrictRedis] = None
+    # The asyncio client is bound to the loop it was created on, so it is
+    # rebuilt if a different event loop (e.g. a sync wrapper) uses the cache.
+    _redis_client: Optional[aioredis.StrictRedis] = None
+    _redis_client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    # Shared by every instance: once Redis keeps failing, calls fail fast
+    # instead of each waiting for the socket timeouts
+    breaker = CircuitBreaker(
+        "redis",
+        failure_threshold=REDIS_BREAKER_FAILURES,
+        reset_timeout=REDIS_BREAKER_RESET,
+        failure_exceptions=(redis.ConnectionError, redis.TimeoutError, OSError, asyncio.TimeoutError),
+    )
 
-    def __init__(self, expiration_time: int = 1800):
+    # Optional factory replacing the Azure connection (e.g. a local stand-in for
+    # offline benchmarks); called once per event loop
+    client_factory: Optional[Callable[[], aioredis.StrictRedis]] = None
+
+    # Codec used for new writes; reads detect the format from the header byte
+    codec = CacheCodec(
+        serializer=CACHE_SERIALIZER,
+        compression=CACHE_COMPRESSION,
+        compression_threshold=CACHE_COMPRESSION_THRESHOLD,
+    )
+
+    def __init__(self, expiration_time: int = 1800, layout: Optional[str] = None):
         """
         Initialize the StudentCache with a Redis client and expiration time.
 
         Args:
             expiration_time: The time in seconds for which the data should be cached (default 30 min).
+            layout: Redis layout of the course data, "blob", "sharded" or
+                "shared" (defaults to CACHE_LAYOUT).
         """
         self.key_prefix = "Pathway_digitalOperations-courseassistant_functions"
         self.expiration_time = expiration_time
         self.data_type = "courses"
+        # Small per-student record stored next to the courses (names, counts)
+        self.summary_data_type = "summary"
+        # Upstream validator (ETag/Last-Modified/body hash) of the cached courses,
+        # kept longer than the courses themselves
+        self.validator_data_type = "validator"
+        self.validator_ttl = max(CACHE_VALIDATOR_TTL, expiration_time)
+        self.layout = make_layout(layout or CACHE_LAYOUT, self)
 
-        # Initialize shared client once to reduce latency on cold connects
-        if StudentCache._redis_client is None:
+    @property
+    def redis_client(self) -> GuardedRedis:
+        """
+        Shared asyncio Redis client for the running event loop.
+
+        Returns:
+            The Redis client, wrapped so its commands go through the breaker.
+
+        Raises:
+            RedisUnavailableError: If the client could not be initialized.
+        """
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+
+        # Initialize shared client once per loop to reduce latency on cold connects
+        if StudentCache._redis_client is None or StudentCache._redis_client_loop is not loop:
+            if not StudentCache.breaker.allow():
+                raise RedisUnavailableError("Redis circuit is open")
             try:
-                StudentCache._redis_client = redis.StrictRedis(
-                    host=AzureForRedisHost,
-                    port=int(AzureForRedisPort),
-                    password=AzureForRedisPassword,
-                    decode_responses=True,
-                    ssl=True,
-                    socket_connect_timeout=2,
-                    socket_timeout=5,
-                    health_check_interval=30,
-                )
+                StudentCache._redis_client = self._create_client()
+                StudentCache._redis_client_loop = loop
             except Exception as e:
                 logging.error(f"Failed to initialize shared Redis client: {e}")
                 StudentCache._redis_client = None
+                StudentCache.breaker.record_failure()
+                raise RedisUnavailableError(f"Redis client unavailable: {e}") from e
 
-        self.redis_client = StudentCache._redis_client
+        return GuardedRedis(StudentCache._redis_client, StudentCache.breaker)
 
-    def _build_key(self, user_id: str) -> str:
+    @staticmethod
+    def _create_client() -> aioredis.StrictRedis:
+        """
+        Create the asyncio Redis client for Azure Cache for Redis.
+
+        Returns:
+            A new Redis client (from client_factory if one is set).
+        """
+        if StudentCache.client_factory is not None:
+            return StudentCache.client_factory()
+        return aioredis.StrictRedis(
+            host=AzureForRedisHost,
+            port=int(AzureForRedisPort),
+            password=AzureForRedisPassword,
+            decode_responses=False,
+            ssl=True,
+            socket_connect_timeout=2,
+            socket_timeout=5,
+            health_check_interval=30,
+        )
+
+    def _build_key(self, user_id: str, data_type: Optional[str] = None) -> str:
         """
         Generate a Redis key for storing student course data.
 
         Args:
             user_id: The user's unique identifier.
+            data_type: Record type (defaults to the course data type).
         Returns:
             A string representing the Redis key.
         """
-        return f"{self.key_prefix}:{user_id}:{self.data_type}"
+        return f"{self.key_prefix}:{user_id}:{data_type or self.data_type}"
+
+    @classmethod
+    def encode(cls, data: Any, stored_at: Optional[float] = None) -> bytes:
+        """
+        Serialize data with the configured codec.
+
+        Args:
+            data: The data to be stored.
+            stored_at: Timestamp recorded in the envelope (defaults to now).
+        Returns:
+            The encoded payload (codec header byte followed by the body).
+        """
+        ts = time.time() if stored_at is None else stored_at
+        return cls.codec.encode({"ts": ts, "data": data})
+
+    @staticmethod
+    def decode(raw: bytes) -> Optional[CacheEntry]:
+        """
+        Deserialize a cached payload written in any supported format.
+
+        Payloads with a codec header are decoded by CacheCodec whatever codec
+        wrote them. Older payloads are plain JSON: either the versioned
+        envelope or the original format, in which the course list was
+        JSON-encoded twice.
 
-    def set(self, user_id: str, data: Any) -> bool:
+        Args:
+            raw: The payload read from Redis.
+        Returns:
+            The decoded CacheEntry, or None for an unrecognized payload.
+        """
+        if has_header(raw):
+            value = CacheCodec.decode(raw)
+            return CacheEntry(value["data"], value.get("ts", 0.0), len(raw), False)
+
+        value = serialization.loads(raw)
+        if isinstance(value, dict) and value.get("v") == JSON_ENVELOPE_VERSION:
+            return CacheEntry(value["data"], value.get("ts", 0.0), len(raw), True)
+
+        # Original format: a JSON string containing the JSON-encoded data
+        if isinstance(value, str):
+            value = serialization.loads(value)
+        if isinstance(value, list):
+            return CacheEntry(value, 0.0, len(raw), True)
+        return None
+
+    async def set(
+        self, user_id: str, data: Any, summary: Any = None, validator: Any = None
+    ) -> int:
         """
         Set student course data in Redis with an expiration time.
 
         Args:
             user_id: The user's unique identifier.
-            data: The data to be stored, which will be serialized to JSON.
+            data: The data to be stored, serialized once with the configured codec.
+            summary: Optional summary record, written atomically with the data.
+            validator: Optional upstream validator of the data, written with it.
         Returns:
-            True if the operation was successful, False otherwise.
+            The size of the stored payload in bytes, or 0 if the operation failed.
         """
-        key = self._build_key(user_id)
         try:
             start_time = time.time()
-            # Using set with 'ex' parameter for atomic set-and-expire operation
-            result = self.redis_client.set(
-                key, json.dumps(data), ex=self.expiration_time
-            )
+            # MULTI/EXEC so the data, its expiration and the summary change together
+            async with self.redis_client.pipeline(transaction=True) as pipe:
+                size = self.layout.queue_write(pipe, user_id, data, summary, start_time)
+                self._queue_validator(pipe, user_id, validator, start_time)
+                await pipe.execute()
 
             elapsed = time.time() - start_time
             logging.debug(f"[PERFORMANCE] Redis SET for {user_id} took {elapsed:.3f}s")
-            return bool(result)
+            return size
         except redis.RedisError as e:
             logging.error(f"Error setting data in Redis for user {user_id}: {e}")
-            return False
+            return 0
 
-    def get(self, user_id: str) -> Optional[Any]:
+    def _queue_validator(
+        self, pipe: Any, user_id: str, validator: Any, stored_at: float
+    ) -> None:
         """
-        Get student course data from Redis.
+        Queue the write of a user's upstream validator, if there is one.
 
         Args:
+            pipe: Redis pipeline the write is queued on.
             user_id: The user's unique identifier.
+            validator: Upstream validator of the data (skipped if None).
+            stored_at: Timestamp written with the validator.
+        """
+        if validator is not None:
+            pipe.set(
+                self._build_key(user_id, self.validator_data_type),
+                self.encode(validator, stored_at),
+                ex=self.validator_ttl,
+            )
+
+    async def set_many(
+        self,
+        items: Dict[str, Any],
+        summaries: Optional[Dict[str, Any]] = None,
+        validators: Optional[Dict[str, Any]] = None,
+    ) -> int:
+        """
+        Set course data for several users in one pipelined round trip.
+
+        Args:
+            items: Mapping of user ID to the data to store for that user.
+            summaries: Optional mapping of user ID to its summary record.
+            validators: Optional mapping of user ID to the upstream validator
+                of its data.
         Returns:
-            The data retrieved from Redis, deserialized from JSON. Returns None if the key does not exist.
+            The number of course entries written, or 0 if the pipeline failed.
         """
-        key = self._build_key(user_id)
+        if not items:
+            return 0
+        summaries = summaries or {}
+        validators = validators or {}
+        # Shared records (e.g. course content) are queued once per pipeline
+        queued: Set[str] = set()
         try:
             start_time = time.time()
-            data = self.redis_client.get(key)
+            async with self.redis_client.pipeline(transaction=False) as pipe:
+                for user_id, data in items.items():
+                    self.layout.queue_write(
+                        pipe, user_id, data, summaries.get(user_id), start_time, queued
+                    )
+                    self._queue_validator(pipe, user_id, validators.get(user_id), start_time)
+                await pipe.execute()
 
             elapsed = time.time() - start_time
-            logging.debug(f"[PERFORMANCE] Redis GET for {user_id} took {elapsed:.3f}s")
+            logging.debug(f"[PERFORMANCE] Redis pipelined SET of {len(items)} keys took {elapsed:.3f}s")
+            return len(items)
+        except redis.RedisError as e:
+            logging.error(f"Error setting {len(items)} entries in Redis: {e}")
+            return 0
+
+    async def get_entry(self, user_id: str) -> Optional[CacheEntry]:
+        """
+        Get student course data and its metadata from Redis in one round trip.
+
+        Args:
+            user_id: The user's unique identifier.
+        Returns:
+            The decoded CacheEntry, or None if the key does not exist or is unreadable.
+        """
+        try:
+            start_time = time.time()
+            entry = await self.layout.read(self.redis_client, user_id)
 
-            if data:
-                return json.loads(data)
-        except (redis.RedisError, json.JSONDecodeError) as e:
+            elapsed = time.time() - start_time
+            logging.debug(f"[PERFORMANCE] Redis GET for {user_id} took {elapsed:.3f}s")
+            return entry
+        except (redis.RedisError, ValueError) as e:
             logging.error(
                 f"Error getting or decoding data from Redis for user {user_id}: {e}"
             )
         return None
 
-    def exists(self, user_id: str) -> bool:
+    async def patch(
+        self,
+        user_id: str,
+        apply: Callable[[List[Dict[str, Any]]], bool],
+        summarize: Optional[Callable[[List[Dict[str, Any]]], Any]] = None,
+    ) -> Optional[CacheEntry]:
+        """
+        Atomically modify a student's cached courses (WATCH/MULTI).
+
+        The entry keeps its timestamp and remaining TTL.
+
+        Args:
+            user_id: The user's unique identifier.
+            apply: Mutates the decoded course list; returns False if nothing changed.
+            summarize: Optional builder of the summary record for the patched courses.
+        Returns:
+            The entry holding the patched courses, or None if nothing is cached,
+            it is unreadable or Redis fails.
+        """
+        try:
+            start_time = time.time()
+            entry = await self.layout.patch(self.redis_client, user_id, apply, summarize)
+
+            elapsed = time.time() - start_time
+            logging.debug(f"[PERFORMANCE] Redis patch for {user_id} took {elapsed:.3f}s")
+            return entry
+        except (redis.RedisError, ValueError) as e:
+            logging.error(f"Error patching data in Redis for user {user_id}: {e}")
+        return None
+
+    async def get_validator(self, user_id: str) -> Optional[CacheEntry]:
+        """
+        Get the upstream validator stored with a student's courses.
+
+        Args:
+            user_id: The user's unique identifier.
+        Returns:
+            CacheEntry whose data is the validator and whose stored_at is when
+            the courses were last confirmed current, or None.
+        """
+        try:
+            raw = await self.redis_client.get(self._build_key(user_id, self.validator_data_type))
+            return self.decode(raw) if raw else None
+        except (redis.RedisError, ValueError) as e:
+            logging.error(f"Error getting validator from Redis for user {user_id}: {e}")
+        return None
+
+    async def get_validators(self, user_ids: List[str]) -> Dict[str, Optional[CacheEntry]]:
+        """
+        Get the upstream validators of several users in one round trip (MGET).
+
+        Args:
+            user_ids: The users' unique identifiers.
+        Returns:
+            Mapping of each user ID to its validator entry (see get_validator),
+            or None if it has none (all None if Redis fails).
+        """
+        if not user_ids:
+            return {}
+        try:
+            raws = await self.redis_client.mget(
+                [self._build_key(user_id, self.validator_data_type) for user_id in user_ids]
+            )
+            return {
+                user_id: self.decode(raw) if raw else None
+                for user_id, raw in zip(user_ids, raws)
+            }
+        except (redis.RedisError, ValueError) as e:
+            logging.error(f"Error getting {len(user_ids)} validators from Redis: {e}")
+            return {user_id: None for user_id in user_ids}
+
+    async def touch(self, user_id: str, validator: Any) -> bool:
+        """
+        Mark a student's cached courses as confirmed current.
+
+        Resets the TTL of the cached data without rewriting it and stores the
+        validator with the current time as its timestamp.
+
+        Args:
+            user_id: The user's unique identifier.
+            validator: The upstream validator the data was confirmed with.
+        Returns:
+            True if the cached data was still complete and was extended, False
+            if it has expired (it must be fetched again) or Redis fails.
+        """
+        try:
+            start_time = time.time()
+            if not await self.layout.touch(self.redis_client, user_id):
+                return False
+            await self.redis_client.set(
+                self._build_key(user_id, self.validator_data_type),
+                self.encode(validator, start_time),
+                ex=self.validator_ttl,
+            )
+
+            elapsed = time.time() - start_time
+            logging.debug(f"[PERFORMANCE] Redis touch for {user_id} took {elapsed:.3f}s")
+            return True
+        except (redis.RedisError, ValueError) as e:
+            logging.error(f"Error extending cache entry in Redis for user {user_id}: {e}")
+        return False
+
+    async def get_courses_entry(
+        self, user_id: str, course_codes: List[str]
+    ) -> Optional[CacheEntry]:
+        """
+        Get only some courses of a student (one HMGET with the sharded layout).
+
+        Args:
+            user_id: The user's unique identifier.
+            course_codes: Course codes to return.
+        Returns:
+            CacheEntry with the matching courses (possibly none), or None if
+            nothing is cached for the user or it is unreadable.
+        """
+        try:
+            return await self.layout.read_courses(self.redis_client, user_id, course_codes)
+        except (redis.RedisError, ValueError) as e:
+            logging.error(
+                f"Error getting or decoding courses from Redis for user {user_id}: {e}"
+            )
+        return None
+
+    async def get_many(
+        self, user_ids: List[str], course_codes: Optional[List[str]] = None
+    ) -> Dict[str, Optional[CacheEntry]]:
+        """
+        Get course data for several students in one round trip.
+
+        Uses a single MGET with the blob layout, or one pipelined read per
+        student with the sharded layout.
+
+        Args:
+            user_ids: The users' unique identifiers.
+            course_codes: Optional course codes to keep (all if not provided).
+        Returns:
+            Mapping of user ID to its CacheEntry, or None if nothing is cached.
+            All entries are None if Redis fails.
+        """
+        if not user_ids:
+            return {}
+        try:
+            start_time = time.time()
+            entries = await self.layout.read_many(self.redis_client, user_ids, course_codes)
+
+            elapsed = time.time() - start_time
+            logging.debug(f"[PERFORMANCE] Redis MGET of {len(user_ids)} keys took {elapsed:.3f}s")
+            return entries
+        except (redis.RedisError, ValueError) as e:
+            logging.error(f"Error getting {len(user_ids)} entries from Redis: {e}")
+            return {user_id: None for user_id in user_ids}
+
+    async def get_summary_entry(self, user_id: str) -> Optional[CacheEntry]:
+        """
+        Get a student's summary record from Redis.
+
+        Args:
+            user_id: The user's unique identifier.
+        Returns:
+            The decoded CacheEntry, or None if the key does not exist or is unreadable.
+        """
+        try:
+            return await self.layout.read_summary(self.redis_client, user_id)
+        except (redis.RedisError, ValueError) as e:
+            logging.error(f"Error getting summary from Redis for user {user_id}: {e}")
+        return None
+
+    async def set_summary(
+        self, user_id: str, summary: Any, stored_at: Optional[float] = None
+    ) -> bool:
+        """
+        Set a student's summary record, e.g. to backfill one for older entries.
+
+        Args:
+            user_id: The user's unique identifier.
+            summary: The summary record.
+            stored_at: Timestamp of the course data it was built from.
+        Returns:
+            True if the record was written, False otherwise.
+        """
+        try:
+            return await self.layout.write_summary(
+                self.redis_client, user_id, summary, stored_at
+            )
+        except redis.RedisError as e:
+            logging.error(f"Error setting summary in Redis for user {user_id}: {e}")
+            return False
+
+    async def get_or_none(self, user_id: str) -> Optional[Any]:
+        """
+        Get student course data from Redis in a single round trip.
+
+        Args:
+            user_id: The user's unique identifier.
+        Returns:
+            The decoded data, or None if the key does not exist.
+        """
+        entry = await self.get_entry(user_id)
+        return entry.data if entry is not None else None
+
+    async def exists(self, user_id: str) -> bool:
         """
         Check if the course data for a specific user exists in Redis.
 
@@ -116,11 +575,11 @@ class StudentCache:
         Returns:
             True if the data exists (not expired), False otherwise.
         """
-        key = self._build_key(user_id)
+        key = self.layout.data_key(user_id)
         try:
             start_time = time.time()
             # exists returns the number of keys found
-            exists = self.redis_client.exists(key)
+            exists = await self.redis_client.exists(key)
             result = bool(exists)
 
             elapsed = time.time() - start_time
@@ -133,3 +592,63 @@ class StudentCache:
                 f"Error checking key existence in Redis for user {user_id}: {e}"
             )
             return False
+
+    async def exists_many(self, user_ids: List[str]) -> List[bool]:
+        """
+        Check which users have cached course data, in one pipelined round trip.
+
+        Args:
+            user_ids: The users' unique identifiers.
+        Returns:
+            One flag per user ID, in order (all False if Redis fails).
+        """
+        if not user_ids:
+            return []
+        try:
+            async with self.redis_client.pipeline(transaction=False) as pipe:
+                for user_id in user_ids:
+                    pipe.exists(self.layout.data_key(user_id))
+                return [bool(found) for found in await pipe.execute()]
+        except redis.RedisError as e:
+            logging.error(f"Error checking {len(user_ids)} keys in Redis: {e}")
+            return [False] * len(user_ids)
+
+    async def acquire_lock(self, user_id: str, timeout: float) -> Optional[str]:
+        """
+        Try to take the short-lived fetch lock for a user.
+
+        Args:
+            user_id: The user's unique identifier.
+            timeout: Lock lifetime in seconds, released automatically after it.
+        Returns:
+            A token to release the lock with, or None if another holder owns it.
+            If Redis fails, a token is still returned so the caller proceeds.
+        """
+        key = f"{self._build_key(user_id)}:lock"
+        token = uuid.uuid4().hex
+        try:
+            acquired = await self.redis_client.set(
+                key, token, nx=True, px=int(timeout * 1000)
+            )
+            return token if acquired else None
+        except redis.RedisError as e:
+            logging.error(f"Error acquiring fetch lock in Redis for user {user_id}: {e}")
+            return token
+
+    async def release_lock(self, user_id: str, token: str) -> bool:
+        """
+        Release the fetch lock for a user if it is still held with this token.
+
+        Args:
+            user_id: The user's unique identifier.
+            token: The token returned by acquire_lock.
+        Returns:
+            True if the lock was released, False otherwise.
+        """
+        key = f"{self._build_key(user_id)}:lock"
+        try:
+            released = await self.redis_client.eval(RELEASE_LOCK_SCRIPT, 1, key, token)
+            return bool(released)
+        except redis.RedisError as e:
+            logging.error(f"Error releasing fetch lock in Redis for user {user_id}: {e}")
+            return False
@@ -0,0 +1,171 @@
+"""Circuit breaker for calls to external dependencies (Redis, courses API)"""
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Tuple, Type, TypeVar
+
+T = TypeVar("T")
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a dependency while its circuit is open"""
+
+    def __init__(self, name: str, retry_after: float):
+        super().__init__(f"Circuit '{name}' is open, retry in {retry_after:.1f}s")
+        self.name = name
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker with closed, open and half-open states.
+
+    - closed: calls go through; failure_threshold consecutive failures open
+      the circuit.
+    - open: calls fail fast with CircuitOpenError for reset_timeout seconds.
+    - half-open: a single trial call goes through; its success closes the
+      circuit, its failure opens it again for another reset_timeout.
+
+    Only exceptions listed in failure_exceptions count as failures; any other
+    error means the dependency answered, so it counts as a success.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        failure_exceptions: Tuple[Type[BaseException], ...] = (Exception,),
+    ):
+        """
+        Initialize the CircuitBreaker.
+
+        Args:
+            name: Dependency name, used in logs and errors.
+            failure_threshold: Consecutive failures that open the circuit
+                (0 or less disables the breaker).
+            reset_timeout: Seconds the circuit stays open before a trial call.
+            failure_exceptions: Exception types counted as failures.
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failure_exceptions = failure_exceptions
+        self._state = self.CLOSED
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self.failures = 0
+        self.rejected = 0
+        self.opened = 0
+
+    @property
+    def state(self) -> str:
+        """Current state, moving from open to half-open once reset_timeout passed"""
+        if self._state == self.OPEN and self.retry_after <= 0:
+            self._state = self.HALF_OPEN
+            self._trial_in_flight = False
+            logging.info(f"Circuit '{self.name}' half-open, allowing a trial call")
+        return self._state
+
+    @property
+    def retry_after(self) -> float:
+        """Seconds until an open circuit allows a trial call"""
+        return max(0.0, self._opened_at + self.reset_timeout - time.monotonic())
+
+    def allow(self) -> bool:
+        """
+        Check whether a call may go through, without reserving the trial call.
+
+        Returns:
+            False while the circuit is open or a half-open trial is in flight.
+        """
+        state = self.state
+        return state == self.CLOSED or (state == self.HALF_OPEN and not self._trial_in_flight)
+
+    def before_call(self) -> None:
+        """
+        Admit a call or fail fast; a half-open circuit admits one trial call.
+
+        Raises:
+            CircuitOpenError: If the call is not allowed.
+        """
+        if self.failure_threshold <= 0:
+            return
+        if not self.allow():
+            self.rejected += 1
+            raise CircuitOpenError(self.name, self.retry_after)
+        if self._state == self.HALF_OPEN:
+            self._trial_in_flight = True
+
+    def record_success(self) -> None:
+        """Record a call that reached the dependency; closes the circuit."""
+        if self._state != self.CLOSED:
+            logging.info(f"Circuit '{self.name}' closed")
+        self._state = self.CLOSED
+        self._trial_in_flight = False
+        self.failures = 0
+
+    def record_failure(self) -> None:
+        """Record a failed call; may open the circuit."""
+        self.failures += 1
+        if self.failure_threshold <= 0:
+            return
+        if self._state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+            if self._state != self.OPEN:
+                self.opened += 1
+                logging.warning(
+                    f"Circuit '{self.name}' opened after {self.failures} failures, "
+                    f"failing fast for {self.reset_timeout:.0f}s"
+                )
+            self._state = self.OPEN
+            self._opened_at = time.monotonic()
+            self._trial_in_flight = False
+
+    def record(self, error: BaseException) -> None:
+        """
+        Record the outcome of a call that raised.
+
+        Args:
+            error: The exception raised by the call.
+        """
+        if isinstance(error, asyncio.CancelledError):
+            # Neither outcome is known; just free the trial slot
+            self._trial_in_flight = False
+        elif isinstance(error, self.failure_exceptions):
+            self.record_failure()
+        else:
+            self.record_success()
+
+    async def call(self, func: Callable[..., Awaitable[T]], *args: Any, **kwargs: Any) -> T:
+        """
+        Await func(*args, **kwargs) through the breaker.
+
+        Raises:
+            CircuitOpenError: If the circuit is open.
+        """
+        self.before_call()
+        try:
+            result = await func(*args, **kwargs)
+        except BaseException as e:
+            self.record(e)
+            raise
+        self.record_success()
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get the breaker state and counters.
+
+        Returns:
+            Dictionary with state, failures (consecutive), opened and rejected.
+        """
+        return {
+            "state": self.state,
+            "failures": self.failures,
+            "opened": self.opened,
+            "rejected": self.rejected,
+        }
@@ -0,0 +1,254 @@
+"""Lightweight in-process metrics with Prometheus text exposition"""
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Tuple
+
+# Latency buckets in seconds, from sub-millisecond cache hits to slow upstream calls
+LATENCY_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+# Payload size buckets in bytes, 256 B .. 16 MiB
+SIZE_BUCKETS = tuple(256 * 4 ** i for i in range(9))
+
+LabelValues = Tuple[str, ...]
+
+
+def _format_labels(names: Iterable[str], values: Iterable[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+class Counter:
+    """Monotonic counter with optional labels"""
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        """
+        Increase the counter
+
+        Args:
+            labels: Label values, in the order of labelnames
+            amount: Amount to add
+        """
+        self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def value(self, *labels: str) -> float:
+        """Current value for the given label values"""
+        return self._values.get(labels, 0.0)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        for labels, value in self._values.items():
+            lines.append(f"{self.name}{_format_labels(self.labelnames, labels)} {value}")
+        return lines
+
+
+class Histogram:
+    """Cumulative histogram with fixed buckets and optional labels"""
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Tuple[str, ...] = (),
+        buckets: Tuple[float, ...] = LATENCY_BUCKETS,
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self.buckets = buckets
+        # labels -> [per-bucket counts (+Inf last), sum]
+        self._series: Dict[LabelValues, Tuple[List[int], List[float]]] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        """
+        Record an observation
+
+        Args:
+            value: Observed value (seconds or bytes)
+            labels: Label values, in the order of labelnames
+        """
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series[labels] = ([0] * (len(self.buckets) + 1), [0.0])
+        series[0][bisect_left(self.buckets, value)] += 1
+        series[1][0] += value
+
+    def time(self, *labels: str) -> "Timer":
+        """Context manager that observes the elapsed time of its block"""
+        return Timer(self, labels)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        for labels, (counts, total) in self._series.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                bucket_labels = _format_labels(self.labelnames, labels, f'le="{le}"')
+                lines.append(f"{self.name}_bucket{bucket_labels} {cumulative}")
+            label_str = _format_labels(self.labelnames, labels)
+            lines.append(f"{self.name}_sum{label_str} {total[0]}")
+            lines.append(f"{self.name}_count{label_str} {cumulative}")
+        return lines
+
+
+class Timer:
+    """Times a block with perf_counter and records it in a histogram"""
+
+    __slots__ = ("histogram", "labels", "start")
+
+    def __init__(self, histogram: Histogram, labels: LabelValues):
+        self.histogram = histogram
+        self.labels = labels
+        self.start = 0.0
+
+    def __enter__(self) -> "Timer":
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.histogram.observe(time.perf_counter() - self.start, *self.labels)
+
+
+class MetricsRegistry:
+    """Holds metrics and gauge callbacks, and renders them for Prometheus"""
+
+    def __init__(self):
+        self._metrics: List = []
+        # name -> (documentation, callback returning {label values: value}, labelnames)
+        self._gauges: Dict[str, Tuple[str, Callable[[], Dict[LabelValues, float]], Tuple[str, ...]]] = {}
+
+    def register(self, metric):
+        """Register a Counter or Histogram and return it"""
+        self._metrics.append(metric)
+        return metric
+
+    def gauge_callback(
+        self,
+        name: str,
+        documentation: str,
+        callback: Callable[[], Dict[LabelValues, float]],
+        labelnames: Tuple[str, ...] = (),
+    ) -> None:
+        """
+        Register a gauge whose values are read from a callback at scrape time
+
+        Args:
+            name: Metric name
+            documentation: Help text
+            callback: Returns a mapping of label values to gauge values
+            labelnames: Label names
+        """
+        self._gauges[name] = (documentation, callback, labelnames)
+
+    def render(self) -> str:
+        """Render every metric in the Prometheus text exposition format"""
+        lines: List[str] = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        for name, (documentation, callback, labelnames) in self._gauges.items():
+            lines.append(f"# HELP {name} {documentation}")
+            lines.append(f"# TYPE {name} gauge")
+            for labels, value in callback().items():
+                lines.append(f"{name}{_format_labels(labelnames, labels)} {value}")
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+STAGE_LATENCY = REGISTRY.register(Histogram(
+    "course_assistant_stage_duration_seconds",
+    "Latency of each stage of the request path",
+    ("stage",),
+))
+TOOL_LATENCY = REGISTRY.register(Histogram(
+    "course_assistant_mcp_call_duration_seconds",
+    "End-to-end latency of MCP tool calls and resource reads",
+    ("kind", "name"),
+))
+CACHE_REQUESTS = REGISTRY.register(Counter(
+    "course_assistant_cache_requests_total",
+    "Cache lookups by tier and result",
+    ("tier", "result"),
+))
+PAYLOAD_SIZE = REGISTRY.register(Histogram(
+    "course_assistant_payload_bytes",
+    "Size of payloads moving through the request path",
+    ("kind",),
+    SIZE_BUCKETS,
+))
+
+
+def _cache_hit_ratio() -> Dict[LabelValues, float]:
+    ratios = {}
+    for tier in {labels[0] for labels in CACHE_REQUESTS._values}:
+        hits = CACHE_REQUESTS.value(tier, "hit")
+        lookups = hits + CACHE_REQUESTS.value(tier, "miss")
+        ratios[(tier,)] = hits / lookups if lookups else 0.0
+    return ratios
+
+
+REGISTRY.gauge_callback(
+    "course_assistant_cache_hit_ratio",
+    "Fraction of cache lookups that were hits, by tier",
+    _cache_hit_ratio,
+    ("tier",),
+)
+
+
+def timed(stage: str) -> Timer:
+    """
+    Time a block as one stage of the request path
+
+    Args:
+        stage: Stage name (e.g. "cache_lookup", "upstream_api")
+
+    Returns:
+        Context manager recording into course_assistant_stage_duration_seconds
+    """
+    return STAGE_LATENCY.time(stage)
+
+
+def record_cache(tier: str, hit: bool) -> None:
+    """
+    Count a cache lookup
+
+    Args:
+        tier: Lookup label, one of a fixed set so the metric's cardinality
+            stays bounded:
+            "local" (in-process L1 tier),
+            "redis" (course data in Redis),
+            "redis_summary" (summary record in Redis),
+            "stale" (last known copy served after a failure),
+            "upstream_validator" (conditional refresh; hit = not modified)
+        hit: Whether the lookup found a value
+    """
+    CACHE_REQUESTS.inc(tier, "hit" if hit else "miss")
+
+
+def record_size(kind: str, size: int) -> None:
+    """
+    Record a payload size in bytes
+
+    Args:
+        kind: Payload kind (e.g. "cache_value", "tool_response")
+        size: Size in bytes
+    """
+    PAYLOAD_SIZE.observe(size, kind)
+
+
+def render_metrics() -> str:
+    """Render all registered metrics in the Prometheus text format"""
+    return REGISTRY.render()
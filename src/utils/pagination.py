@@ -0,0 +1,43 @@
+"""Opaque cursors for paginated tool responses"""
+import base64
+import json
+from typing import Optional
+
+
+def encode_cursor(offset: int) -> str:
+    """
+    Encode a page offset as an opaque cursor
+
+    Args:
+        offset: Index of the first item of the next page
+
+    Returns:
+        URL-safe cursor string
+    """
+    raw = json.dumps({"o": offset}, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str]) -> int:
+    """
+    Decode a cursor produced by encode_cursor
+
+    Args:
+        cursor: Cursor string, or None/empty for the first page
+
+    Returns:
+        Offset of the first item of the page
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    if not cursor:
+        return 0
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        offset = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))["o"]
+    except (ValueError, KeyError, TypeError) as e:
+        raise ValueError(f"Cursor inválido: {cursor}") from e
+    if not isinstance(offset, int) or offset < 0:
+        raise ValueError(f"Cursor inválido: {cursor}")
+    return offset
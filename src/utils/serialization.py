@@ -0,0 +1,120 @@
+"""JSON serialization with an optional fast backend"""
+import json
+from typing import Any, Dict, Union
+
+from src.config import JSON_LIBRARY
+
+try:
+    import orjson
+except ImportError:  # optional dependency
+    orjson = None
+
+
+class StdlibSerializer:
+    """JSON through the standard library json module"""
+
+    name = "json"
+
+    def dumps(self, value: Any, compact: bool = False) -> str:
+        """
+        Serialize a value to a JSON string
+
+        Args:
+            value: Value to serialize
+            compact: Omit indentation and whitespace (default: indent=2)
+
+        Returns:
+            JSON text, with non-ASCII characters kept as-is
+        """
+        if compact:
+            return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+        return json.dumps(value, ensure_ascii=False, indent=2)
+
+    def dumps_bytes(self, value: Any, compact: bool = True) -> bytes:
+        """
+        Serialize a value to UTF-8 encoded JSON
+
+        Args:
+            value: Value to serialize
+            compact: Omit indentation and whitespace (default: compact)
+
+        Returns:
+            JSON as UTF-8 bytes
+        """
+        return self.dumps(value, compact).encode("utf-8")
+
+    def loads(self, data: Union[str, bytes, bytearray, memoryview]) -> Any:
+        """
+        Parse JSON text or UTF-8 bytes
+
+        Args:
+            data: JSON document
+
+        Returns:
+            The decoded value
+        """
+        if isinstance(data, memoryview):
+            data = bytes(data)
+        return json.loads(data)
+
+
+class OrjsonSerializer(StdlibSerializer):
+    """JSON through orjson; output matches StdlibSerializer for course data"""
+
+    name = "orjson"
+
+    def dumps(self, value: Any, compact: bool = False) -> str:
+        return self.dumps_bytes(value, compact).decode("utf-8")
+
+    def dumps_bytes(self, value: Any, compact: bool = True) -> bytes:
+        option = orjson.OPT_NON_STR_KEYS
+        if not compact:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(value, option=option)
+
+    def loads(self, data: Union[str, bytes, bytearray, memoryview]) -> Any:
+        return orjson.loads(data)
+
+
+SERIALIZERS: Dict[str, type] = {"json": StdlibSerializer, "orjson": OrjsonSerializer}
+
+
+def get_serializer(name: str = "auto") -> StdlibSerializer:
+    """
+    Get a serializer by backend name
+
+    Args:
+        name: "orjson", "json", or "auto" (orjson if installed, else json)
+
+    Returns:
+        Serializer instance
+
+    Raises:
+        ValueError: If the name is unknown or orjson is requested but missing
+    """
+    if name == "auto":
+        name = "orjson" if orjson is not None else "json"
+    if name not in SERIALIZERS:
+        raise ValueError(f"Unknown JSON library: {name}")
+    if name == "orjson" and orjson is None:
+        raise ValueError("JSON library 'orjson' requires the orjson package")
+    return SERIALIZERS[name]()
+
+
+# Serializer used by tool/resource responses and the cache codec
+serializer = get_serializer(JSON_LIBRARY)
+
+
+def dumps(value: Any, compact: bool = False) -> str:
+    """Serialize a value to JSON text with the configured backend"""
+    return serializer.dumps(value, compact)
+
+
+def dumps_bytes(value: Any, compact: bool = True) -> bytes:
+    """Serialize a value to UTF-8 JSON with the configured backend"""
+    return serializer.dumps_bytes(value, compact)
+
+
+def loads(data: Union[str, bytes, bytearray, memoryview]) -> Any:
+    """Parse JSON text or bytes with the configured backend"""
+    return serializer.loads(data)
@@ -0,0 +1,303 @@
+"""Bulk cache warm-up job: pre-fills StudentCache for a roster of student IDs
+
+Usage:
+    python -m src.warm_cache roster.txt
+    cat roster.txt | python -m src.warm_cache --concurrency 20 --rate 50
+
+The roster has one student ID per line; blank lines and lines starting with
+'#' are ignored.
+"""
+import argparse
+import asyncio
+import logging
+import sys
+import time
+from typing import Any, Dict, Iterable, List, Optional, TextIO, Tuple
+
+from src.config import (
+    WARM_CACHE_BATCH_SIZE,
+    WARM_CACHE_CONCURRENCY,
+    WARM_CACHE_RATE_LIMIT,
+)
+from src.services.api_service import APIService
+from src.services.course_index import CourseIndex
+from src.services.course_service import CourseService
+from src.services.redis_cache_service import StudentCache
+
+
+class TokenBucket:
+    """Async token bucket limiting how often upstream requests are started"""
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        """
+        Initialize the TokenBucket.
+
+        Args:
+            rate: Tokens added per second (0 or less disables the limit).
+            capacity: Maximum burst size (defaults to one second of tokens).
+        """
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(rate, 1.0)
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        """Wait until a token is available and take it."""
+        if self.rate <= 0:
+            return
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+                self.updated_at = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class Progress:
+    """Counts warm-up outcomes and reports them to stderr"""
+
+    def __init__(self, total: int, stream: TextIO = sys.stderr, interval: float = 1.0):
+        self.total = total
+        self.stream = stream
+        self.interval = interval
+        self.started_at = time.monotonic()
+        self.last_report = self.started_at
+        self.cached = 0
+        self.empty = 0
+        self.failed = 0
+        self.skipped = 0
+
+    @property
+    def done(self) -> int:
+        return self.cached + self.empty + self.failed + self.skipped
+
+    def report(self, force: bool = False) -> None:
+        """
+        Print a progress line, at most once per interval unless forced.
+
+        Args:
+            force: Print even if the interval has not elapsed.
+        """
+        now = time.monotonic()
+        if not force and now - self.last_report < self.interval:
+            return
+        self.last_report = now
+        elapsed = now - self.started_at
+        rate = self.done / elapsed if elapsed else 0.0
+        print(
+            f"[warm-cache] {self.done}/{self.total} "
+            f"cached={self.cached} empty={self.empty} failed={self.failed} "
+            f"skipped={self.skipped} ({rate:.1f}/s, {elapsed:.1f}s)",
+            file=self.stream,
+            flush=True,
+        )
+
+
+def read_student_ids(lines: Iterable[str]) -> List[str]:
+    """
+    Parse a roster, keeping the first occurrence of each student ID.
+
+    Args:
+        lines: Roster lines (one student ID per line).
+
+    Returns:
+        The unique student IDs, in roster order.
+    """
+    seen = {}
+    for line in lines:
+        student_id = line.strip()
+        if student_id and not student_id.startswith("#"):
+            seen.setdefault(student_id, None)
+    return list(seen)
+
+
+async def warm_cache(
+    student_ids: List[str],
+    concurrency: int = WARM_CACHE_CONCURRENCY,
+    rate: float = WARM_CACHE_RATE_LIMIT,
+    batch_size: int = WARM_CACHE_BATCH_SIZE,
+    skip_cached: bool = False,
+    cache_expiration: int = 1800,
+    progress: Optional[Progress] = None,
+) -> Progress:
+    """
+    Fetch courses for every student from the API and store them in Redis.
+
+    Args:
+        student_ids: Students to warm.
+        concurrency: Maximum number of upstream requests in flight.
+        rate: Maximum upstream requests started per second (0 = unlimited).
+        batch_size: Number of entries written per Redis pipeline.
+        skip_cached: Leave students that already have a cache entry untouched.
+        cache_expiration: Cache expiration time in seconds.
+        progress: Progress reporter (a new one is created if None).
+
+    Returns:
+        The Progress with the final counts.
+    """
+    cache = StudentCache(expiration_time=cache_expiration)
+    progress = progress or Progress(len(student_ids))
+
+    if skip_cached:
+        pending = []
+        for start in range(0, len(student_ids), batch_size):
+            chunk = student_ids[start:start + batch_size]
+            for student_id, found in zip(chunk, await cache.exists_many(chunk)):
+                if found:
+                    progress.skipped += 1
+                else:
+                    pending.append(student_id)
+        student_ids = pending
+
+    queue: "asyncio.Queue[str]" = asyncio.Queue()
+    for student_id in student_ids:
+        queue.put_nowait(student_id)
+
+    bucket = TokenBucket(rate)
+    # student ID -> (courses, upstream validator)
+    batch: Dict[str, Tuple[List[Dict[str, Any]], Optional[Dict[str, Any]]]] = {}
+
+    async def flush() -> None:
+        if not batch:
+            return
+        items = dict(batch)
+        batch.clear()
+        summaries = {
+            student_id: CourseIndex(courses).summary_record()
+            for student_id, (courses, _) in items.items()
+        }
+        # Stored validators make the first background refresh conditional;
+        # unchanged content keeps the first-seen time of the previous one
+        previous = await cache.get_validators(
+            [student_id for student_id, (_, validator) in items.items() if validator]
+        )
+        validators = {}
+        for student_id, (_, validator) in items.items():
+            if validator is not None:
+                entry = previous.get(student_id)
+                validator = CourseService.stamp_validator(
+                    validator, entry.data if entry is not None else None
+                )
+            validators[student_id] = validator
+        written = await cache.set_many(
+            {student_id: courses for student_id, (courses, _) in items.items()},
+            summaries,
+            validators,
+        )
+        progress.cached += written
+        progress.failed += len(items) - written
+
+    async def worker() -> None:
+        while True:
+            try:
+                student_id = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            await bucket.acquire()
+            try:
+                result = await APIService.get_courses_conditional(student_id)
+                courses, validator = result.courses, result.validator
+            except Exception as e:
+                logging.error(f"Warm-up fetch failed for user {student_id}: {e}")
+                courses, validator = None, None
+
+            if courses is None:
+                progress.failed += 1
+            elif not courses:
+                progress.empty += 1
+            else:
+                batch[student_id] = (courses, validator)
+                if len(batch) >= batch_size:
+                    await flush()
+            progress.report()
+
+    try:
+        await asyncio.gather(*[worker() for _ in range(max(1, concurrency))])
+        await flush()
+    finally:
+        await APIService.close_http_client()
+    progress.report(force=True)
+    return progress
+
+
+def positive_int(value: str) -> int:
+    """
+    argparse type for options that must be at least 1.
+
+    Args:
+        value: Raw option value.
+
+    Returns:
+        The parsed integer.
+
+    Raises:
+        argparse.ArgumentTypeError: If the value is not an integer >= 1.
+    """
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: {value!r}")
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Pre-fill the Redis course cache for a roster of student IDs"
+    )
+    parser.add_argument(
+        "roster",
+        nargs="?",
+        default="-",
+        help="File with one student ID per line ('-' or omitted reads stdin)",
+    )
+    parser.add_argument("--concurrency", type=int, default=WARM_CACHE_CONCURRENCY)
+    parser.add_argument(
+        "--rate",
+        type=float,
+        default=WARM_CACHE_RATE_LIMIT,
+        help="Max upstream requests per second (0 = unlimited)",
+    )
+    parser.add_argument("--batch-size", type=positive_int, default=WARM_CACHE_BATCH_SIZE)
+    parser.add_argument(
+        "--skip-cached",
+        action="store_true",
+        help="Do not refetch students that already have a cache entry",
+    )
+    parser.add_argument("--cache-expiration", type=int, default=1800)
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    logging.basicConfig(
+        level=logging.WARNING,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+
+    if args.roster == "-":
+        student_ids = read_student_ids(sys.stdin)
+    else:
+        with open(args.roster, encoding="utf-8") as roster:
+            student_ids = read_student_ids(roster)
+
+    progress = asyncio.run(
+        warm_cache(
+            student_ids,
+            concurrency=args.concurrency,
+            rate=args.rate,
+            batch_size=args.batch_size,
+            skip_cached=args.skip_cached,
+            cache_expiration=args.cache_expiration,
+        )
+    )
+    return 1 if progress.failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
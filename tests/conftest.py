@@ -0,0 +1,113 @@
+"""Shared fixtures: sample course data and an in-memory Redis"""
+import copy
+from typing import Any, Dict, List
+
+import fakeredis
+import pytest
+
+from src.services.course_service import CourseService
+from src.services.local_cache_service import LocalCache
+from src.services.redis_cache_service import StudentCache
+from src.utils.circuit_breaker import CircuitBreaker
+
+# Shaped like the output of APIService.transform_api_payload
+COURSES: List[Dict[str, Any]] = [
+    {
+        "course_name": "Intro to Writing",
+        "course_code": "ENG101",
+        "term_code": "2026.WI",
+        "start_date": "2026-01-05",
+        "current_week": "2",
+        "week_assignments": {
+            "1": [
+                {
+                    "assignment_id": 1001,
+                    "title": "Essay draft",
+                    "possible_score": 20.0,
+                    "due_on": "2026-01-10T23:59:00Z",
+                    "type": "online_upload",
+                    "instructions": "Submit a one page draft.",
+                    "status": "Submitted",
+                    "grade": 18.5,
+                },
+                {
+                    "assignment_id": 1002,
+                    "title": "Reading quiz",
+                    "possible_score": 10.0,
+                    "due_on": "2026-01-11T23:59:00Z",
+                    "type": "online_quiz",
+                    "instructions": "Chapters 1 and 2.",
+                    "status": "Pending",
+                },
+            ],
+            "2": [
+                {
+                    "assignment_id": 1003,
+                    "title": "Peer review",
+                    "possible_score": 5.0,
+                    "due_on": "2026-01-17T23:59:00Z",
+                    "type": "discussion_topic",
+                    "instructions": "Reply to two classmates.",
+                    "status": "Pending",
+                },
+            ],
+        },
+        "canvas_course_id": 501,
+    },
+    {
+        "course_name": "Statistics",
+        "course_code": "MATH221",
+        "term_code": "2026.WI",
+        "start_date": "2026-01-05",
+        "current_week": "2",
+        "week_assignments": {
+            "1": [
+                {
+                    "assignment_id": 2001,
+                    "title": "Problem set 1",
+                    "possible_score": 50.0,
+                    "due_on": "2026-01-09T23:59:00Z",
+                    "type": "online_upload",
+                    "instructions": "Show all your steps.",
+                    "status": "Pending",
+                },
+            ],
+        },
+        "canvas_course_id": 502,
+    },
+]
+
+
+@pytest.fixture
+def courses() -> List[Dict[str, Any]]:
+    """A fresh copy of the sample course list"""
+    return copy.deepcopy(COURSES)
+
+
+@pytest.fixture
+def redis_server(monkeypatch) -> fakeredis.FakeServer:
+    """Point every StudentCache at an empty in-memory Redis with a closed breaker"""
+    server = fakeredis.FakeServer()
+    monkeypatch.setattr(
+        StudentCache, "client_factory", lambda: fakeredis.aioredis.FakeRedis(server=server)
+    )
+    monkeypatch.setattr(StudentCache, "_redis_client", None)
+    monkeypatch.setattr(StudentCache, "_redis_client_loop", None)
+    monkeypatch.setattr(StudentCache, "breaker", CircuitBreaker("redis"))
+    return server
+
+
+@pytest.fixture
+def raw_redis(redis_server) -> fakeredis.FakeRedis:
+    """Synchronous client on the same in-memory server, to inspect raw keys"""
+    return fakeredis.FakeRedis(server=redis_server)
+
+
+@pytest.fixture
+def service(redis_server, monkeypatch) -> CourseService:
+    """A CourseService with empty in-process tiers, backed by the in-memory Redis"""
+    monkeypatch.setattr(CourseService, "_local_cache", LocalCache(max_entries=16, ttl=60))
+    monkeypatch.setattr(CourseService, "_stale_cache", LocalCache(max_entries=16, ttl=None))
+    monkeypatch.setattr(CourseService, "_inflight", {})
+    monkeypatch.setattr(CourseService, "_refreshing", {})
+    return CourseService()
@@ -0,0 +1,190 @@
+"""StudentCache reads and writes with each Redis layout"""
+import asyncio
+import json
+
+import pytest
+
+from src.services.cache_codecs import CacheCodec, has_header
+from src.services.cache_layouts import SharedLayout
+from src.services.course_index import CourseIndex
+from src.services.redis_cache_service import StudentCache
+
+LAYOUTS = ["blob", "sharded", "shared"]
+
+
+@pytest.mark.parametrize("layout", LAYOUTS)
+def test_round_trip(redis_server, courses, layout):
+    cache = StudentCache(layout=layout)
+
+    async def scenario():
+        size = await cache.set("s1", courses, summary=CourseIndex(courses).summary_record())
+        return size, await cache.get_entry("s1"), await cache.get_summary_entry("s1")
+
+    size, entry, summary = asyncio.run(scenario())
+    assert size > 0
+    assert entry.data == courses
+    assert entry.stored_at > 0
+    assert not entry.legacy
+    assert summary.data == CourseIndex(courses).summary_record()
+
+
+@pytest.mark.parametrize("layout", LAYOUTS)
+def test_miss(redis_server, layout):
+    cache = StudentCache(layout=layout)
+
+    async def scenario():
+        return (
+            await cache.get_entry("nobody"),
+            await cache.get_courses_entry("nobody", ["ENG101"]),
+            await cache.get_many(["nobody"]),
+        )
+
+    assert asyncio.run(scenario()) == (None, None, {"nobody": None})
+
+
+@pytest.mark.parametrize("layout", LAYOUTS)
+def test_partial_read(redis_server, courses, layout):
+    cache = StudentCache(layout=layout)
+
+    async def scenario():
+        await cache.set("s1", courses)
+        return (
+            await cache.get_courses_entry("s1", ["MATH221"]),
+            await cache.get_courses_entry("s1", ["CS999"]),
+        )
+
+    entry, unknown = asyncio.run(scenario())
+    assert entry.data == [courses[1]]
+    assert unknown.data == []
+
+
+@pytest.mark.parametrize("layout", LAYOUTS)
+def test_read_many(redis_server, courses, layout):
+    cache = StudentCache(layout=layout)
+
+    async def scenario():
+        await cache.set_many({"s1": courses, "s2": courses[:1]})
+        return (
+            await cache.get_many(["s1", "s2", "s3"]),
+            await cache.get_many(["s1", "s2"], ["ENG101"]),
+        )
+
+    full, filtered = asyncio.run(scenario())
+    assert full["s1"].data == courses
+    assert full["s2"].data == courses[:1]
+    assert full["s3"] is None
+    assert filtered["s1"].data == courses[:1]
+    assert filtered["s2"].data == courses[:1]
+
+
+def test_sharded_rewrite_drops_removed_courses(redis_server, courses):
+    cache = StudentCache(layout="sharded")
+
+    async def scenario():
+        await cache.set("s1", courses)
+        await cache.set("s1", courses[:1])
+        return await cache.get_entry("s1"), await cache.get_courses_entry("s1", ["MATH221"])
+
+    entry, dropped = asyncio.run(scenario())
+    assert entry.data == courses[:1]
+    assert dropped.data == []
+
+
+def test_sharded_partial_read_transfers_only_requested_fields(redis_server, raw_redis, courses):
+    cache = StudentCache(layout="sharded")
+    asyncio.run(cache.set("s1", courses))
+    key = cache.layout.data_key("s1")
+    fields = {field.decode() for field in raw_redis.hkeys(key)}
+    assert fields == {"meta", "course:ENG101", "course:MATH221"}
+    assert 0 < raw_redis.ttl(key) <= cache.expiration_time
+
+
+def test_shared_layout_stores_course_content_once(redis_server, raw_redis, courses):
+    cache = StudentCache(layout="shared")
+    # Same sections, but nothing submitted yet
+    other = [dict(course) for course in courses]
+    other[0]["week_assignments"] = {
+        week: [{**assignment, "status": "Pending"} for assignment in assignments]
+        for week, assignments in courses[0]["week_assignments"].items()
+    }
+    for assignment in other[0]["week_assignments"]["1"]:
+        assignment.pop("grade", None)
+
+    async def scenario():
+        await cache.set_many({"s1": courses, "s2": other})
+        return await cache.get_many(["s1", "s2"])
+
+    entries = asyncio.run(scenario())
+    assert entries["s1"].data == courses
+    assert entries["s2"].data == other
+    content_keys = raw_redis.keys(f"{cache.key_prefix}:course:*")
+    assert len(content_keys) == len(courses)
+
+
+def test_shared_layout_join_keeps_field_order(courses):
+    for course in courses:
+        content, state = SharedLayout.split_course(course)
+        joined = SharedLayout.join_course(state, content)
+        assert list(joined) == list(course)
+        for week, assignments in course["week_assignments"].items():
+            for original, rebuilt in zip(assignments, joined["week_assignments"][week]):
+                assert list(rebuilt) == list(original)
+        assert joined == course
+
+
+def test_shared_layout_missing_content_is_a_miss(redis_server, raw_redis, courses):
+    cache = StudentCache(layout="shared")
+    asyncio.run(cache.set("s1", courses))
+    raw_redis.delete(raw_redis.keys(f"{cache.key_prefix}:course:*")[0])
+    assert asyncio.run(cache.get_entry("s1")) is None
+
+
+def test_legacy_double_encoded_entry_is_decoded_and_migrated(redis_server, raw_redis, courses):
+    cache = StudentCache()
+    key = cache._build_key("s1")
+    raw_redis.set(key, json.dumps(json.dumps(courses)), ex=600)
+
+    entry = asyncio.run(cache.get_entry("s1"))
+
+    assert entry.data == courses
+    assert entry.stored_at == 0.0
+    assert entry.legacy
+    # Rewritten with the current codec, keeping the remaining TTL
+    assert has_header(raw_redis.get(key))
+    assert 0 < raw_redis.ttl(key) <= 600
+    assert not asyncio.run(cache.get_entry("s1")).legacy
+
+
+def test_legacy_v2_envelope_is_decoded_and_migrated(redis_server, raw_redis, courses):
+    cache = StudentCache()
+    key = cache._build_key("s1")
+    raw_redis.set(key, json.dumps({"v": 2, "ts": 1234.5, "data": courses}), ex=600)
+
+    entry = asyncio.run(cache.get_entry("s1"))
+
+    assert (entry.data, entry.stored_at, entry.legacy) == (courses, 1234.5, True)
+    migrated = StudentCache.decode(raw_redis.get(key))
+    assert (migrated.data, migrated.stored_at, migrated.legacy) == (courses, 1234.5, False)
+
+
+@pytest.mark.parametrize("serializer", ["json", "msgpack"])
+@pytest.mark.parametrize("compression", ["none", "zlib", "zstd"])
+def test_entries_written_by_any_codec_are_readable(
+    redis_server, raw_redis, courses, serializer, compression
+):
+    try:
+        codec = CacheCodec(serializer, compression, compression_threshold=0)
+    except ValueError as e:  # optional msgpack / zstandard package missing
+        pytest.skip(str(e))
+    cache = StudentCache()
+    raw_redis.set(cache._build_key("s1"), codec.encode({"ts": 99.0, "data": courses}))
+
+    entry = asyncio.run(cache.get_entry("s1"))
+
+    assert (entry.data, entry.stored_at, entry.legacy) == (courses, 99.0, False)
+
+
+def test_unrecognized_payload_is_a_miss(redis_server, raw_redis):
+    cache = StudentCache()
+    raw_redis.set(cache._build_key("s1"), json.dumps({"unexpected": True}))
+    assert asyncio.run(cache.get_entry("s1")) is None
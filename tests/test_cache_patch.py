@@ -0,0 +1,157 @@
+"""Atomic (WATCH/MULTI) patches of cached submission state"""
+import asyncio
+
+import pytest
+
+from src.services.course_index import CourseIndex
+from src.services.course_service import CourseService
+from src.services.local_cache_service import LocalCache
+from src.services.redis_cache_service import StudentCache
+
+LAYOUTS = ["blob", "sharded", "shared"]
+
+
+def submit(assignment_id: int, grade: float):
+    """An apply callback setting one assignment to Submitted with a grade"""
+    def apply(courses):
+        return bool(
+            CourseService.apply_submission_updates(
+                courses, {str(assignment_id): {"status": "Submitted", "grade": grade}}
+            )
+        )
+    return apply
+
+
+def summarize(courses):
+    return CourseIndex(courses).summary_record()
+
+
+def assignment(courses, assignment_id):
+    for course in courses:
+        for assignments in course["week_assignments"].values():
+            for item in assignments:
+                if item["assignment_id"] == assignment_id:
+                    return item
+    raise KeyError(assignment_id)
+
+
+@pytest.mark.parametrize("layout", LAYOUTS)
+def test_patch_updates_data_and_summary(redis_server, raw_redis, courses, layout):
+    cache = StudentCache(layout=layout)
+
+    async def scenario():
+        await cache.set("s1", courses, summary=summarize(courses))
+        before = await cache.get_entry("s1")
+        patched = await cache.patch("s1", submit(1002, 9.5), summarize)
+        return before, patched, await cache.get_entry("s1"), await cache.get_summary_entry("s1")
+
+    before, patched, after, summary = asyncio.run(scenario())
+
+    assert assignment(after.data, 1002) == {
+        **assignment(courses, 1002), "status": "Submitted", "grade": 9.5
+    }
+    assert patched.data == after.data
+    # The patch keeps the entry's timestamp and never extends its TTL
+    assert after.stored_at == before.stored_at
+    ttl = raw_redis.ttl(cache.layout.data_key("s1"))
+    assert 0 < ttl <= cache.expiration_time
+    assert summary.data == summarize(after.data)
+    assert summary.data["status_counts"]["Submitted"] == 2
+
+
+@pytest.mark.parametrize("layout", LAYOUTS)
+def test_patch_back_to_pending_drops_the_grade(redis_server, courses, layout):
+    cache = StudentCache(layout=layout)
+
+    def unsubmit(data):
+        return bool(
+            CourseService.apply_submission_updates(data, {"1001": {"status": "Pending"}})
+        )
+
+    async def scenario():
+        await cache.set("s1", courses)
+        await cache.patch("s1", unsubmit)
+        return await cache.get_entry("s1")
+
+    entry = asyncio.run(scenario())
+    assert assignment(entry.data, 1001)["status"] == "Pending"
+    assert "grade" not in assignment(entry.data, 1001)
+
+
+@pytest.mark.parametrize("layout", LAYOUTS)
+def test_patch_without_changes_writes_nothing(redis_server, raw_redis, courses, layout):
+    cache = StudentCache(layout=layout)
+    asyncio.run(cache.set("s1", courses))
+    key = cache.layout.data_key("s1")
+    raw_before = raw_redis.dump(key)
+
+    entry = asyncio.run(cache.patch("s1", lambda data: False))
+
+    assert entry.data == courses
+    assert raw_redis.dump(key) == raw_before
+
+
+@pytest.mark.parametrize("layout", LAYOUTS)
+def test_patch_of_missing_entry(redis_server, raw_redis, layout):
+    cache = StudentCache(layout=layout)
+    assert asyncio.run(cache.patch("nobody", submit(1002, 1.0))) is None
+    assert raw_redis.keys("*") == []
+
+
+@pytest.mark.parametrize("layout", LAYOUTS)
+def test_patch_retries_on_concurrent_write(redis_server, courses, layout):
+    cache = StudentCache(layout=layout)
+    writer = StudentCache(layout=layout)
+    calls = []
+    original_read = type(cache.layout).read
+
+    async def read_then_race(layout_self, client, user_id):
+        entry = await original_read(layout_self, client, user_id)
+        if not calls:
+            # Another worker rewrites the entry between WATCH and EXEC
+            rewritten = [dict(course) for course in courses]
+            rewritten[1] = {**courses[1], "current_week": "3"}
+            await writer.set(user_id, rewritten)
+        calls.append(entry)
+        return entry
+
+    async def scenario():
+        await cache.set("s1", courses)
+        cache.layout.read = read_then_race.__get__(cache.layout)
+        await cache.patch("s1", submit(2001, 40.0))
+        del cache.layout.read
+        return await cache.get_entry("s1")
+
+    entry = asyncio.run(scenario())
+
+    assert len(calls) == 2
+    # Both the concurrent write and the patch survive
+    assert entry.data[1]["current_week"] == "3"
+    assert assignment(entry.data, 2001)["grade"] == 40.0
+
+
+@pytest.mark.parametrize("layout", LAYOUTS)
+def test_apply_submission_events(redis_server, courses, layout, monkeypatch):
+    monkeypatch.setattr(CourseService, "_local_cache", LocalCache(max_entries=16, ttl=60))
+    monkeypatch.setattr(CourseService, "_stale_cache", LocalCache(max_entries=16, ttl=60))
+    service = CourseService()
+    service.cache = StudentCache(layout=layout)
+    events = [
+        {"student_id": " s1 ", "assignment_id": 1003, "status": "Submitted", "grade": 4.0},
+        {"student_id": "s1", "assignment_id": 9999, "status": "Submitted"},
+        {"student_id": "s2", "assignment_id": 1003, "status": "Submitted"},
+    ]
+
+    async def scenario():
+        await service.cache.set("s1", courses)
+        return await service.apply_submission_events(events), await service.cache.get_entry("s1")
+
+    result, entry = asyncio.run(scenario())
+
+    assert result["received"] == 3
+    assert result["applied"] == 1
+    assert [r["applied"] for r in result["results"]] == [True, False, False]
+    assert assignment(entry.data, 1003)["grade"] == 4.0
+    # The worker's in-process tier holds the patched copy
+    local = CourseService._local_cache.get("s1")
+    assert assignment(local.courses, 1003)["grade"] == 4.0
@@ -0,0 +1,83 @@
+"""The streaming ICS writer against the icalendar reference implementation"""
+from datetime import datetime
+
+import pytest
+import pytz
+
+from src.services.calendar_service import (
+    ICS_LINE_LIMIT,
+    ICS_PRODID,
+    NO_ASSIGNMENTS_MESSAGE,
+    CalendarService,
+)
+from src.services.course_index import CourseIndex
+
+DTSTAMP = datetime(2026, 1, 6, 12, 0, tzinfo=pytz.utc)
+
+
+def both(courses, course_code=None, week=None, student_id="s1", dtstamp=DTSTAMP):
+    return (
+        CalendarService.render_ics_calendar(courses, course_code, week, student_id, dtstamp),
+        CalendarService.build_ics_calendar(courses, course_code, week, student_id, dtstamp),
+    )
+
+
+def set_first_assignment(courses, **fields):
+    courses[0]["week_assignments"]["1"][0].update(fields)
+
+
+@pytest.mark.parametrize(
+    "course_code, week",
+    [(None, None), ("ENG101", None), (None, "1"), ("MATH221", "1")],
+)
+def test_matches_reference_with_filters(courses, course_code, week):
+    streamed, reference = both(courses, course_code, week)
+    assert streamed == reference
+
+
+def test_escaping_matches_reference(courses):
+    set_first_assignment(
+        courses,
+        title="Essay; draft, part\\1",
+        instructions="Line one;\nLine two, with commas\r\nand a back\\slash",
+    )
+    streamed, reference = both(courses)
+    assert streamed == reference
+    assert "Essay\\; draft\\, part\\\\1" in streamed
+
+
+def test_long_lines_are_folded_like_reference(courses):
+    set_first_assignment(courses, instructions="word " * 100)
+    streamed, reference = both(courses)
+    assert streamed == reference
+    lines = streamed.split("\r\n")
+    assert any(line.startswith(" ") for line in lines)
+    assert max(len(line.encode("utf-8")) for line in lines) <= ICS_LINE_LIMIT
+
+
+@pytest.mark.parametrize(
+    "text",
+    ["Ensayo: introducción a la lógica " * 6, "課題の説明" * 30, "✍️📚" * 40],
+)
+def test_non_ascii_folding_matches_reference(courses, text):
+    set_first_assignment(courses, title=text[:40], instructions=text)
+    streamed, reference = both(courses)
+    assert streamed == reference
+    for line in streamed.split("\r\n"):
+        assert len(line.encode("utf-8")) <= ICS_LINE_LIMIT
+
+
+def test_calendar_header_and_stable_dtstamp(courses):
+    index = CourseIndex(courses, stored_at=DTSTAMP.timestamp())
+    first = CalendarService.render_ics_calendar(index, student_id="s1")
+    second = CalendarService.render_ics_calendar(index, student_id="s1")
+
+    assert first == second
+    assert first.startswith(f"BEGIN:VCALENDAR\r\nVERSION:2.0\r\nPRODID:{ICS_PRODID}\r\n")
+    assert "DTSTAMP:20260106T120000Z\r\n" in first
+    assert first == CalendarService.build_ics_calendar(courses, student_id="s1", dtstamp=DTSTAMP)
+
+
+def test_no_assignments_message(courses):
+    assert both(courses, course_code="CS999") == (NO_ASSIGNMENTS_MESSAGE, NO_ASSIGNMENTS_MESSAGE)
+    assert both(courses, week="42") == (NO_ASSIGNMENTS_MESSAGE, NO_ASSIGNMENTS_MESSAGE)
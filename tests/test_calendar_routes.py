@@ -0,0 +1,119 @@
+"""GET /students/{id}/calendar.ics: conditional requests across cache refreshes"""
+import asyncio
+import copy
+import hashlib
+import json
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.main import app
+from src.services.api_service import APIService, CoursesFetch
+from src.services.course_service import CourseService
+
+URL = "/students/s1/calendar.ics"
+
+
+class FakeAPI:
+    """Courses API answering 304 while the content hash is unchanged"""
+
+    def __init__(self, courses):
+        self.courses = courses
+        self.calls = []
+
+    @property
+    def validator(self):
+        body = json.dumps(self.courses, sort_keys=True).encode("utf-8")
+        return {
+            "etag": None,
+            "last_modified": None,
+            "hash": hashlib.blake2b(body, digest_size=16).hexdigest(),
+        }
+
+    async def get_courses_conditional(self, student_id, validator=None):
+        current = self.validator
+        if validator and validator.get("hash") == current["hash"]:
+            self.calls.append("not_modified")
+            return CoursesFetch(None, validator, True)
+        self.calls.append("fetch")
+        return CoursesFetch(copy.deepcopy(self.courses), current, False)
+
+
+@pytest.fixture
+def api(monkeypatch, courses) -> FakeAPI:
+    api = FakeAPI(courses)
+    monkeypatch.setattr(APIService, "get_courses_conditional", api.get_courses_conditional)
+    return api
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Shift time.time forward, as if the test waited"""
+    real_time = time.time
+    offset = [0.0]
+    monkeypatch.setattr(time, "time", lambda: real_time() + offset[0])
+
+    def advance(seconds: float) -> None:
+        offset[0] += seconds
+
+    return advance
+
+
+def forget_worker_copies() -> None:
+    """Drop this worker's in-process copies, as another worker would not have them"""
+    CourseService._local_cache.delete("s1")
+    CourseService._stale_cache.delete("s1")
+
+
+def get(client: TestClient, etag=None):
+    headers = {"If-None-Match": etag} if etag else {}
+    return client.get(URL, headers=headers)
+
+
+def test_calendar_stays_not_modified_across_refreshes(service, raw_redis, api, clock):
+    client = TestClient(app)
+    first = get(client)
+    assert first.status_code == 200
+    etag = first.headers["etag"]
+    assert get(client, etag).status_code == 304
+
+    # Past the soft TTL: the upstream answers not modified and the entry is
+    # only confirmed, which moves its "last confirmed" time
+    clock(service.soft_ttl + 60)
+    asyncio.run(service._refresh("s1"))
+    assert api.calls == ["fetch", "not_modified"]
+    forget_worker_copies()
+    assert get(client, etag).status_code == 304
+
+    # Past the hard TTL: the courses are gone from Redis and fetched again,
+    # with the same content
+    for key in raw_redis.keys("*"):
+        if not key.endswith(b":validator"):
+            raw_redis.delete(key)
+    forget_worker_copies()
+    clock(60)
+    response = get(client, etag)
+    assert api.calls[-1] == "fetch"
+    assert response.status_code == 304
+    assert response.headers["etag"] == etag
+
+
+def test_calendar_changes_with_the_content(service, api, clock):
+    client = TestClient(app)
+    first = get(client)
+
+    clock(service.soft_ttl + 60)
+    api.courses[0]["week_assignments"]["1"][1]["title"] = "Reading quiz (updated)"
+    asyncio.run(service._refresh("s1"))
+    forget_worker_copies()
+    second = get(client, first.headers["etag"])
+
+    assert second.status_code == 200
+    assert second.headers["etag"] != first.headers["etag"]
+    assert "Reading quiz (updated)" in second.text
+    stamps = [
+        line for response in (first, second)
+        for line in response.text.splitlines() if line.startswith("DTSTAMP:")
+    ]
+    assert len(set(stamps)) == 2
@@ -0,0 +1,182 @@
+"""CircuitBreaker state transitions and the Redis guard built on it"""
+import asyncio
+
+import pytest
+import redis
+
+from src.services.redis_cache_service import RedisUnavailableError, StudentCache
+from src.utils import circuit_breaker
+from src.utils.circuit_breaker import CircuitBreaker, CircuitOpenError
+
+
+class Clock:
+    """Stand-in for time.monotonic that only moves when told to"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch) -> Clock:
+    clock = Clock()
+    monkeypatch.setattr(circuit_breaker.time, "monotonic", clock)
+    return clock
+
+
+async def fail():
+    raise ConnectionError("down")
+
+
+async def succeed():
+    return "ok"
+
+
+def open_breaker(threshold: int = 3) -> CircuitBreaker:
+    breaker = CircuitBreaker("test", failure_threshold=threshold, reset_timeout=30)
+    for _ in range(threshold):
+        with pytest.raises(ConnectionError):
+            asyncio.run(breaker.call(fail))
+    return breaker
+
+
+def test_opens_after_consecutive_failures(clock):
+    breaker = CircuitBreaker("test", failure_threshold=3, reset_timeout=30)
+    for _ in range(2):
+        with pytest.raises(ConnectionError):
+            asyncio.run(breaker.call(fail))
+    assert breaker.state == CircuitBreaker.CLOSED
+
+    with pytest.raises(ConnectionError):
+        asyncio.run(breaker.call(fail))
+    assert breaker.state == CircuitBreaker.OPEN
+    assert breaker.stats()["opened"] == 1
+
+
+def test_success_resets_the_failure_count(clock):
+    breaker = CircuitBreaker("test", failure_threshold=2)
+    with pytest.raises(ConnectionError):
+        asyncio.run(breaker.call(fail))
+    asyncio.run(breaker.call(succeed))
+    with pytest.raises(ConnectionError):
+        asyncio.run(breaker.call(fail))
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_open_circuit_fails_fast(clock):
+    breaker = open_breaker()
+    calls = []
+
+    async def tracked():
+        calls.append(1)
+
+    with pytest.raises(CircuitOpenError) as excinfo:
+        asyncio.run(breaker.call(tracked))
+    assert calls == []
+    assert excinfo.value.retry_after == 30
+    assert breaker.stats()["rejected"] == 1
+
+
+def test_half_open_success_closes_the_circuit(clock):
+    breaker = open_breaker()
+    clock.now += 29.9
+    assert breaker.state == CircuitBreaker.OPEN
+
+    clock.now += 0.1
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert asyncio.run(breaker.call(succeed)) == "ok"
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.failures == 0
+
+
+def test_half_open_failure_reopens_the_circuit(clock):
+    breaker = open_breaker()
+    clock.now += 30
+    with pytest.raises(ConnectionError):
+        asyncio.run(breaker.call(fail))
+    assert breaker.state == CircuitBreaker.OPEN
+    assert breaker.retry_after == 30
+    assert breaker.stats()["opened"] == 2
+
+
+def test_half_open_admits_a_single_trial_call(clock):
+    breaker = open_breaker()
+    clock.now += 30
+
+    async def scenario():
+        release = asyncio.Event()
+
+        async def slow():
+            await release.wait()
+            return "ok"
+
+        trial = asyncio.create_task(breaker.call(slow))
+        await asyncio.sleep(0)
+        with pytest.raises(CircuitOpenError):
+            await breaker.call(succeed)
+        release.set()
+        return await trial
+
+    assert asyncio.run(scenario()) == "ok"
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_cancelled_trial_frees_the_slot(clock):
+    breaker = open_breaker()
+    clock.now += 30
+
+    async def scenario():
+        trial = asyncio.create_task(breaker.call(asyncio.sleep, 60))
+        await asyncio.sleep(0)
+        trial.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await trial
+
+    asyncio.run(scenario())
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert breaker.allow()
+
+
+def test_other_exceptions_count_as_success(clock):
+    breaker = CircuitBreaker("test", failure_threshold=1, failure_exceptions=(ConnectionError,))
+
+    async def bad_request():
+        raise ValueError("answered with an error")
+
+    for _ in range(3):
+        with pytest.raises(ValueError):
+            asyncio.run(breaker.call(bad_request))
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_zero_threshold_disables_the_breaker(clock):
+    breaker = CircuitBreaker("test", failure_threshold=0)
+    for _ in range(10):
+        with pytest.raises(ConnectionError):
+            asyncio.run(breaker.call(fail))
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert asyncio.run(breaker.call(succeed)) == "ok"
+
+
+def test_guarded_redis_fails_fast_while_open(redis_server, clock, monkeypatch):
+    breaker = CircuitBreaker("redis", failure_threshold=2, reset_timeout=30)
+    monkeypatch.setattr(StudentCache, "breaker", breaker)
+
+    async def ping():
+        return await StudentCache().redis_client.ping()
+
+    redis_server.connected = False
+    for _ in range(2):
+        with pytest.raises(redis.ConnectionError):
+            asyncio.run(ping())
+    assert breaker.state == CircuitBreaker.OPEN
+
+    redis_server.connected = True
+    with pytest.raises(RedisUnavailableError):
+        asyncio.run(ping())
+
+    clock.now += 30
+    assert asyncio.run(ping())
+    assert breaker.state == CircuitBreaker.CLOSED
@@ -0,0 +1,64 @@
+"""POST /events/submissions: signature check and event validation"""
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.main import app
+from src.routes import event_routes
+from src.routes.event_routes import SIGNATURE_HEADER, sign_body
+
+SECRET = "test-secret"
+
+
+@pytest.fixture
+def client(redis_server, monkeypatch) -> TestClient:
+    monkeypatch.setattr(event_routes, "SUBMISSION_EVENTS_SECRET", SECRET)
+    return TestClient(app)
+
+
+def post(client: TestClient, events, signature=None):
+    body = json.dumps({"events": events}).encode("utf-8")
+    headers = {"Content-Type": "application/json"}
+    if signature is not None:
+        headers[SIGNATURE_HEADER] = signature(body) if callable(signature) else signature
+    return client.post("/events/submissions", content=body, headers=headers)
+
+
+EVENT = {"student_id": "s1", "assignment_id": 1001, "status": "Submitted", "grade": 10}
+
+
+def test_missing_signature_is_401(client):
+    assert post(client, [EVENT]).status_code == 401
+
+
+def test_wrong_signature_is_403(client):
+    assert post(client, [EVENT], "sha256=" + "0" * 64).status_code == 403
+    assert post(client, [EVENT], lambda body: sign_body(body, "other")).status_code == 403
+
+
+def test_endpoint_is_closed_without_a_configured_secret(client, monkeypatch):
+    monkeypatch.setattr(event_routes, "SUBMISSION_EVENTS_SECRET", "")
+    response = post(client, [EVENT], lambda body: sign_body(body, ""))
+    assert response.status_code == 403
+
+
+def test_signed_request_is_applied(client):
+    response = post(client, [EVENT], lambda body: sign_body(body, SECRET))
+    assert response.status_code == 200
+    # Nothing is cached for s1, so the event is received but not applied
+    assert response.json()["received"] == 1
+    assert response.json()["applied"] == 0
+
+
+@pytest.mark.parametrize("student_id", ["", "   "])
+def test_blank_student_id_is_rejected(client, student_id):
+    event = {**EVENT, "student_id": student_id}
+    response = post(client, [event], lambda body: sign_body(body, SECRET))
+    assert response.status_code == 422
+
+
+def test_student_id_is_stripped():
+    from src.models.event import SubmissionEvent
+
+    assert SubmissionEvent(student_id=" s1 ", assignment_id=1).student_id == "s1"
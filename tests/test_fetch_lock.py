@@ -0,0 +1,93 @@
+"""Cross-worker fetch coordination through the Redis fetch lock"""
+import asyncio
+import time
+
+import pytest
+
+from src.services import course_service
+from src.services.api_service import APIService, CoursesFetch
+from src.utils.metrics import CACHE_REQUESTS
+
+
+@pytest.fixture
+def api(monkeypatch, courses):
+    """Fake courses API answering with the sample courses, counting calls"""
+    calls = []
+
+    async def get_courses_conditional(student_id, validator=None):
+        calls.append(student_id)
+        return CoursesFetch(courses, {"hash": "abc"}, False)
+
+    monkeypatch.setattr(APIService, "get_courses_conditional", get_courses_conditional)
+    monkeypatch.setattr(course_service, "FETCH_LOCK_POLL_INTERVAL", 0.01)
+    return calls
+
+
+def hold_lock(raw_redis, service, student_id):
+    """Take the fetch lock as another worker would; returns its key"""
+    key = f"{service.cache._build_key(student_id)}:lock"
+    raw_redis.set(key, "other-worker", px=10_000)
+    return key
+
+
+def test_waiter_fetches_when_holder_releases_without_caching(
+    service, raw_redis, api, courses
+):
+    key = hold_lock(raw_redis, service, "s1")
+    redis_misses = CACHE_REQUESTS.value("redis", "miss")
+
+    async def scenario():
+        async def holder():
+            await asyncio.sleep(0.1)
+            raw_redis.delete(key)  # e.g. the API answered with an empty list
+
+        release = asyncio.ensure_future(holder())
+        start = time.monotonic()
+        index = await service.fetch_course_index("s1")
+        await release
+        return index, time.monotonic() - start
+
+    index, elapsed = asyncio.run(scenario())
+
+    assert index.courses == courses
+    assert elapsed < 1.0
+    assert api == ["s1"]
+    # Only the initial lookup is counted, not every poll of the wait
+    assert CACHE_REQUESTS.value("redis", "miss") == redis_misses + 1
+    # The waiter took the lock over and released it after caching
+    assert raw_redis.get(key) is None
+    assert asyncio.run(service.cache.get_entry("s1")).data == courses
+
+
+def test_waiter_reads_what_the_holder_cached(service, raw_redis, api, courses):
+    key = hold_lock(raw_redis, service, "s1")
+    writer = course_service.StudentCache()
+
+    async def scenario():
+        async def holder():
+            await asyncio.sleep(0.05)
+            await writer.set("s1", courses)
+            raw_redis.delete(key)
+
+        release = asyncio.ensure_future(holder())
+        index = await service.fetch_course_index("s1")
+        await release
+        return index
+
+    index = asyncio.run(scenario())
+
+    assert index.courses == courses
+    assert api == []
+    assert raw_redis.get(key) is None
+
+
+def test_waiter_fetches_after_timeout(service, raw_redis, api, courses, monkeypatch):
+    monkeypatch.setattr(course_service, "FETCH_LOCK_TIMEOUT", 0.05)
+    key = hold_lock(raw_redis, service, "s1")
+
+    index = asyncio.run(service.fetch_course_index("s1"))
+
+    assert index.courses == courses
+    assert api == ["s1"]
+    # The other worker's lock is left alone
+    assert raw_redis.get(key) == b"other-worker"
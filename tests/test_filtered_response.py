@@ -0,0 +1,136 @@
+"""CourseService.format_filtered_response: selection, projection and pagination"""
+import pytest
+
+from benchmarks.synthetic_data import make_courses
+from src.services.course_index import CourseIndex
+from src.services.course_service import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, CourseService
+from src.utils.pagination import encode_cursor
+
+
+def respond(courses, **filters):
+    return CourseService.format_filtered_response(CourseIndex(courses), filters)
+
+
+def assignments(result):
+    """Assignments of a formatted response, in response order"""
+    found = []
+    for course in result["courses"]:
+        if "assignments" in course:
+            found.extend(course["assignments"])
+        else:
+            for week_assignments in course["week_assignments"].values():
+                found.extend(week_assignments)
+    return found
+
+
+def ids(result):
+    return [assignment["assignment_id"] for assignment in assignments(result)]
+
+
+@pytest.fixture
+def synthetic():
+    # 5 courses x 14 weeks x 4 assignments
+    return make_courses(n_courses=5, n_weeks=14, per_week=4)
+
+
+def test_without_filters_returns_the_full_course_response(courses):
+    result = respond(courses)
+    assert result == CourseService.format_course_response(courses) | {
+        "current_date": result["current_date"]
+    }
+    assert "next_cursor" not in result
+
+
+def test_week_and_course_filters_keep_the_plain_format(courses):
+    result = respond(courses, course_code="ENG101", week="1")
+    assert [course["course_code"] for course in result["courses"]] == ["ENG101"]
+    assert ids(result) == [1001, 1002]
+    assert result["courses"][0]["filtered_week"] == "1"
+    assert "total_assignments" not in result
+
+
+def test_projection_alone_does_not_paginate(synthetic):
+    result = respond(synthetic, exclude_fields=["instructions"])
+    assert len(assignments(result)) == 280
+    assert result["total_assignments"] == 280
+    assert result["next_cursor"] is None
+    assert all("instructions" not in assignment for assignment in assignments(result))
+
+
+@pytest.mark.parametrize(
+    "filters",
+    [{"fields": ["title"]}, {"status": "Pending"}, {"due_after": "2026-01-01"}],
+)
+def test_selection_filters_do_not_paginate(synthetic, filters):
+    result = respond(synthetic, **filters)
+    assert len(assignments(result)) == result["total_assignments"] > DEFAULT_PAGE_SIZE
+    assert result["next_cursor"] is None
+
+
+def test_fields_projection(courses):
+    result = respond(courses, fields=["assignment_id", "status", "missing"])
+    assert assignments(result)[0] == {"assignment_id": 1001, "status": "Submitted"}
+    # Grouping by course and week is kept
+    assert list(result["courses"][0]["week_assignments"]) == ["1", "2"]
+
+
+def test_status_filter(courses):
+    assert ids(respond(courses, status="Pending")) == [1002, 1003, 2001]
+    assert ids(respond(courses, status="Submitted")) == [1001]
+
+
+def test_date_window_is_inclusive_and_a_date_covers_the_whole_day(courses):
+    result = respond(courses, due_after="2026-01-10", due_before="2026-01-11")
+    assert sorted(ids(result)) == [1001, 1002]
+    assert result["total_assignments"] == 2
+    assert ids(respond(courses, due_after="2026-01-10T23:59:00Z")) == [1001, 1002, 1003]
+    assert ids(respond(courses, due_before="2026-01-09")) == [2001]
+
+
+def test_date_window_with_course_week_and_status(courses):
+    result = respond(
+        courses, due_after="2026-01-01", course_code="ENG101", week="1", status="Pending"
+    )
+    assert ids(result) == [1002]
+
+
+def test_limit_paginates_through_every_assignment_once(synthetic):
+    seen = []
+    cursor = None
+    pages = 0
+    while True:
+        result = respond(synthetic, limit=60, cursor=cursor, exclude_fields=["instructions"])
+        assert result["total_assignments"] == 280
+        seen.extend(ids(result))
+        pages += 1
+        cursor = result["next_cursor"]
+        if cursor is None:
+            break
+    assert pages == 5
+    assert seen == ids(respond(synthetic, exclude_fields=["instructions"]))
+
+
+def test_cursor_alone_uses_the_default_page_size(synthetic):
+    result = respond(synthetic, cursor=encode_cursor(10))
+    everything = ids(respond(synthetic, fields=["assignment_id"]))
+    assert ids(result) == everything[10:10 + DEFAULT_PAGE_SIZE]
+    assert result["next_cursor"] == encode_cursor(10 + DEFAULT_PAGE_SIZE)
+
+
+def test_limit_is_capped(synthetic):
+    result = respond(synthetic, limit=10_000)
+    assert len(assignments(result)) == MAX_PAGE_SIZE
+    assert result["next_cursor"] == encode_cursor(MAX_PAGE_SIZE)
+
+
+def test_cursor_past_the_end_returns_an_empty_page(courses):
+    result = respond(courses, cursor=encode_cursor(100))
+    assert ids(result) == []
+    assert result["total_assignments"] == 4
+    assert result["next_cursor"] is None
+
+
+@pytest.mark.parametrize("cursor", ["not-a-cursor", encode_cursor(-1)])
+def test_invalid_cursor(courses, cursor):
+    with pytest.raises(ValueError):
+        respond(courses, cursor=cursor)
@@ -0,0 +1,23 @@
+"""In-process course tiers: byte accounting of stored indexes"""
+from src.services.course_index import CourseIndex
+from src.services.course_service import CourseService
+from src.services.local_cache_service import LocalCache
+
+
+def test_unbounded_tiers_skip_the_size_encode(service, courses):
+    index = CourseIndex(courses, 1.0)
+    service._store_local("s1", index)
+
+    assert index._memory_size is None
+    assert CourseService._local_cache.get("s1") is index
+    assert CourseService._stale_cache.get("s1") is index
+
+
+def test_bounded_tiers_charge_the_decoded_size(service, courses, monkeypatch):
+    monkeypatch.setattr(CourseService, "_local_cache", LocalCache(max_bytes=1_000_000))
+    index = CourseIndex(courses, 1.0, size=10)
+    service._store_local("s1", index)
+
+    assert index.memory_size > index.size
+    assert CourseService._local_cache.stats()["bytes"] == index.memory_size
+    assert CourseService._stale_cache.stats()["bytes"] == 0
@@ -0,0 +1,126 @@
+"""APIService.transform_api_payload against the previous nested-loop join"""
+import copy
+
+import pytest
+
+from benchmarks.bench_transform import nested_loop_transform
+from benchmarks.synthetic_data import make_api_payload
+from src.services.api_service import APIService
+
+# Raw API response with the awkward cases: a course without a guid, an
+# assignment of a course the student is not enrolled in, weeks out of order,
+# several submissions for one assignment and a submission without a score
+PAYLOAD = {
+    "current_courses": [
+        {
+            "course_name": "Intro to Writing",
+            "course_code": "ENG101",
+            "term_code": "2026.WI",
+            "start_date": "2026-01-05",
+            "canvas_sis_id": "sis-eng101",
+        },
+        {
+            "course_name": "Statistics",
+            "course_code": "MATH221",
+            "term_code": "2026.WI",
+            "start_date": "2026-01-05",
+            "canvas_sis_id": "sis-math221",
+        },
+        {"canvas_sis_id": "sis-unknown"},
+    ],
+    "guids": [
+        {"canvas_sis_id": "sis-eng101", "canvas_course_id": 501, "current_week": "2"},
+        {"canvas_sis_id": "sis-math221", "canvas_course_id": 502, "current_week": 3},
+    ],
+    "week_assignments": [
+        {
+            "canvas_assignment_id": 1003,
+            "canvas_course_id": 501,
+            "title": "Peer review",
+            "points_possible_decimal": 5.0,
+            "due_on": "2026-01-17T23:59:00Z",
+            "due_week": 2,
+            "submission_type": "discussion_topic",
+            "description": "<p>Reply to <b>two</b> classmates.</p>",
+        },
+        {
+            "canvas_assignment_id": 2001,
+            "canvas_course_id": 502,
+            "title": "Problem set 1",
+            "points_possible_decimal": 50.0,
+            "due_on": "2026-01-09T23:59:00Z",
+            "due_week": 1,
+            "submission_type": "online_upload",
+            "description": "<div>\n  <p>Show all your steps.</p>\n  <ul><li>PDF</li></ul>\n</div>",
+        },
+        {
+            "canvas_assignment_id": 1001,
+            "canvas_course_id": 501,
+            "title": "Essay draft",
+            "points_possible_decimal": 20.0,
+            "due_on": "2026-01-10T23:59:00Z",
+            "due_week": 1,
+            "submission_type": "online_upload",
+            "description": "<p>Submit a one&nbsp;page draft.</p><style>p {}</style>",
+        },
+        {
+            "canvas_assignment_id": 1002,
+            "canvas_course_id": 501,
+            "title": "Reading quiz",
+            "points_possible_decimal": 10.0,
+            "due_on": None,
+            "due_week": 1,
+            "submission_type": "online_quiz",
+        },
+        {
+            "canvas_assignment_id": 9001,
+            "canvas_course_id": 999,
+            "title": "Other course",
+            "points_possible_decimal": 1.0,
+            "due_on": "2026-01-09T23:59:00Z",
+            "due_week": 1,
+            "submission_type": "online_upload",
+            "description": "",
+        },
+    ],
+    "submissions": [
+        {"canvas_assignment_id": 1001, "score": 18.5},
+        {"canvas_assignment_id": 1001, "score": 12.0},
+        {"canvas_assignment_id": 2001, "score": None},
+        {"canvas_assignment_id": 9001, "score": 1.0},
+    ],
+}
+
+
+def test_matches_previous_transform_on_fixture():
+    payload = copy.deepcopy(PAYLOAD)
+
+    result = APIService.transform_api_payload(payload)
+
+    assert result == nested_loop_transform(payload)
+    # Same key order too, since the processed list is what gets cached and hashed
+    for new, old in zip(result, nested_loop_transform(payload)):
+        assert list(new) == list(old)
+        assert list(new["week_assignments"]) == list(old["week_assignments"])
+    assert payload == PAYLOAD
+
+
+def test_fixture_edge_cases():
+    eng, math, unknown = APIService.transform_api_payload(copy.deepcopy(PAYLOAD))
+
+    assert [a["assignment_id"] for a in eng["week_assignments"]["1"]] == [1001, 1002]
+    assert list(eng["week_assignments"]) == ["2", "1"]
+    essay, quiz = eng["week_assignments"]["1"]
+    assert (essay["status"], essay["grade"]) == ("Submitted", 18.5)
+    assert quiz["status"] == "Pending" and quiz["due_on"] == "None"
+    assert math["week_assignments"]["1"][0]["status"] == "Submitted"
+    assert "grade" not in math["week_assignments"]["1"][0]
+    assert unknown["course_name"] == "Unknown Course"
+    assert unknown["canvas_course_id"] is None
+    assert unknown["week_assignments"] == {}
+
+
+@pytest.mark.parametrize("n_courses", [1, 4])
+def test_matches_previous_transform_on_synthetic_payload(n_courses):
+    payload = make_api_payload(n_courses, n_weeks=3, per_week=2)
+    assert APIService.transform_api_payload(payload) == nested_loop_transform(payload)